@@ -7,8 +7,10 @@ from pdf_viewer import PDFViewer
 from epub_viewer import EPUBViewer
 from theme_manager import theme_manager
 from book_recommendations import BookRecommendationsWindow
+from pdf_export import ExportJob, annotated_name
 import fitz
 import threading
+import queue
 
 # Book download imports
 import requests
@@ -382,6 +384,81 @@ class AnotacaoDialog:
             else:
                 messagebox.showerror("Error", "Failed to create note!")
 
+# ==================== EXPORT PROGRESS DIALOG CLASS ====================
+class ExportProgressDialog:
+    def __init__(self, parent, files):
+        self.parent = parent
+        self.results = queue.Queue()
+        self.exported = []
+        self.errors = []
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Export Annotated PDFs")
+        self.dialog.transient(parent)
+        self.dialog.geometry("450x170")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.setup_ui()
+        self.apply_theme()
+
+        self.job = ExportJob(files, self.results)
+        self.job.start()
+        self.poll_results()
+
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(expand=True, fill='both')
+
+        self.status_label = ttk.Label(main_frame, text="Starting export...")
+        self.status_label.pack(anchor='w')
+
+        self.file_progress = ttk.Progressbar(main_frame, mode='determinate')
+        self.file_progress.pack(fill='x', pady=(10, 5))
+
+        self.page_progress = ttk.Progressbar(main_frame, mode='determinate')
+        self.page_progress.pack(fill='x', pady=(0, 10))
+
+        self.cancel_button = ttk.Button(main_frame, text="Cancel", command=self.cancel)
+        self.cancel_button.pack()
+
+    def apply_theme(self):
+        theme_manager.apply_theme_to_widget(self.dialog)
+        theme_manager.apply_theme_recursive(self.dialog)
+
+    def poll_results(self):
+        try:
+            while True:
+                kind, payload = self.results.get_nowait()
+                if kind == 'progress':
+                    index, total, done, pages, name = payload
+                    self.status_label.config(text=f"{name} ({index + 1}/{total}) - page {done}/{pages}")
+                    self.file_progress.config(maximum=total, value=index)
+                    self.page_progress.config(maximum=max(pages, 1), value=done)
+                elif kind == 'file':
+                    self.exported.append(payload[1])
+                elif kind == 'error':
+                    self.errors.append(f"{payload[0]}: {payload[1]}")
+                elif kind == 'done':
+                    self.finish()
+                    return
+        except queue.Empty:
+            pass
+        self.dialog.after(100, self.poll_results)
+
+    def finish(self):
+        self.dialog.destroy()
+        message = f"{len(self.exported)} file(s) exported."
+        if self.errors:
+            message += "\n\nFailed:\n" + "\n".join(self.errors)
+            messagebox.showwarning("Export", message, parent=self.parent)
+        else:
+            messagebox.showinfo("Export", message, parent=self.parent)
+
+    def cancel(self):
+        self.job.cancel()
+        self.cancel_button.config(state='disabled')
+        self.status_label.config(text="Cancelling...")
+
 # ==================== MAIN APPLICATION CLASS ====================
 class MainApplication:
     def __init__(self, root, user_email):
@@ -410,6 +487,16 @@ class MainApplication:
         position_x = (screen_width - window_width) // 2
         position_y = (screen_height - window_height) // 2
         self.root.geometry(f"{window_width}x{window_height}+{position_x}+{position_y}")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Write pending reading positions of the viewers, then quit"""
+        for viewer in (self.pdf_viewer, self.epub_viewer):
+            if viewer:
+                viewer.save_position()
+        if self.pdf_viewer:
+            self.pdf_viewer.close()
+        self.root.destroy()
 
     def create_menu(self):
         menubar = tk.Menu(self.root)
@@ -419,7 +506,7 @@ class MainApplication:
         file_menu.add_separator()
         file_menu.add_command(label="Download Books", command=self.show_book_download)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
         menubar.add_cascade(label="File", menu=file_menu)
         
         # MENU DE RECOMENDAÇÕES
@@ -989,7 +1076,7 @@ class MainApplication:
             self.file_list_frame,
             columns=columns,
             show="headings",
-            selectmode="browse"
+            selectmode="extended"
         )
         
         tree.column("ID", width=50, anchor='center')
@@ -1017,6 +1104,31 @@ class MainApplication:
         ttk.Button(button_frame, text="Toggle Favorite", command=lambda: self.toggle_file_favorite(tree)).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Move to Group", command=lambda: self.move_file_to_group(tree)).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Delete File", command=lambda: self.delete_selected_file(tree)).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Export Annotated", command=lambda: self.export_annotated_files(tree)).pack(side='left', padx=5)
+
+    def export_annotated_files(self, tree):
+        """Export the selected PDFs with their annotations burned in"""
+        selected_items = tree.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", "Please select one or more files first!")
+            return
+
+        files = []
+        for item in selected_items:
+            file_id = tree.item(item)['values'][0]
+            file_path = DatabaseManager.get_file_path(file_id)
+            if file_path and file_path.lower().endswith('.pdf') and os.path.exists(file_path):
+                files.append((file_id, file_path))
+        if not files:
+            messagebox.showwarning("Warning", "Only PDF files can be exported with annotations.")
+            return
+
+        output_dir = filedialog.askdirectory(title="Choose a folder for the exported PDFs")
+        if not output_dir:
+            return
+
+        jobs = [(file_id, path, os.path.join(output_dir, annotated_name(path))) for file_id, path in files]
+        ExportProgressDialog(self.root, jobs)
 
     def move_file_to_group(self, tree):
         selected_item = tree.focus()
@@ -1151,14 +1263,10 @@ class MainApplication:
         try:
             if file_path.lower().endswith('.pdf'):
                 self.notebook.select(1)  # PDF Viewer tab
-                self.pdf_viewer.pdf_doc = fitz.open(file_path)
-                self.pdf_viewer.file_id = file_id
-                self.pdf_viewer.current_page = 0
-                self.pdf_viewer.render_page()
-                self.pdf_viewer.update_controls()
+                self.pdf_viewer.load_document(file_path, file_id=file_id)
             elif file_path.lower().endswith('.epub'):
                 self.notebook.select(2)  # EPUB Viewer tab
-                self.epub_viewer.open_epub_file(file_path)
+                self.epub_viewer.open_epub_file(file_path, file_id=file_id)
             else:
                 os.startfile(file_path)
         except Exception as e:
@@ -1369,7 +1477,7 @@ Developed with Python and Tkinter
 
 📚 Libraries Used:
 • PyMuPDF (fitz) - PDF processing
-• EbookLib - EPUB processing
+• lxml - EPUB text extraction
 • BeautifulSoup - HTML parsing
 • pyttsx3 - Text-to-Speech
 • gTTS - Google Text-to-Speech
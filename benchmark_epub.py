@@ -0,0 +1,116 @@
+"""Benchmark: EPUB chapter text extraction backends.
+
+Usage: python benchmark_epub.py [book.epub | folder ...] [--repeat R]
+
+Every document in the spine of every book is run through the old
+BeautifulSoup get_text() pipeline and through each backend of epub_text.
+Without books a synthetic corpus is generated.
+"""
+import argparse
+import glob
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from epub_reader import EpubReader
+from epub_text import EXTRACTORS, DEFAULT_EXTRACTOR, runs_to_text
+
+
+def build_sample_corpus(chapters=40, paragraphs=150):
+    """Chapter documents shaped like a typical converted novel"""
+    documents = []
+    for number in range(chapters):
+        body = [f"<h2>Chapter {number + 1}</h2>"]
+        for line in range(paragraphs):
+            body.append(
+                f"<p class=\"text\">Paragraph {line + 1} with <em>emphasis</em>, "
+                f"<strong>strong words</strong> and a <a href=\"#n{line}\">note</a>. "
+                + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3 + "</p>"
+            )
+        documents.append((
+            "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+            "<html xmlns=\"http://www.w3.org/1999/xhtml\"><head><title>Sample</title>"
+            "<style>p { margin: 0 }</style></head><body>" + "\n".join(body) + "</body></html>"
+        ).encode("utf-8"))
+    return documents
+
+
+def load_corpus(paths):
+    """Raw chapter documents of the given books (folders are searched for *.epub)"""
+    books = []
+    for path in paths:
+        if os.path.isdir(path):
+            books.extend(sorted(glob.glob(os.path.join(path, "**", "*.epub"), recursive=True)))
+        else:
+            books.append(path)
+
+    documents = []
+    for book_path in books:
+        try:
+            reader = EpubReader(book_path)
+        except Exception as e:
+            print(f"Skipping {book_path}: {e}")
+            continue
+        documents.extend(reader.read(name) for name in reader.spine)
+        reader.close()
+    return books, documents
+
+
+def legacy_extract(content):
+    """The old extract_chapters pipeline"""
+    soup = BeautifulSoup(content.decode("utf-8", errors="ignore"), "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = "\n".join(chunk for chunk in chunks if chunk)
+    soup.find(["h1", "h2", "h3", "title"])
+    return text
+
+
+def measure(extract, documents, repeat):
+    """Return (seconds per chapter, characters of text produced)"""
+    extract(documents[0])  # warm up
+    characters = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in documents:
+            characters = len(extract(content))
+    return (time.perf_counter() - start) / (repeat * len(documents)), characters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("books", nargs="*", help="EPUB files or folders (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.books:
+        books, documents = load_corpus(args.books)
+    else:
+        books, documents = [], build_sample_corpus()
+    if not documents:
+        print("No chapter documents found")
+        return
+
+    size = sum(len(content) for content in documents)
+    print(f"Books: {len(books) or 'synthetic'}  chapters: {len(documents)}  "
+          f"HTML: {size / 1e6:.1f} MB  repeat: {args.repeat}  default: {DEFAULT_EXTRACTOR}")
+
+    paths = [("legacy", legacy_extract)]
+    for name, extract in EXTRACTORS.items():
+        paths.append((name, lambda content, extract=extract: runs_to_text(extract(content))))
+
+    results = [(name, measure(extract, documents, args.repeat)[0]) for name, extract in paths]
+    legacy_time = results[0][1]
+
+    print(f"{'backend':<10}{'ms/chapter':>12}{'MB/s':>10}{'speed-up':>10}")
+    for name, seconds in results:
+        throughput = size / len(documents) / seconds / 1e6
+        print(f"{name:<10}{seconds * 1000:>12.2f}{throughput:>10.1f}{legacy_time / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark: legacy PIL render path vs. the PPM fast path of pdf_render.
+
+Usage: python benchmark_render.py [file.pdf] [--pages N] [--zoom Z] [--repeat R]
+
+Without a PDF a synthetic document is generated. When no display is
+available the Tk PhotoImage step is skipped and only the conversion up to
+the bytes handed to Tk is measured.
+"""
+import argparse
+import time
+import tracemalloc
+import tkinter as tk
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageTk, ImageDraw
+
+from pdf_render import render_pixmap, blend_highlights, pixmap_to_photo, NUMPY_AVAILABLE
+
+
+def build_sample_document(pages):
+    """Create an in-memory PDF with text and shapes on every page"""
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        for line in range(45):
+            page.insert_text((50, 60 + line * 16), f"Page {number + 1} line {line + 1} " + "lorem ipsum " * 6)
+        page.draw_rect(fitz.Rect(60, 500, 300, 700), color=(0, 0, 1), fill=(0.8, 0.9, 1))
+    return doc
+
+
+def sample_highlights(zoom):
+    """A few highlight rectangles, as stored in the highlights table"""
+    return [
+        (72 * zoom, 60 * zoom, 400 * zoom, 80 * zoom, "yellow"),
+        (72 * zoom, 200 * zoom, 500 * zoom, 240 * zoom, "red"),
+        (60 * zoom, 400 * zoom, 300 * zoom, 430 * zoom, "yellow"),
+    ]
+
+
+def legacy_render(page, zoom, highlights, root):
+    """The old render_page pipeline: four full-frame copies"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    overlay_draw = ImageDraw.Draw(overlay)
+    for x1, y1, x2, y2, cor in highlights:
+        color_rgba = (255, 255, 0, 80) if cor == "yellow" else (255, 0, 0, 80)
+        overlay_draw.rectangle([x1, y1, x2, y2], fill=color_rgba)
+    img = img.convert("RGBA")
+    img = Image.alpha_composite(img, overlay)
+    img = img.convert("RGB")
+    if root is not None:
+        return ImageTk.PhotoImage(image=img, master=root)
+    return img.tobytes()
+
+
+def fast_render(page, zoom, highlights, root):
+    """The new path: blend in place, hand PPM bytes to Tk"""
+    pix = render_pixmap(page, zoom)
+    blend_highlights(pix, highlights)
+    if root is not None:
+        return pixmap_to_photo(pix, master=root)
+    return pix.tobytes("ppm")
+
+
+def measure(render, doc, zoom, repeat, root):
+    """Return (seconds per render, peak traced bytes per render)"""
+    highlights = sample_highlights(zoom)
+    pages = [doc.load_page(i) for i in range(len(doc))]
+    render(pages[0], zoom, highlights, root)  # warm up
+
+    total_time = 0.0
+    peak = 0
+    count = 0
+    for _ in range(repeat):
+        for page in pages:
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = render(page, zoom, highlights, root)
+            total_time += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            del result
+            count += 1
+    return total_time / count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF file to render (default: synthetic document)")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--zoom", type=float, default=1.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = fitz.open(args.pdf) if args.pdf else build_sample_document(args.pages)
+    if args.pdf and len(doc) > args.pages:
+        doc.select(list(range(args.pages)))
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("No display available - measuring up to the bytes handed to Tk")
+
+    print(f"Pages: {len(doc)}  zoom: {args.zoom}  repeat: {args.repeat}  numpy: {NUMPY_AVAILABLE}")
+    legacy_time, legacy_peak = measure(legacy_render, doc, args.zoom, args.repeat, root)
+    fast_time, fast_peak = measure(fast_render, doc, args.zoom, args.repeat, root)
+
+    print(f"{'path':<10}{'ms/render':>12}{'peak MB':>12}")
+    print(f"{'legacy':<10}{legacy_time * 1000:>12.1f}{legacy_peak / 1e6:>12.1f}")
+    print(f"{'fast':<10}{fast_time * 1000:>12.1f}{fast_peak / 1e6:>12.1f}")
+    print(f"speed-up: {legacy_time / fast_time:.1f}x  memory: {legacy_peak / max(fast_peak, 1):.1f}x less")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
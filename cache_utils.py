@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import threading
+
+# Persistent caches live next to the application, like usuarios.db
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Hashes of files already read, by path, size and modification time
+HASH_INDEX_FILE = 'hashes.json'
+MAX_HASH_ENTRIES = 2000
+
+_hash_memo = None
+_hash_lock = threading.Lock()
+
+
+def cache_dir(*parts):
+    """Return (and create) a directory inside the cache folder"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_hash_index():
+    try:
+        with open(os.path.join(CACHE_DIR, HASH_INDEX_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_index(index):
+    path = os.path.join(cache_dir(), HASH_INDEX_FILE)
+    try:
+        with open(path + ".tmp", 'w') as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Failed to save hash index: {e}")
+
+
+def memo_key(filepath):
+    stat = os.stat(filepath)
+    return f"{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}", stat.st_size
+
+
+def known_hash(filepath):
+    """Remembered content hash of an unchanged file, or None (no reading)"""
+    global _hash_memo
+    key, _ = memo_key(filepath)
+    with _hash_lock:
+        if _hash_memo is None:
+            _hash_memo = load_hash_index()
+        return _hash_memo.get(key)
+
+
+def content_hash(filepath):
+    """Hash identifying a document by its contents.
+
+    The whole file is hashed, so any edit gives the document new cache
+    keys. Hashes are remembered on disk by path, size and modification
+    time, so a file is only read end to end the first time it is opened
+    (and again after it changes). Thread safe: the UI hashes new files
+    on a background thread.
+    """
+    global _hash_memo
+    known = known_hash(filepath)
+    if known is not None:
+        return known
+
+    key, size = memo_key(filepath)
+    digest = hashlib.sha1()
+    digest.update(str(size).encode())
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+
+    with _hash_lock:
+        _hash_memo[key] = digest.hexdigest()
+        while len(_hash_memo) > MAX_HASH_ENTRIES:
+            del _hash_memo[next(iter(_hash_memo))]
+        save_hash_index(_hash_memo)
+    return digest.hexdigest()
@@ -68,6 +68,56 @@ class DatabaseManager:
                 )
             ''')
             
+            # Cache do texto extraído de cada página (por versão do documento)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS texto_paginas (
+                    doc_hash TEXT NOT NULL,
+                    pagina INTEGER NOT NULL,
+                    palavras TEXT NOT NULL,
+                    PRIMARY KEY (doc_hash, pagina)
+                )
+            ''')
+
+            # Última posição de leitura de cada documento (PDF: página/zoom,
+            # EPUB: capítulo/deslocamento/tamanho da fonte)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS posicoes_leitura (
+                    doc_hash TEXT PRIMARY KEY,
+                    arquivo_id INTEGER,
+                    capitulo INTEGER NOT NULL,
+                    deslocamento INTEGER NOT NULL DEFAULT 0,
+                    zoom REAL,
+                    data_atualizacao TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posicoes_leitura_arquivo
+                ON posicoes_leitura (arquivo_id)
+            ''')
+
+            # Marcadores dos livros EPUB
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS marcadores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    doc_hash TEXT NOT NULL,
+                    arquivo_id INTEGER,
+                    nome TEXT NOT NULL,
+                    capitulo INTEGER NOT NULL,
+                    deslocamento INTEGER NOT NULL DEFAULT 0,
+                    data_criacao TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_marcadores_doc
+                ON marcadores (doc_hash, capitulo, deslocamento)
+            ''')
+
+            # Blocos de texto (modo leitura) guardados junto das palavras
+            try:
+                cursor.execute('ALTER TABLE texto_paginas ADD COLUMN blocos TEXT')
+            except sqlite3.OperationalError:
+                pass  # Coluna já existe
+            
             # Adicionar a coluna favorito se ela não existir (para compatibilidade com DBs existentes)
             try:
                 cursor.execute('ALTER TABLE arquivos ADD COLUMN favorito INTEGER DEFAULT 0')
@@ -460,6 +510,198 @@ class DatabaseManager:
             print(f"Failed to delete highlight: {str(e)}")
             return False
 
+    @staticmethod
+    def get_marks_version(file_id, page):
+        """Version string that changes whenever a page's marks change"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''SELECT
+                        (SELECT COUNT(*) || '.' || IFNULL(MAX(id), 0) FROM anotacoes
+                         WHERE arquivo_id = ? AND pagina = ?),
+                        (SELECT COUNT(*) || '.' || IFNULL(MAX(id), 0) FROM highlights
+                         WHERE arquivo_id = ? AND pagina = ?)''',
+                    (file_id, page, file_id, page))
+                annotations, highlights = cursor.fetchone()
+                return f"{annotations}-{highlights}"
+        except Exception as e:
+            print(f"Failed to get marks version: {str(e)}")
+            return "0"
+
+    @staticmethod
+    def get_marked_pages(file_id):
+        """Pages of a file that have annotations or highlights, in order"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''SELECT pagina FROM anotacoes WHERE arquivo_id = ?
+                    UNION
+                    SELECT pagina FROM highlights WHERE arquivo_id = ?
+                    ORDER BY pagina''',
+                    (file_id, file_id))
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Failed to get marked pages: {str(e)}")
+            return []
+
+    # ----------- CACHE DE TEXTO DAS PÁGINAS -----------
+    @staticmethod
+    def get_page_texts(doc_hash, page=None):
+        """Get cached page words (JSON) for a document, optionally one page"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                if page is None:
+                    cursor.execute(
+                        'SELECT pagina, palavras FROM texto_paginas WHERE doc_hash = ?',
+                        (doc_hash,))
+                else:
+                    cursor.execute(
+                        'SELECT pagina, palavras FROM texto_paginas WHERE doc_hash = ? AND pagina = ?',
+                        (doc_hash, page))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Failed to get page texts: {str(e)}")
+            return []
+
+    @staticmethod
+    def save_page_texts(doc_hash, rows):
+        """Save extracted page words, rows are (pagina, palavras_json)"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    '''INSERT INTO texto_paginas (doc_hash, pagina, palavras)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(doc_hash, pagina) DO UPDATE SET palavras = excluded.palavras''',
+                    [(doc_hash, page, palavras) for page, palavras in rows])
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Failed to save page texts: {str(e)}")
+            return False
+
+    @staticmethod
+    def get_page_blocks(doc_hash, page):
+        """Get the cached text blocks (JSON) of a page, or None"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT blocos FROM texto_paginas WHERE doc_hash = ? AND pagina = ?',
+                    (doc_hash, page))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            print(f"Failed to get page blocks: {str(e)}")
+            return None
+
+    @staticmethod
+    def save_page_blocks(doc_hash, page, palavras, blocos):
+        """Save the text blocks of a page (words are needed if the row is new)"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''INSERT INTO texto_paginas (doc_hash, pagina, palavras, blocos)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(doc_hash, pagina) DO UPDATE SET blocos = excluded.blocos''',
+                    (doc_hash, page, palavras, blocos))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Failed to save page blocks: {str(e)}")
+            return False
+
+    # ----------- POSIÇÃO DE LEITURA E MARCADORES -----------
+    @staticmethod
+    def get_reading_position(doc_hash):
+        """Last position of a document as {'chapter', 'offset', 'zoom'}, or None"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT capitulo, deslocamento, zoom FROM posicoes_leitura WHERE doc_hash = ?',
+                    (doc_hash,))
+                row = cursor.fetchone()
+                if row:
+                    return {'chapter': row[0], 'offset': row[1], 'zoom': row[2]}
+                return None
+        except Exception as e:
+            print(f"Failed to get reading position: {str(e)}")
+            return None
+
+    @staticmethod
+    def save_reading_position(doc_hash, file_id, chapter, offset=0, zoom=None):
+        """Save the position of a document (chapter is the page for PDFs)"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''INSERT INTO posicoes_leitura (doc_hash, arquivo_id, capitulo, deslocamento, zoom)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(doc_hash) DO UPDATE SET
+                        arquivo_id = COALESCE(excluded.arquivo_id, arquivo_id),
+                        capitulo = excluded.capitulo,
+                        deslocamento = excluded.deslocamento,
+                        zoom = excluded.zoom,
+                        data_atualizacao = CURRENT_TIMESTAMP''',
+                    (doc_hash, file_id, chapter, offset, zoom))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Failed to save reading position: {str(e)}")
+            return False
+
+    @staticmethod
+    def add_bookmark(doc_hash, file_id, name, chapter, offset):
+        """Add a bookmark to a book, returning its id"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''INSERT INTO marcadores (doc_hash, arquivo_id, nome, capitulo, deslocamento)
+                    VALUES (?, ?, ?, ?, ?)''',
+                    (doc_hash, file_id, name, chapter, offset))
+                conn.commit()
+                return cursor.lastrowid
+        except Exception as e:
+            print(f"Failed to add bookmark: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_bookmarks(doc_hash):
+        """Bookmarks of a book in reading order"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    '''SELECT id, nome, capitulo, deslocamento FROM marcadores
+                    WHERE doc_hash = ? ORDER BY capitulo, deslocamento''',
+                    (doc_hash,))
+                return [
+                    {'id': row[0], 'name': row[1], 'chapter': row[2], 'offset': row[3]}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            print(f"Failed to get bookmarks: {str(e)}")
+            return []
+
+    @staticmethod
+    def delete_bookmark(bookmark_id):
+        """Delete a bookmark"""
+        try:
+            with sqlite3.connect('usuarios.db') as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM marcadores WHERE id = ?', (bookmark_id,))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Failed to delete bookmark: {str(e)}")
+            return False
+
     # ... (código existente) ...
     
     # ==================== MÉTODOS PARA GRUPOS ====================
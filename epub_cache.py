@@ -0,0 +1,139 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+from cache_utils import cache_dir
+from epub_text import RUN_STYLES, IMAGE_STYLE
+
+# File layout (little endian):
+#   MAGIC | u32 record count | u64 offset of every record
+#   records: u32 length | zlib data
+# Record i holds chapter i: u32 run count | (u32 characters, u8 style) per
+# run | UTF-8 text. The last record is the JSON metadata (names, titles,
+# levels).
+MAGIC = b"EPUBRUN4"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+RUN = struct.Struct("<IB")
+
+STYLES = [""] + RUN_STYLES + [IMAGE_STYLE]
+STYLE_CODES = {style: code for code, style in enumerate(STYLES)}
+
+
+def cache_path(doc_hash):
+    return os.path.join(cache_dir('epub'), f"{doc_hash}.bin")
+
+
+def pack_runs(runs):
+    """One chapter's (text, style) runs as a compressed record"""
+    table = b"".join(RUN.pack(len(text), STYLE_CODES.get(style, 0)) for text, style in runs)
+    text = "".join(text for text, _ in runs).encode("utf-8")
+    return zlib.compress(LENGTH.pack(len(runs)) + table + text)
+
+
+def unpack_runs(record):
+    data = zlib.decompress(record)
+    count = LENGTH.unpack_from(data)[0]
+    start = LENGTH.size + count * RUN.size
+    text = data[start:].decode("utf-8")
+    runs = []
+    position = 0
+    for length, code in RUN.iter_unpack(data[LENGTH.size:start]):
+        runs.append((text[position:position + length], STYLES[code]))
+        position += length
+    return runs
+
+
+def write_cache(path, names, titles, levels, chapter_runs):
+    """Write a book cache, one chapter at a time.
+
+    ``chapter_runs`` yields the runs of every chapter in order. Records are
+    streamed to a temporary file and the offset table is filled in last, so
+    only one chapter is in memory at a time.
+    """
+    count = len(names) + 1
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, count))
+            f.write(b"\0" * (OFFSET.size * count))
+            offsets = []
+
+            for runs in chapter_runs:
+                offsets.append(f.tell())
+                record = pack_runs(runs)
+                f.write(LENGTH.pack(len(record)) + record)
+            if len(offsets) != len(names):
+                raise ValueError("chapter count does not match the book")
+
+            offsets.append(f.tell())
+            record = zlib.compress(json.dumps({"names": names, "titles": titles, "levels": levels}).encode("utf-8"))
+            f.write(LENGTH.pack(len(record)) + record)
+
+            f.seek(HEADER.size)
+            f.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class EpubCache:
+    """Read side of a book cache, memory-mapped.
+
+    Opening reads the header and the metadata record only; a chapter's
+    record is sliced out of the map and decompressed when it is asked for.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = HEADER.unpack_from(self.map)
+            if magic != MAGIC:
+                raise ValueError("not a book cache")
+            self.offsets = [
+                OFFSET.unpack_from(self.map, HEADER.size + i * OFFSET.size)[0] for i in range(count)
+            ]
+            metadata = json.loads(zlib.decompress(self.record(count - 1)))
+        except Exception:
+            self.close()
+            raise
+        self.names = metadata["names"]
+        self.titles = metadata["titles"]
+        self.levels = metadata["levels"]
+
+    @classmethod
+    def open(cls, doc_hash):
+        """The cache of a book, or None if there is no usable one"""
+        path = cache_path(doc_hash)
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except Exception as e:
+            print(f"Ignoring book cache {path}: {e}")
+            return None
+
+    def record(self, number):
+        offset = self.offsets[number]
+        length = LENGTH.unpack_from(self.map, offset)[0]
+        start = offset + LENGTH.size
+        return self.map[start:start + length]
+
+    def __len__(self):
+        return len(self.names)
+
+    def runs(self, index):
+        return unpack_runs(self.record(index))
+
+    def close(self):
+        if getattr(self, "map", None) is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from epub_text import extract_chapter, runs_to_text
+from epub_cache import write_cache, cache_path
+from epub_reader import EpubReader
+
+
+class ChapterStore:
+    """Chapters of one EPUB, indexed from the spine and parsed on demand.
+
+    Opening a book only walks the spine, or reads the header of its cache
+    file (see epub_cache); titles and their nesting level come from the
+    table of contents. A chapter is turned into runs the first time it
+    is shown and kept in a small LRU, and the chapters next to the one
+    being read are parsed on a background thread, so Next/Previous do not
+    wait for the parser. Chapters are kept as
+    styled runs; indexing gives the plain text of a chapter, like the list
+    of strings it replaces.
+    """
+
+    MAX_CHAPTERS = 8
+
+    def __init__(self, names, titles, levels, load):
+        self.names = names
+        self.titles = titles
+        self.levels = levels
+        self.load = load
+        self.source = None
+        self.parsed = OrderedDict()
+        self.wanted = []
+        self.prefetching = False
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_reader(cls, reader):
+        """Chapters of the spine of an EpubReader, parsed from their HTML.
+
+        A document gets the title of the first table of contents entry that
+        points into it; one without an entry is numbered and nested like the
+        document before it.
+        """
+        toc = {}
+        for level, title, target in reader.toc:
+            if target and title:
+                toc.setdefault(target, (level, title))
+        titles = []
+        levels = []
+        for index, name in enumerate(reader.spine):
+            level, title = toc.get(name, (levels[-1] if levels else 1, f"Chapter {index + 1}"))
+            titles.append(title)
+            levels.append(level)
+        store = cls(list(reader.spine), titles, levels, lambda index: extract_chapter(reader.read(reader.spine[index])))
+        store.source = reader
+        return store
+
+    @classmethod
+    def from_cache(cls, cache):
+        """Chapters read back from an EpubCache, without touching the EPUB"""
+        store = cls(cache.names, cache.titles, cache.levels, cache.runs)
+        store.source = cache
+        return store
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return self.text(index)
+
+    def label(self, index):
+        """Title indented by its table of contents level, for chapter lists"""
+        return "    " * (self.levels[index] - 1) + self.titles[index]
+
+    def runs(self, index):
+        """Styled (text, style) runs of one chapter, parsing it if it is not cached"""
+        with self.lock:
+            if index in self.parsed:
+                self.parsed.move_to_end(index)
+                return self.parsed[index]
+        runs = self.load(index)
+        self.remember(index, runs)
+        return runs
+
+    def text(self, index):
+        """Plain text of one chapter"""
+        return runs_to_text(self.runs(index))
+
+    def load_runs(self, index):
+        """Runs of one chapter without adding it to the LRU (for whole-book passes)"""
+        with self.lock:
+            runs = self.parsed.get(index)
+        return runs if runs is not None else self.load(index)
+
+    def remember(self, index, runs):
+        with self.lock:
+            self.parsed[index] = runs
+            self.parsed.move_to_end(index)
+            while len(self.parsed) > self.MAX_CHAPTERS:
+                self.parsed.popitem(last=False)
+
+    def prefetch(self, index):
+        """Parse the chapters around ``index`` on a background thread"""
+        with self.lock:
+            self.wanted = [i for i in (index + 1, index - 1) if 0 <= i < len(self.names)]
+            if self.prefetching:
+                return
+            self.prefetching = True
+        threading.Thread(target=self._prefetch_worker, daemon=True).start()
+
+    def _prefetch_worker(self):
+        while True:
+            with self.lock:
+                pending = [i for i in self.wanted if i not in self.parsed]
+                if not pending:
+                    self.prefetching = False
+                    return
+            index = pending[0]
+            try:
+                self.remember(index, self.load(index))
+            except Exception as e:
+                print(f"Error prefetching chapter {index + 1}: {e}")
+                with self.lock:
+                    if index in self.wanted:
+                        self.wanted.remove(index)
+
+    def save_cache(self, doc_hash, epub_path):
+        """Parse every chapter of the book at ``epub_path`` into the on-disk cache.
+
+        Runs on a background thread with a reader of its own, so closing
+        the store (another book was opened) does not close the zip under it.
+        """
+        try:
+            reader = EpubReader(epub_path)
+        except Exception as e:
+            print(f"Failed to save book cache: {e}")
+            return
+        try:
+            def chapter_runs():
+                for index, name in enumerate(self.names):
+                    with self.lock:
+                        runs = self.parsed.get(index)
+                    yield runs if runs is not None else extract_chapter(reader.read(name))
+            write_cache(cache_path(doc_hash), self.names, self.titles, self.levels, chapter_runs())
+        except Exception as e:
+            print(f"Failed to save book cache: {e}")
+        finally:
+            reader.close()
+
+    def close(self):
+        with self.lock:
+            self.wanted = []
+        if self.source is not None:
+            self.source.close()
+            self.source = None
@@ -0,0 +1,76 @@
+import io
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+DEFAULT_BUDGET_MB = 64
+
+
+def decode_image(data, max_width, max_height):
+    """Decode an image no bigger than the given box.
+
+    ``draft`` lets the JPEG decoder skip most of the work for big photos
+    (it decodes at 1/2, 1/4 or 1/8 scale); ``thumbnail`` then scales down
+    to the box, keeping the aspect ratio.
+    """
+    img = Image.open(io.BytesIO(data))
+    img.draft('RGB', (max_width, max_height))
+    img.thumbnail((max_width, max_height))
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+    return img
+
+
+class ImageCache:
+    """Tk images of a book, least recently used first out, within a byte budget.
+
+    Sizes are counted as Tk stores them (4 bytes per pixel). Keys include
+    the box the image was scaled to, so a resized view decodes again.
+    Pinned images (the ones embedded in the chapter on screen) are never
+    evicted: Tk deletes an image when its PhotoImage is garbage collected,
+    which would blank it in the text.
+    """
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.max_bytes = int(budget_mb * 1024 * 1024)
+        self.images = OrderedDict()
+        self.pinned = set()
+        self.total_bytes = 0
+
+    def get(self, key):
+        entry = self.images.get(key)
+        if entry is None:
+            return None
+        self.images.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, img, master=None):
+        """Make a PhotoImage of a PIL image and keep it, evicting old ones"""
+        photo = ImageTk.PhotoImage(img, master=master)
+        size = img.width * img.height * 4
+        self.images[key] = (photo, size)
+        self.total_bytes += size
+        self.evict(keep=key)
+        return photo
+
+    def evict(self, keep=None):
+        """Drop the least recently used unpinned images until within the budget"""
+        for old_key in list(self.images):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if old_key == keep or old_key in self.pinned:
+                continue
+            _, old_size = self.images.pop(old_key)
+            self.total_bytes -= old_size
+
+    def pin(self, key):
+        self.pinned.add(key)
+
+    def unpin_all(self):
+        """Allow every image to be evicted again (the chapter was cleared)"""
+        self.pinned.clear()
+        self.evict()
+
+    def clear(self):
+        self.images.clear()
+        self.pinned.clear()
+        self.total_bytes = 0
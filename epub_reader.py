@@ -0,0 +1,135 @@
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+from epub_text import local_name
+
+DOCUMENT_TYPES = {"application/xhtml+xml", "text/html", "application/x-dtbook+xml"}
+NCX_TYPE = "application/x-dtbncx+xml"
+OPS_TYPE = "{http://www.idpf.org/2007/ops}type"
+
+
+def children(element, name):
+    """Child elements with the given (lower case, namespace-free) tag name"""
+    return [child for child in element if local_name(child.tag) == name]
+
+
+def resolve_href(base, href):
+    """Zip path of an href found in the document ``base``"""
+    href = unquote(href.split("#")[0])
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), href))
+
+
+def element_text(element):
+    return " ".join("".join(element.itertext()).split())
+
+
+class EpubReader:
+    """Minimal EPUB container reader on top of zipfile.
+
+    Opening parses only META-INF/container.xml, the OPF package (manifest
+    and spine) and the navigation document or NCX. Chapter documents and
+    images stay compressed in the zip until ``read`` is called for them, so
+    memory follows the chapter being read, not the size of the book.
+    Entry names are full paths inside the zip.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.lock = threading.Lock()
+        try:
+            self.load_package()
+        except Exception:
+            self.close()
+            raise
+
+    def read(self, name):
+        """Bytes of one entry of the zip (thread safe)"""
+        with self.lock:
+            return self.zip.read(name)
+
+    def load_package(self):
+        container = ET.fromstring(self.read("META-INF/container.xml"))
+        rootfile = next(e for e in container.iter() if local_name(e.tag) == "rootfile")
+        opf_path = rootfile.get("full-path")
+        package = ET.fromstring(self.read(opf_path))
+
+        self.manifest = {}
+        nav_name = None
+        for element in package.iter():
+            if local_name(element.tag) != "item":
+                continue
+            name = resolve_href(opf_path, element.get("href", ""))
+            media_type = element.get("media-type", "")
+            self.manifest[element.get("id")] = (name, media_type)
+            if "nav" in element.get("properties", "").split():
+                nav_name = name
+
+        ncx_name = None
+        self.spine = []
+        for element in package.iter():
+            if local_name(element.tag) == "spine":
+                ncx_id = element.get("toc")
+                if ncx_id in self.manifest:
+                    ncx_name = self.manifest[ncx_id][0]
+            elif local_name(element.tag) == "itemref":
+                name, media_type = self.manifest.get(element.get("idref"), (None, None))
+                if name is not None and media_type in DOCUMENT_TYPES:
+                    self.spine.append(name)
+        if ncx_name is None:
+            ncx_name = next((n for n, t in self.manifest.values() if t == NCX_TYPE), None)
+
+        self.toc = []
+        for name, parse in ((nav_name, self.parse_nav), (ncx_name, self.parse_ncx)):
+            if name is None or self.toc:
+                continue
+            try:
+                parse(name)
+            except (KeyError, ET.ParseError) as e:
+                print(f"Ignoring table of contents {name}: {e}")
+                self.toc = []
+
+    def parse_nav(self, name):
+        """EPUB 3 navigation document: the <nav epub:type="toc"> list"""
+        document = ET.fromstring(self.read(name))
+        navs = [e for e in document.iter() if local_name(e.tag) == "nav"]
+        toc = next((e for e in navs if "toc" in e.get(OPS_TYPE, "").split()), navs[0] if navs else None)
+        if toc is None:
+            return
+        for ordered in children(toc, "ol"):
+            self.parse_nav_list(name, ordered, 1)
+
+    def parse_nav_list(self, name, ordered, level):
+        for item in children(ordered, "li"):
+            target = None
+            title = ""
+            for child in item:
+                tag = local_name(child.tag)
+                if tag in ("a", "span") and not title:
+                    title = element_text(child)
+                    if tag == "a" and child.get("href"):
+                        target = resolve_href(name, child.get("href"))
+            self.toc.append((level, title, target))
+            for nested in children(item, "ol"):
+                self.parse_nav_list(name, nested, level + 1)
+
+    def parse_ncx(self, name):
+        """EPUB 2 NCX: nested navPoints of the navMap"""
+        document = ET.fromstring(self.read(name))
+        nav_map = next((e for e in document.iter() if local_name(e.tag) == "navmap"), None)
+        if nav_map is not None:
+            self.parse_nav_points(name, nav_map, 1)
+
+    def parse_nav_points(self, name, parent, level):
+        for point in children(parent, "navpoint"):
+            labels = children(point, "navlabel")
+            title = element_text(labels[0]) if labels else ""
+            content = children(point, "content")
+            target = resolve_href(name, content[0].get("src", "")) if content else None
+            self.toc.append((level, title, target))
+            self.parse_nav_points(name, point, level + 1)
+
+    def close(self):
+        self.zip.close()
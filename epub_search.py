@@ -0,0 +1,105 @@
+import re
+import threading
+from array import array
+from collections import defaultdict
+from epub_text import runs_to_text
+
+WORD = re.compile(r"\w+")
+SNIPPET_CONTEXT = 40
+MAX_RESULTS = 500
+CHAPTER_SHIFT = 32
+
+
+class BookIndex:
+    """Inverted index over the words of every chapter of a book.
+
+    Each lower-cased word maps to a compact array of positions packed as
+    ``chapter << 32 | offset``, offsets being character positions in the
+    chapter's plain text. A query looks up the positions of its first word
+    (every word starting with it for one-word queries) and checks the rest
+    of the phrase at each of them only.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(lambda: array('Q'))
+        self.texts = []
+
+    def add_chapter(self, text):
+        chapter = len(self.texts) << CHAPTER_SHIFT
+        self.texts.append(text)
+        postings = self.postings
+        for match in WORD.finditer(text):
+            postings[match.group().lower()].append(chapter | match.start())
+
+    def positions(self, words):
+        if len(words) == 1:
+            prefix = words[0]
+            found = array('Q')
+            for word, positions in self.postings.items():
+                if word.startswith(prefix):
+                    found.extend(positions)
+            return sorted(found)
+        return self.postings.get(words[0], ())
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Hits of a phrase: [{'chapter', 'offset', 'length', 'snippet'}] in book order"""
+        words = WORD.findall(query.lower())
+        if not words:
+            return []
+        # Words in between may be separated by any punctuation; the last may be partial
+        pattern = re.compile(r"\W+".join(re.escape(word) for word in words), re.IGNORECASE)
+
+        hits = []
+        mask = (1 << CHAPTER_SHIFT) - 1
+        for position in self.positions(words):
+            chapter, offset = position >> CHAPTER_SHIFT, position & mask
+            text = self.texts[chapter]
+            match = pattern.match(text, offset)
+            if match is None:
+                continue
+            hits.append({
+                'chapter': chapter,
+                'offset': offset,
+                'length': match.end() - offset,
+                'snippet': self.snippet(text, offset, match.end()),
+            })
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def snippet(self, text, start, end):
+        before = text[max(start - SNIPPET_CONTEXT, 0):start]
+        after = text[end:end + SNIPPET_CONTEXT]
+        prefix = "…" if start > SNIPPET_CONTEXT else ""
+        suffix = "…" if end + SNIPPET_CONTEXT < len(text) else ""
+        return " ".join(f"{prefix}{before}[{text[start:end]}]{after}{suffix}".split())
+
+
+class IndexWorker(threading.Thread):
+    """Builds the BookIndex of a ChapterStore and reports through a queue.
+
+    Sends ('progress', (chapters_done, chapter_count)) per chapter, then
+    ('done', index), or ('error', message).
+    """
+
+    def __init__(self, store, results):
+        super().__init__(daemon=True)
+        self.store = store
+        self.results = results
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            index = BookIndex()
+            total = len(self.store)
+            for chapter in range(total):
+                if self.cancel_event.is_set():
+                    return
+                index.add_chapter(runs_to_text(self.store.load_runs(chapter)))
+                self.results.put(('progress', (chapter + 1, total)))
+            self.results.put(('done', index))
+        except Exception as e:
+            self.results.put(('error', str(e)))
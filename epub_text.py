@@ -0,0 +1,280 @@
+import codecs
+import itertools
+import re
+from bs4 import BeautifulSoup, Tag, NavigableString
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Elements that start a new block of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "aside", "header", "footer", "blockquote",
+    "li", "ul", "ol", "dl", "dt", "dd", "pre", "table", "tr", "td", "th",
+    "figure", "figcaption", "hr", "br", "body",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+SKIP_TAGS = {"head", "title", "script", "style"}
+INLINE_TAGS = {
+    "em": "emphasis", "i": "emphasis", "cite": "emphasis", "dfn": "emphasis", "var": "emphasis",
+    "b": "strong", "strong": "strong",
+}
+
+# A run's style is the names of its active flags joined by "_", e.g.
+# "heading_emphasis"; "" is plain text. Each style is one Text tag.
+STYLE_FLAGS = ("heading", "strong", "emphasis")
+RUN_STYLES = [
+    "_".join(name for name, on in zip(STYLE_FLAGS, flags) if on)
+    for flags in itertools.product((False, True), repeat=len(STYLE_FLAGS))
+][1:]
+
+# Inline images are runs of their own: the text is the src attribute. They
+# take one character (U+FFFC) in plain text, like an embedded Text image.
+IMAGE_STYLE = "image"
+IMAGE_CHARACTER = "\ufffc"
+IMAGE_HREF_KEYS = ("src", "href", "xlink:href", "{http://www.w3.org/1999/xlink}href")
+
+# Where a chapter document declares its encoding (XHTML defaults to UTF-8)
+XML_ENCODING = re.compile(rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._-]+)""")
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9._-]+)""", re.IGNORECASE)
+BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+WHITESPACE = re.compile(r"\s+")
+NEEDS_COLLAPSE = re.compile(r"[^\S ]| {2}")
+
+
+_local_names = {}
+
+
+def local_name(tag):
+    """Tag name without an XML namespace, lower case"""
+    name = _local_names.get(tag)
+    if name is None:
+        if not isinstance(tag, str):  # comments and processing instructions
+            return ""
+        name = _local_names[tag] = tag.rsplit("}", 1)[-1].lower()
+    return name
+
+
+def style_font(style, family, size):
+    """Tk font for a run style at the given base size"""
+    flags = style.split("_")
+    if "heading" in flags:
+        size += 4
+    weight = "bold" if "heading" in flags or "strong" in flags else "normal"
+    slant = "italic" if "emphasis" in flags else "roman"
+    return (family, size, weight, slant)
+
+
+class RunCollector:
+    """Parser target that turns a chapter into styled runs in a single pass.
+
+    It receives start/end/data events (from lxml, or replayed from a
+    BeautifulSoup tree) and emits ``(text, style)`` runs: white space is
+    collapsed, every block ends with a newline and neighbouring runs of the
+    same style are merged, so a chapter is a short list ready for one bulk
+    Text insert. Images become separate runs holding their src.
+    """
+
+    def __init__(self):
+        self.runs = []
+        self.parts = []
+        self.depth = dict.fromkeys(STYLE_FLAGS, 0)
+        self.style = ""
+        self.skip = 0
+
+    def update_style(self):
+        self.style = "_".join(name for name in STYLE_FLAGS if self.depth[name])
+
+    def start(self, tag, attrib=None):
+        name = local_name(tag)
+        if name in SKIP_TAGS:
+            self.skip += 1
+        elif name in HEADING_TAGS:
+            self.flush()
+            self.depth["heading"] += 1
+            self.update_style()
+        elif name in INLINE_TAGS:
+            self.depth[INLINE_TAGS[name]] += 1
+            self.update_style()
+        elif name in BLOCK_TAGS:
+            self.flush()
+        elif name in ("img", "image") and attrib and not self.skip:
+            src = next((attrib.get(key) for key in IMAGE_HREF_KEYS if attrib.get(key)), None)
+            if src:
+                self.parts.append((src, IMAGE_STYLE))
+
+    def end(self, tag):
+        name = local_name(tag)
+        if name in SKIP_TAGS:
+            self.skip = max(self.skip - 1, 0)
+        elif name in HEADING_TAGS:
+            self.flush()
+            self.depth["heading"] = max(self.depth["heading"] - 1, 0)
+            self.update_style()
+        elif name in INLINE_TAGS:
+            flag = INLINE_TAGS[name]
+            self.depth[flag] = max(self.depth[flag] - 1, 0)
+            self.update_style()
+        elif name in BLOCK_TAGS:
+            self.flush()
+
+    def data(self, data):
+        if not self.skip:
+            self.parts.append((data, self.style))
+
+    def comment(self, text):
+        pass
+
+    def flush(self):
+        """Close the current block: collapse its white space and append its runs"""
+        pieces = []
+        for data, style in self.parts:
+            if style == IMAGE_STYLE:
+                pieces.append([data, style])
+                continue
+            text = WHITESPACE.sub(" ", data) if NEEDS_COLLAPSE.search(data) else data
+            if not pieces or pieces[-1][0].endswith(" "):
+                text = text.lstrip(" ")
+            if not text:
+                continue
+            if pieces and pieces[-1][1] == style:
+                pieces[-1][0] += text
+            else:
+                pieces.append([text, style])
+        self.parts = []
+
+        while pieces and not pieces[-1][0].rstrip(" "):
+            pieces.pop()
+        if not pieces:
+            return
+        if pieces[-1][1] == IMAGE_STYLE:
+            pieces.append(["\n", ""])
+        else:
+            pieces[-1][0] = pieces[-1][0].rstrip(" ") + "\n"
+
+        if self.runs and self.runs[-1][1] == pieces[0][1] != IMAGE_STYLE:
+            self.runs[-1][0] += pieces.pop(0)[0]
+        self.runs.extend(pieces)
+
+    def close(self):
+        self.flush()
+        return [tuple(run) for run in self.runs]
+
+
+def declared_encoding(content):
+    """Encoding of a chapter document from its BOM, XML declaration or meta charset.
+
+    lxml's HTML parser ignores the XML declaration and assumes Latin-1
+    without a meta tag, so the encoding is worked out here. Documents that
+    declare nothing are UTF-8, the XHTML default.
+    """
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+    head = content[:1024]
+    match = XML_ENCODING.match(head) or META_CHARSET.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def extract_lxml(content):
+    """Stream the document through lxml's HTML parser into a RunCollector"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+        encoding = "utf-8"
+    else:
+        encoding = declared_encoding(content)
+        if encoding == "utf-16":
+            # lxml mis-reads big endian UTF-16, so hand it UTF-8 instead
+            content = content.decode(encoding).encode("utf-8")
+            encoding = "utf-8"
+    parser = etree.HTMLParser(target=RunCollector(), encoding=encoding)
+    parser.feed(content)
+    return parser.close()
+
+
+def _replay(node, collector):
+    for child in node.children:
+        if isinstance(child, Tag):
+            collector.start(child.name, child.attrs)
+            _replay(child, collector)
+            collector.end(child.name)
+        elif type(child) is NavigableString:
+            collector.data(str(child))
+
+
+def extract_soup(content):
+    """Slow path: parse with BeautifulSoup, then replay the tree into a RunCollector"""
+    if isinstance(content, bytes):
+        content = content.decode(declared_encoding(content), errors="ignore")
+    collector = RunCollector()
+    _replay(BeautifulSoup(content, "html.parser"), collector)
+    return collector.close()
+
+
+EXTRACTORS = {"soup": extract_soup}
+if LXML_AVAILABLE:
+    EXTRACTORS["lxml"] = extract_lxml
+DEFAULT_EXTRACTOR = "lxml" if LXML_AVAILABLE else "soup"
+
+
+def extract_chapter(content, backend=None):
+    """Runs of one chapter document (bytes or str).
+
+    Uses ``backend`` (default: lxml when installed) and falls back to
+    BeautifulSoup if that backend fails on the document.
+    """
+    backend = backend or DEFAULT_EXTRACTOR
+    try:
+        return EXTRACTORS[backend](content)
+    except Exception as e:
+        if backend == "soup":
+            raise
+        print(f"{backend} extraction failed, using BeautifulSoup: {e}")
+        return extract_soup(content)
+
+
+def chunk_runs(runs, size, first=None):
+    """Split runs into lists of Text.insert arguments of about ``size`` characters.
+
+    The first chunk holds about ``first`` characters when given. Long runs
+    are cut at a newline where possible; image runs are never cut. Chunks
+    are produced lazily, so a huge chapter is never copied as a whole.
+    """
+    limit = first or size
+    chunk = []
+    length = 0
+    for text, style in runs:
+        if style == IMAGE_STYLE:
+            chunk.extend((text, style))
+            length += 1
+            continue
+        while len(text) > limit - length:
+            room = max(limit - length, 0)
+            cut = text.rfind("\n", 0, room) + 1 or room
+            if cut:
+                chunk.extend((text[:cut], style))
+            yield chunk
+            chunk = []
+            length = 0
+            limit = size
+            text = text[cut:]
+        if text:
+            chunk.extend((text, style))
+            length += len(text)
+    if chunk:
+        yield chunk
+
+
+def runs_to_text(runs):
+    """Plain text of a chapter, one line per block"""
+    return "".join(
+        IMAGE_CHARACTER if style == IMAGE_STYLE else text for text, style in runs
+    ).rstrip("\n")
@@ -2,12 +2,18 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog, font as tkfont
 import os
 import re
+import queue
 import tempfile
 import threading
+import time
 from database import DatabaseManager
-from bs4 import BeautifulSoup
-import ebooklib
-from ebooklib import epub
+from cache_utils import content_hash
+from epub_chapters import ChapterStore
+from epub_cache import EpubCache
+from epub_reader import EpubReader, resolve_href
+from epub_images import ImageCache, decode_image
+from epub_search import IndexWorker
+from epub_text import RUN_STYLES, IMAGE_STYLE, IMAGE_CHARACTER, style_font, chunk_runs, runs_to_text
 
 # TTS imports - Usando gTTS
 try:
@@ -20,7 +26,29 @@ except ImportError:
     TTS_AVAILABLE = False
     print("✗ gTTS não disponível. Instale: pip install gTTS pygame")
 
+
+def speech_text(text):
+    """Chapter text without the placeholder characters of its images"""
+    return text.replace(IMAGE_CHARACTER, "")
+
+
+def chapter_texts(chapters, start):
+    """Spoken text of every chapter from ``start`` on, parsed one at a time.
+
+    Uses ``load_runs`` so a whole-book read does not push the chapters
+    being shown out of the store's LRU.
+    """
+    for chapter_num in range(start, len(chapters)):
+        text = speech_text(runs_to_text(chapters.load_runs(chapter_num)))
+        if text.strip():
+            yield f"{chapters.titles[chapter_num]}. {text}"
+
 class EPUBViewer:
+    # Chapters are inserted in chunks: the first one at once, the rest on idle
+    FIRST_CHUNK_CHARS = 8000
+    CHUNK_CHARS = 16000
+    CHUNK_TIME = 0.015  # seconds of insertion per idle callback
+
     def __init__(self, parent):
         self.parent = parent
         self.current_chapter = 0
@@ -29,6 +57,7 @@ class EPUBViewer:
         self.chapter_titles = []
         self.file_id = None
         self.epub_path = None
+        self.doc_hash = None
         
         # Font settings
         self.font_size = 12
@@ -46,6 +75,7 @@ class EPUBViewer:
         self.current_text = ""
         self.current_sentence_index = 0
         self.sentences = []
+        self.pending_texts = None
         self.temp_audio_files = []
         self.tts_language = 'pt'
         self.tts_speed = 1.0
@@ -54,9 +84,30 @@ class EPUBViewer:
         # Search
         self.search_results = []
         self.current_search_index = -1
+        self.search_query = ""
+        self.book_index = None
+        self.index_worker = None
+        self.index_queue = None
+        self.index_poll_job = None
         
-        # Bookmarks
+        # Bookmarks and the saved reading position (stored per book)
         self.bookmarks = []
+        self.position_job = None
+        
+        # Chunked chapter insertion
+        self.render_generation = 0
+        self.render_job = None
+        self.pending_position = None
+        self.pending_highlight = None
+        
+        # Inline images, decoded when scrolled near
+        self.image_cache = ImageCache()
+        self.image_reader = None
+        self.image_placeholder = None
+        self.image_box = (600, 800)
+        self.chapter_images = []
+        self.broken_images = set()
+        self.image_job = None
         
         self.setup_ui()
 
@@ -115,6 +166,10 @@ class EPUBViewer:
         
         # Bookmark
         ttk.Button(right_frame, text="🔖 Bookmark", command=self.add_bookmark).pack(side='left', padx=5)
+        bookmarks_button = ttk.Menubutton(right_frame, text="Bookmarks")
+        self.bookmarks_menu = tk.Menu(bookmarks_button, tearoff=0, postcommand=self.update_bookmarks_menu)
+        bookmarks_button['menu'] = self.bookmarks_menu
+        bookmarks_button.pack(side='left', padx=2)
 
         # Search controls
         search_frame = ttk.Frame(control_frame)
@@ -131,6 +186,7 @@ class EPUBViewer:
 
         # Content display
         self.setup_content_display()
+        self.setup_search_panel()
 
     def setup_tts_controls(self):
         """Setup TTS control panel"""
@@ -221,6 +277,7 @@ class EPUBViewer:
         """Setup content display area"""
         container = ttk.Frame(self.main_frame)
         container.pack(expand=True, fill='both')
+        self.content_container = container
 
         # Text widget with scrollbar
         self.text_widget = tk.Text(
@@ -237,14 +294,13 @@ class EPUBViewer:
         )
         self.text_widget.pack(side='left', expand=True, fill='both')
 
-        scrollbar = ttk.Scrollbar(container, orient='vertical', command=self.text_widget.yview)
-        scrollbar.pack(side='right', fill='y')
-        self.text_widget.configure(yscrollcommand=scrollbar.set)
+        self.text_scrollbar = ttk.Scrollbar(container, orient='vertical', command=self.text_widget.yview)
+        self.text_scrollbar.pack(side='right', fill='y')
+        self.text_widget.configure(yscrollcommand=self.on_text_scroll)
 
         # Configure text tags
+        self.configure_style_tags()
         self.text_widget.tag_configure("highlight", background="yellow", foreground="black")
-        self.text_widget.tag_configure("title", font=(self.font_family, self.font_size + 8, "bold"))
-        self.text_widget.tag_configure("heading", font=(self.font_family, self.font_size + 4, "bold"))
 
     # ============= EPUB METHODS =============
     
@@ -256,88 +312,253 @@ class EPUBViewer:
         )
         
         if filepath:
-            try:
-                self.epub_book = epub.read_epub(filepath)
-                self.epub_path = filepath
-                self.extract_chapters()
+            self.open_epub_file(filepath)
+
+    def open_epub_file(self, filepath, file_id=None):
+        """Open an EPUB file from a path (also used by the library).
+
+        The book resumes at its saved position: only that chapter is parsed
+        and shown.
+        """
+        try:
+            self.save_position()
+            if isinstance(self.chapters, ChapterStore):
+                self.chapters.close()
+            self.close_images()
+            self.cancel_indexing()
+            self.clear_search()
+            self.epub_path = filepath
+            self.file_id = file_id
+            self.doc_hash = content_hash(filepath)
+            self.bookmarks = DatabaseManager.get_bookmarks(self.doc_hash)
+            
+            # A cached book opens without unzipping or parsing the EPUB
+            cache = EpubCache.open(self.doc_hash)
+            self.epub_book = None if cache else EpubReader(filepath)
+            self.extract_chapters(cache)
+            
+            if self.chapters:
+                self.current_chapter = 0
+                position = None
+                resume = DatabaseManager.get_reading_position(self.doc_hash)
+                if resume and resume['chapter'] < len(self.chapters):
+                    self.current_chapter = resume['chapter']
+                    if resume['zoom'] and int(resume['zoom']) != self.font_size:
+                        self.font_size = int(resume['zoom'])
+                        self.apply_font()
+                    if resume['offset']:
+                        position = f"content+{resume['offset']}c"
+                self.render_chapter(position)
+                self.update_controls()
+                if cache is None:
+                    threading.Thread(target=self.chapters.save_cache, args=(self.doc_hash, filepath), daemon=True).start()
+                messagebox.showinfo("Success", f"Loaded {len(self.chapters)} chapters!")
+            else:
+                messagebox.showerror("Error", "No readable chapters found in this EPUB!")
                 
-                if self.chapters:
-                    self.current_chapter = 0
-                    self.render_chapter()
-                    self.update_controls()
-                    messagebox.showinfo("Success", f"Loaded {len(self.chapters)} chapters!")
-                else:
-                    messagebox.showerror("Error", "No readable chapters found in this EPUB!")
-                    
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open EPUB:\n{str(e)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open EPUB:\n{str(e)}")
 
-    def extract_chapters(self):
-        """Extract chapters from EPUB"""
+    def extract_chapters(self, cache=None):
+        """Index the chapters of the EPUB spine (or its cache); text is parsed when shown"""
         self.chapters = []
         self.chapter_titles = []
         
         try:
-            # Get all HTML documents
-            items = list(self.epub_book.get_items_of_type(ebooklib.ITEM_DOCUMENT))
-            
-            for idx, item in enumerate(items):
-                content = item.get_content().decode('utf-8', errors='ignore')
-                
-                # Parse HTML
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text
-                text = soup.get_text()
-                
-                # Clean up text
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                if text.strip():
-                    self.chapters.append(text)
-                    
-                    # Try to get chapter title
-                    title = soup.find(['h1', 'h2', 'h3', 'title'])
-                    if title:
-                        chapter_title = title.get_text().strip()
-                    else:
-                        chapter_title = f"Chapter {idx + 1}"
-                    
-                    self.chapter_titles.append(chapter_title)
+            if cache is not None:
+                self.chapters = ChapterStore.from_cache(cache)
+            else:
+                self.chapters = ChapterStore.from_reader(self.epub_book)
+            self.chapter_titles = self.chapters.titles
             
-            # Update chapter combo
-            self.chapter_combo['values'] = self.chapter_titles
+            # Update chapter combo (nested as in the table of contents)
+            self.chapter_combo['values'] = [self.chapters.label(i) for i in range(len(self.chapters))]
             
         except Exception as e:
             print(f"Error extracting chapters: {e}")
             messagebox.showerror("Error", f"Failed to extract chapters:\n{str(e)}")
 
-    def render_chapter(self):
-        """Render current chapter"""
+    def render_chapter(self, position=None, highlight=None):
+        """Render current chapter; ``position`` is a text index to scroll back to.
+
+        With ``highlight`` (a length) the text starting at ``position`` is
+        highlighted and shown instead, as soon as it has been inserted.
+        """
         if not self.chapters or self.current_chapter >= len(self.chapters):
             return
         
-        self.text_widget.config(state='normal')
-        self.text_widget.delete('1.0', 'end')
+        self.clear_text()
         
-        # Get chapter content
-        content = self.chapters[self.current_chapter]
+        # Get chapter runs (parsed now if they were not prefetched)
+        runs = self.chapters.runs(self.current_chapter)
         
         # Insert chapter title
         title = self.chapter_titles[self.current_chapter]
+        self.text_widget.config(state='normal')
         self.text_widget.insert('1.0', f"{title}\n\n", "title")
+        self.text_widget.mark_set('content', 'end-1c')
+        self.text_widget.mark_gravity('content', 'left')
+        self.text_widget.config(state='disabled')
+        self.text_widget.see('1.0')
         
-        # Insert content
-        self.text_widget.insert('end', content)
+        # Images are scaled to fit the text area
+        width = self.text_widget.winfo_width()
+        height = self.text_widget.winfo_height()
+        if width > 1 and height > 1:
+            self.image_box = (max(width - 140, 100), max(height - 60, 100))
         
+        # First screen now, the rest of the chapter while the UI is idle
+        chunks = chunk_runs(runs, self.CHUNK_CHARS, first=self.FIRST_CHUNK_CHARS)
+        self.pending_position = position
+        self.pending_highlight = highlight
+        first = next(chunks, None)
+        if first:
+            self.insert_chunk(first)
+        self.render_job = self.text_widget.after_idle(self.insert_next_chunks, self.render_generation, chunks)
+        self.chapters.prefetch(self.current_chapter)
+
+    def clear_text(self):
+        """Empty the text widget and cancel any insertion in progress"""
+        self.render_generation += 1
+        if self.render_job is not None:
+            self.text_widget.after_cancel(self.render_job)
+            self.render_job = None
+        self.text_widget.config(state='normal')
+        self.text_widget.delete('1.0', 'end')
         self.text_widget.config(state='disabled')
-        self.text_widget.see('1.0')
+        self.chapter_images = []
+        self.image_cache.unpin_all()
+
+    def insert_chunk(self, chunk):
+        """Append (text, tag, ...) arguments, in one call unless there are images"""
+        self.text_widget.config(state='normal')
+        start = 0
+        if IMAGE_STYLE in chunk:
+            for i in range(1, len(chunk), 2):
+                if chunk[i] == IMAGE_STYLE:
+                    if i - 1 > start:
+                        self.text_widget.insert('end', *chunk[start:i - 1])
+                    self.insert_image(chunk[i - 1])
+                    start = i + 1
+        if start < len(chunk):
+            self.text_widget.insert('end', *chunk[start:])
+        self.text_widget.config(state='disabled')
+        self.reveal_pending_position()
+
+    def reveal_pending_position(self):
+        """Scroll to (and highlight) the pending position once its text is in"""
+        if not self.pending_position:
+            return
+        end = self.pending_position
+        if self.pending_highlight:
+            end = f"{self.pending_position}+{self.pending_highlight}c"
+        if self.text_widget.compare(end, '<', 'end-1c'):
+            if self.pending_highlight:
+                self.text_widget.tag_add("highlight", self.pending_position, end)
+                self.text_widget.see(end)
+                self.text_widget.see(self.pending_position)
+            else:
+                self.text_widget.yview(self.pending_position)
+            self.pending_position = None
+            self.pending_highlight = None
+
+    def insert_next_chunks(self, generation, chunks):
+        """Insert chunks for a short time slice, then yield to the event loop"""
+        self.render_job = None
+        if generation != self.render_generation:
+            return
+        
+        start = time.perf_counter()
+        for chunk in chunks:
+            self.insert_chunk(chunk)
+            if time.perf_counter() - start > self.CHUNK_TIME:
+                self.render_job = self.text_widget.after_idle(self.insert_next_chunks, generation, chunks)
+                return
+        # A position past the end of the chapter is never reached
+        self.pending_position = None
+        self.pending_highlight = None
+
+    # ============= IMAGES =============
+
+    def insert_image(self, src):
+        """Embed an inline image; a placeholder stands in until it is scrolled near"""
+        path = resolve_href(self.chapters.names[self.current_chapter], src)
+        key = (path,) + self.image_box
+        photo = self.image_cache.get(key)
+        if photo is not None:
+            self.image_cache.pin(key)
+        else:
+            if self.image_placeholder is None:
+                self.image_placeholder = tk.PhotoImage(master=self.text_widget, width=24, height=24)
+            photo = self.image_placeholder
+            self.schedule_image_check()
+        name = self.text_widget.image_create('end', image=photo, align='baseline')
+        # The entry holds the PhotoImage itself so Tk keeps the embedded image
+        self.chapter_images.append([name, path, photo])
+
+    def on_text_scroll(self, first, last):
+        self.text_scrollbar.set(first, last)
+        self.schedule_image_check()
+        self.remember_position()
+
+    def schedule_image_check(self):
+        if self.image_job is None and self.chapter_images:
+            self.image_job = self.text_widget.after(50, self.load_visible_images)
+
+    def text_line(self, index):
+        return int(self.text_widget.index(index).split('.')[0])
+
+    def load_visible_images(self):
+        """Decode the images within a screen of the view; others stay placeholders"""
+        self.image_job = None
+        if not self.chapter_images:
+            return
+        top = self.text_line('@0,0')
+        bottom = self.text_line(f"@0,{self.text_widget.winfo_height()}")
+        margin = bottom - top + 1
+        
+        for entry in self.chapter_images:
+            name, path, shown = entry
+            if path in self.broken_images:
+                continue
+            line = self.text_line(name)
+            if line < top - margin or line > bottom + margin:
+                continue
+            key = (path,) + self.image_box
+            photo = self.image_cache.get(key)
+            if photo is None:
+                photo = self.decode_book_image(path, key)
+            if photo is not None and photo is not shown:
+                self.image_cache.pin(key)
+                self.text_widget.image_configure(name, image=photo)
+                entry[2] = photo
+
+    def decode_book_image(self, path, key):
+        try:
+            reader = self.chapters.source
+            if not isinstance(reader, EpubReader):
+                # Opened from the cache: only open the zip once images are needed
+                if self.image_reader is None:
+                    self.image_reader = EpubReader(self.epub_path)
+                reader = self.image_reader
+            img = decode_image(reader.read(path), *key[1:])
+            return self.image_cache.put(key, img, master=self.text_widget)
+        except Exception as e:
+            print(f"Failed to load image {path}: {e}")
+            self.broken_images.add(path)
+            return None
+
+    def close_images(self):
+        """Forget the images of the previous book"""
+        if self.image_job is not None:
+            self.text_widget.after_cancel(self.image_job)
+            self.image_job = None
+        if self.image_reader is not None:
+            self.image_reader.close()
+            self.image_reader = None
+        self.image_cache.clear()
+        self.broken_images = set()
+        self.chapter_images = []
 
     def prev_chapter(self):
         """Go to previous chapter"""
@@ -388,9 +609,24 @@ class EPUBViewer:
 
     def update_font(self):
         """Update text widget font"""
+        # Re-laying out a whole chapter in the new font freezes the UI, so
+        # empty the widget first and insert the chapter again in chunks
+        position = self.text_widget.index('@0,0') if self.chapters else None
+        if position:
+            self.clear_text()
+        self.apply_font()
+        if position:
+            self.render_chapter(position)
+
+    def apply_font(self):
         self.text_widget.config(font=(self.font_family, self.font_size))
+        self.configure_style_tags()
+
+    def configure_style_tags(self):
+        """Fonts of the chapter title and of every run style"""
         self.text_widget.tag_configure("title", font=(self.font_family, self.font_size + 8, "bold"))
-        self.text_widget.tag_configure("heading", font=(self.font_family, self.font_size + 4, "bold"))
+        for style in RUN_STYLES:
+            self.text_widget.tag_configure(style, font=style_font(style, self.font_family, self.font_size))
 
     def toggle_theme(self):
         """Toggle between light and dark theme"""
@@ -405,8 +641,49 @@ class EPUBViewer:
         
         self.text_widget.config(bg=self.bg_color, fg=self.fg_color)
 
-    # ============= BOOKMARKS =============
+    # ============= BOOKMARKS AND READING POSITION =============
     
+    def top_offset(self):
+        """Text indices above the top of the view, counted from the chapter start.
+
+        'indices' counts an embedded image as one position, like the
+        ``content+Nc`` index that restores it and the plain text of a chapter.
+        """
+        count = self.text_widget.count('content', '@0,0', 'indices')
+        return max(count[0], 0) if count else 0
+
+    def go_to_position(self, chapter, offset, highlight=None):
+        """Show a character offset of a chapter (and highlight ``highlight`` characters)"""
+        position = f"content+{offset}c"
+        if chapter != self.current_chapter:
+            self.current_chapter = chapter
+            self.render_chapter(position, highlight=highlight)
+            self.update_controls()
+        else:
+            self.text_widget.tag_remove("highlight", "1.0", "end")
+            self.pending_position = position
+            self.pending_highlight = highlight
+            self.reveal_pending_position()
+
+    def remember_position(self):
+        """Save the reading position once the view settles (1 s debounce)"""
+        if not self.doc_hash or not self.chapters or self.pending_position:
+            return
+        if self.position_job:
+            self.text_widget.after_cancel(self.position_job)
+        self.position_job = self.text_widget.after(1000, self.save_position)
+
+    def save_position(self):
+        """Write a pending reading position to the database now"""
+        if not self.position_job:
+            return
+        self.text_widget.after_cancel(self.position_job)
+        self.position_job = None
+        if self.pending_position:
+            return  # not scrolled back yet; revealing it schedules a new save
+        DatabaseManager.save_reading_position(
+            self.doc_hash, self.file_id, self.current_chapter, self.top_offset(), self.font_size)
+
     def add_bookmark(self):
         """Add bookmark at current position"""
         if not self.chapters:
@@ -419,52 +696,149 @@ class EPUBViewer:
         )
         
         if bookmark_name:
-            bookmark = {
-                'name': bookmark_name,
-                'chapter': self.current_chapter,
-                'position': self.text_widget.index('insert')
-            }
-            self.bookmarks.append(bookmark)
+            bookmark_id = DatabaseManager.add_bookmark(
+                self.doc_hash, self.file_id, bookmark_name, self.current_chapter, self.top_offset())
+            if bookmark_id is None:
+                messagebox.showerror("Error", "Failed to save bookmark!")
+                return
+            self.bookmarks = DatabaseManager.get_bookmarks(self.doc_hash)
             messagebox.showinfo("Success", "Bookmark added!")
 
+    def update_bookmarks_menu(self):
+        """Fill the bookmarks menu with the bookmarks of the open book"""
+        menu = self.bookmarks_menu
+        menu.delete(0, 'end')
+        if not self.bookmarks:
+            menu.add_command(label="No bookmarks", state='disabled')
+            return
+        
+        delete_menu = tk.Menu(menu, tearoff=0)
+        for bookmark in self.bookmarks:
+            chapter = bookmark['chapter']
+            title = self.chapter_titles[chapter] if chapter < len(self.chapter_titles) else f"Chapter {chapter + 1}"
+            label = f"{bookmark['name']} ({title})"
+            menu.add_command(label=label, command=lambda b=bookmark: self.go_to_bookmark(b))
+            delete_menu.add_command(label=label, command=lambda b=bookmark: self.delete_bookmark(b))
+        menu.add_separator()
+        menu.add_cascade(label="Delete", menu=delete_menu)
+
+    def go_to_bookmark(self, bookmark):
+        if bookmark['chapter'] < len(self.chapters):
+            self.go_to_position(bookmark['chapter'], bookmark['offset'])
+
+    def delete_bookmark(self, bookmark):
+        if messagebox.askyesno("Confirm", f"Delete bookmark '{bookmark['name']}'?"):
+            DatabaseManager.delete_bookmark(bookmark['id'])
+            self.bookmarks = DatabaseManager.get_bookmarks(self.doc_hash)
+
     # ============= SEARCH =============
     
+    def setup_search_panel(self):
+        """Results list shown under the text while searching"""
+        self.search_panel = ttk.Frame(self.main_frame)
+
+        self.search_status_label = ttk.Label(self.search_panel, text="", font=('Arial', 9, 'italic'))
+        self.search_status_label.pack(side='top', anchor='w')
+
+        list_frame = ttk.Frame(self.search_panel)
+        list_frame.pack(fill='x')
+
+        self.search_listbox = tk.Listbox(list_frame, height=6, activestyle='none')
+        self.search_listbox.pack(side='left', fill='x', expand=True)
+        list_scroll = ttk.Scrollbar(list_frame, orient='vertical', command=self.search_listbox.yview)
+        list_scroll.pack(side='right', fill='y')
+        self.search_listbox.configure(yscrollcommand=list_scroll.set)
+        self.search_listbox.bind('<<ListboxSelect>>', self.on_search_result_select)
+
     def search_text(self):
-        """Search for text in current chapter"""
+        """Search the whole book; the word index is built on the first search"""
         search_term = self.search_var.get().strip()
-        if not search_term:
+        if not search_term or not self.chapters:
             return
         
-        # Remove previous highlights
-        self.text_widget.tag_remove("highlight", "1.0", "end")
+        self.search_query = search_term
+        self.search_results = []
+        self.current_search_index = -1
+        self.search_listbox.delete(0, 'end')
+        self.search_panel.pack(side='bottom', fill='x', pady=(5, 0), before=self.content_container)
         
-        # Search and highlight
-        start_pos = "1.0"
-        count = 0
+        if self.book_index is not None:
+            self.run_search()
+        elif self.index_worker is None:
+            self.search_status_label.config(text="Indexing book...")
+            self.index_queue = queue.Queue()
+            self.index_worker = IndexWorker(self.chapters, self.index_queue)
+            self.index_worker.start()
+            self.poll_index_worker()
+
+    def poll_index_worker(self):
+        """Follow the index build and run the pending query when it is ready"""
+        self.index_poll_job = None
+        try:
+            while True:
+                kind, value = self.index_queue.get_nowait()
+                if kind == 'progress':
+                    done, total = value
+                    self.search_status_label.config(text=f"Indexing book... chapter {done}/{total}")
+                elif kind == 'done':
+                    self.book_index = value
+                    self.index_worker = None
+                    self.run_search()
+                    return
+                elif kind == 'error':
+                    self.index_worker = None
+                    self.search_status_label.config(text=f"Search failed: {value}")
+                    return
+        except queue.Empty:
+            pass
+        self.index_poll_job = self.text_widget.after(50, self.poll_index_worker)
+
+    def cancel_indexing(self):
+        """Stop building the index of the previous book"""
+        if self.index_worker:
+            self.index_worker.cancel()
+            self.index_worker = None
+        if self.index_poll_job:
+            self.text_widget.after_cancel(self.index_poll_job)
+            self.index_poll_job = None
+        self.book_index = None
+
+    def run_search(self):
+        """Look up the current query in the book index and list the hits"""
+        if not self.search_query:
+            return
+        self.search_results = self.book_index.search(self.search_query)
+        self.search_listbox.delete(0, 'end')
+        for hit in self.search_results:
+            title = self.chapter_titles[hit['chapter']]
+            self.search_listbox.insert('end', f"{title}: {hit['snippet']}")
         
-        while True:
-            start_pos = self.text_widget.search(search_term, start_pos, "end", nocase=True)
-            if not start_pos:
-                break
-            
-            end_pos = f"{start_pos}+{len(search_term)}c"
-            self.text_widget.tag_add("highlight", start_pos, end_pos)
-            start_pos = end_pos
-            count += 1
-        
-        if count > 0:
-            # Scroll to first occurrence
-            first_pos = self.text_widget.search(search_term, "1.0", "end", nocase=True)
-            if first_pos:
-                self.text_widget.see(first_pos)
-            messagebox.showinfo("Search", f"Found {count} occurrence(s)")
+        count = len(self.search_results)
+        self.search_status_label.config(text=f"{count} match(es) for '{self.search_query}'")
+        if self.search_results:
+            self.show_search_result(0)
         else:
-            messagebox.showinfo("Search", "Text not found in current chapter")
+            messagebox.showinfo("Search", f"Text '{self.search_query}' not found in the book")
+
+    def on_search_result_select(self, event=None):
+        selection = self.search_listbox.curselection()
+        if selection:
+            self.show_search_result(selection[0])
+
+    def show_search_result(self, index):
+        """Open the chapter of a hit, scroll to it and highlight it"""
+        hit = self.search_results[index]
+        self.current_search_index = index
+        self.go_to_position(hit['chapter'], hit['offset'], highlight=hit['length'])
 
     def clear_search(self):
-        """Clear search highlights"""
+        """Clear search highlights and results"""
         self.search_var.set("")
+        self.search_query = ""
+        self.search_results = []
+        self.current_search_index = -1
         self.text_widget.tag_remove("highlight", "1.0", "end")
+        self.search_panel.pack_forget()
 
     # ============= TTS METHODS =============
     
@@ -486,7 +860,7 @@ class EPUBViewer:
             chapter_number = self.current_chapter
         
         if 0 <= chapter_number < len(self.chapters):
-            return self.chapters[chapter_number]
+            return speech_text(self.chapters[chapter_number])
         return ""
 
     def read_current_chapter(self):
@@ -516,22 +890,36 @@ class EPUBViewer:
             messagebox.showwarning("Warning", "No book loaded!")
             return
         
-        all_text = []
-        for chapter_num in range(self.current_chapter, len(self.chapters)):
-            text = self.extract_chapter_text(chapter_num)
+        # Chapters are parsed on the reading thread as speech reaches them
+        self.start_reading(chapter_texts(self.chapters, self.current_chapter))
+
+    def split_sentences(self, text):
+        """Split text into the sentences spoken one by one"""
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 2]
+
+    def next_sentences(self):
+        """Pull the next chunk of a lazy text source into self.sentences"""
+        while self.pending_texts is not None:
+            try:
+                text = next(self.pending_texts)
+            except StopIteration:
+                self.pending_texts = None
+                return False
+            except Exception as e:
+                print(f"Error extracting text: {e}")
+                self.pending_texts = None
+                return False
             if text:
-                title = self.chapter_titles[chapter_num]
-                all_text.append(f"{title}. {text}")
-        
-        if not all_text:
-            messagebox.showwarning("Warning", "No text found!")
-            return
-        
-        combined_text = " ".join(all_text)
-        self.start_reading(combined_text)
+                self.current_text = f"{self.current_text} {text}" if self.current_text else text
+            sentences = self.split_sentences(text)
+            if sentences:
+                self.sentences.extend(sentences)
+                return True
+        return False
 
     def start_reading(self, text):
-        """Start reading text"""
+        """Start reading text (a string or an iterator of strings)"""
         print("\n" + "="*60)
         print("=== START READING (EPUB) ===")
         
@@ -543,9 +931,15 @@ class EPUBViewer:
         
         self.cleanup_temp_files()
         
-        self.current_text = text
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        self.sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 2]
+        if isinstance(text, str):
+            self.current_text = text
+            self.sentences = self.split_sentences(text)
+            self.pending_texts = None
+        else:
+            self.current_text = ""
+            self.sentences = []
+            self.pending_texts = iter(text)
+            self.next_sentences()
         
         if not self.sentences:
             messagebox.showwarning("Warning", "No valid text to read!")
@@ -575,7 +969,12 @@ class EPUBViewer:
             speed = self.tts_speed
             use_slow = (speed < 0.8)
             
-            for idx in range(len(self.sentences)):
+            idx = -1
+            while True:
+                idx += 1
+                if idx >= len(self.sentences) and not self.next_sentences():
+                    break
+
                 if self.stop_event.is_set():
                     break
                 
@@ -0,0 +1,185 @@
+import json
+import re
+import threading
+import fitz  # PyMuPDF
+from database import DatabaseManager
+from pdf_render import MUPDF_LOCK
+from word_layer import WordIndex
+
+SNIPPET_CONTEXT = 40
+
+
+class TextLayer:
+    """Words of one page joined into a searchable string.
+
+    ``spans`` maps character ranges of ``text`` back to word boxes, so a
+    regex match over the text can be turned into rectangles on the page.
+    ``index`` is the spatial index used for selection and highlights.
+    """
+
+    def __init__(self, words):
+        parts = []
+        spans = []
+        position = 0
+        for word in words:
+            x0, y0, x1, y1, token = word[:5]
+            if parts:
+                parts.append(" ")
+                position += 1
+            spans.append((position, position + len(token), (x0, y0, x1, y1)))
+            parts.append(token)
+            position += len(token)
+        self.words = words
+        self.text = "".join(parts)
+        self.spans = spans
+        self._index = None
+
+    @property
+    def index(self):
+        """WordIndex over the words, built on first use"""
+        if self._index is None:
+            self._index = WordIndex(self.words)
+        return self._index
+
+    def rects_for(self, start, end):
+        """Word boxes covered by text[start:end], merged per line"""
+        rects = []
+        for span_start, span_end, box in self.spans:
+            if span_end <= start:
+                continue
+            if span_start >= end:
+                break
+            if rects and abs(rects[-1][1] - box[1]) < 2 and abs(rects[-1][3] - box[3]) < 2:
+                x0, y0, x1, y1 = rects[-1]
+                rects[-1] = (min(x0, box[0]), y0, max(x1, box[2]), y1)
+            else:
+                rects.append(tuple(box))
+        return [fitz.Rect(r) for r in rects]
+
+    def snippet(self, start, end):
+        before = self.text[max(start - SNIPPET_CONTEXT, 0):start]
+        after = self.text[end:end + SNIPPET_CONTEXT]
+        prefix = "…" if start > SNIPPET_CONTEXT else ""
+        suffix = "…" if end + SNIPPET_CONTEXT < len(self.text) else ""
+        return f"{prefix}{before}[{self.text[start:end]}]{after}{suffix}"
+
+
+def extract_blocks(page):
+    """Text blocks of a page in reading order, lines joined into paragraphs"""
+    blocks = []
+    for block in page.get_text("blocks", sort=True):
+        if block[6] != 0:  # image block
+            continue
+        text = re.sub(r'(\w)-\n(\w)', r'\1\2', block[4])
+        text = re.sub(r'\s*\n\s*', ' ', text).strip()
+        if text:
+            blocks.append(text)
+    return blocks
+
+
+def extract_words(page):
+    """Words of a page in reading order, rounded for compact storage"""
+    return [
+        [round(w[0], 2), round(w[1], 2), round(w[2], 2), round(w[3], 2), w[4]]
+        for w in page.get_text("words", sort=True)
+    ]
+
+
+class PageTextCache:
+    """Text of every page of one document version, extracted at most once.
+
+    Pages are looked up in memory, then in SQLite (``texto_paginas``, keyed
+    by content hash and page), and only then extracted with MuPDF. Search,
+    TTS and indexing all read through this cache. It can be used from any
+    thread: unless a document is passed in, pages are extracted from one
+    document of its own, opened on first use and shared by every thread -
+    MuPDF calls are serialized by MUPDF_LOCK anyway. ``close`` releases it.
+    """
+
+    def __init__(self, pdf_path, doc_hash):
+        self.pdf_path = pdf_path
+        self.doc_hash = doc_hash
+        self.layers = {}
+        self.block_lists = {}
+        self.lock = threading.Lock()
+        self.doc = None
+        self.closed = False
+        self.preloaded = False
+
+    def document(self):
+        """The cache's own document; call with MUPDF_LOCK held"""
+        if self.closed:
+            raise ValueError("page text cache is closed")
+        if self.doc is None:
+            self.doc = fitz.open(self.pdf_path)
+        return self.doc
+
+    def close(self):
+        """Close the cache's document (another one was opened)"""
+        with MUPDF_LOCK:
+            self.closed = True
+            if self.doc is not None:
+                self.doc.close()
+                self.doc = None
+
+    def preload(self):
+        """Load every page already persisted for this document (one query)"""
+        if self.preloaded:
+            return
+        rows = DatabaseManager.get_page_texts(self.doc_hash)
+        with self.lock:
+            for page_number, palavras in rows:
+                if page_number not in self.layers:
+                    self.layers[page_number] = TextLayer(json.loads(palavras))
+            self.preloaded = True
+
+    def layer(self, page_number, doc=None):
+        """Return the TextLayer of a page"""
+        layer = self.layers.get(page_number)
+        if layer is not None:
+            return layer
+
+        if not self.preloaded:
+            rows = DatabaseManager.get_page_texts(self.doc_hash, page_number)
+            if rows:
+                layer = TextLayer(json.loads(rows[0][1]))
+                with self.lock:
+                    self.layers[page_number] = layer
+                return layer
+
+        with MUPDF_LOCK:
+            words = extract_words((doc or self.document()).load_page(page_number))
+        layer = TextLayer(words)
+        with self.lock:
+            self.layers[page_number] = layer
+        DatabaseManager.save_page_texts(self.doc_hash, [(page_number, json.dumps(words))])
+        return layer
+
+    def blocks(self, page_number, doc=None):
+        """Paragraph texts of a page (for reader mode), cached like the words"""
+        blocks = self.block_lists.get(page_number)
+        if blocks is not None:
+            return blocks
+
+        data = DatabaseManager.get_page_blocks(self.doc_hash, page_number)
+        if data:
+            blocks = json.loads(data)
+        else:
+            layer = self.layers.get(page_number)
+            with MUPDF_LOCK:
+                page = (doc or self.document()).load_page(page_number)
+                blocks = extract_blocks(page)
+                words = layer.words if layer else extract_words(page)
+                page = None
+            DatabaseManager.save_page_blocks(self.doc_hash, page_number, json.dumps(words), json.dumps(blocks))
+        with self.lock:
+            self.block_lists[page_number] = blocks
+        return blocks
+
+    def text(self, page_number, doc=None):
+        """Plain text of a page with whitespace collapsed"""
+        try:
+            return re.sub(r'\s+', ' ', self.layer(page_number, doc).text).strip()
+        except Exception as e:
+            print(f"Error extracting text: {e}")
+            return ""
@@ -0,0 +1,128 @@
+import os
+import threading
+import fitz  # PyMuPDF
+from database import DatabaseManager
+from pdf_render import MUPDF_LOCK
+
+# Colour names used by the viewer, as PDF RGB
+EXPORT_COLORS = {
+    "red": (1, 0, 0),
+    "blue": (0, 0, 1),
+    "green": (0, 0.5, 0),
+    "yellow": (1, 1, 0),
+    "black": (0, 0, 0),
+}
+
+
+def export_color(name):
+    return EXPORT_COLORS.get(name, EXPORT_COLORS["red"])
+
+
+def annotated_name(filepath):
+    stem, _ = os.path.splitext(os.path.basename(filepath))
+    return f"{stem}_annotated.pdf"
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def burn_page_marks(page, annotations, highlights):
+    """Add the saved annotations and highlights of one page as PDF annotations"""
+    # Marks are stored in the coordinates of the displayed (rotated) page
+    derotate = page.derotation_matrix
+    for x1, y1, x2, y2, texto, cor in annotations:
+        annot = page.add_rect_annot(fitz.Rect(x1, y1, x2, y2) * derotate)
+        annot.set_colors(stroke=export_color(cor))
+        annot.set_border(width=2)
+        if texto:
+            annot.set_info(content=texto)
+        annot.update()
+
+    for texto_destacado, cor, bbox, _ in highlights:
+        if not bbox:
+            continue
+        rect = fitz.Rect(*map(float, bbox.split(","))) * derotate
+        annot = page.add_highlight_annot(rect)
+        annot.set_colors(stroke=export_color(cor))
+        if texto_destacado:
+            annot.set_info(content=texto_destacado)
+        annot.update()
+
+
+class ExportJob(threading.Thread):
+    """Writes copies of PDFs with their database marks burned in as annotations.
+
+    ``files`` is a list of (file_id, source path, destination path). Only
+    pages that have marks are loaded, one at a time, and each document is
+    written out by MuPDF, so memory stays flat however big the file is.
+    MuPDF is only called under MUPDF_LOCK, one page at a time.
+    Progress goes to ``results`` as ('progress', (file_index, file_count,
+    done_pages, marked_pages, name)), ('file', (name, destination)),
+    ('error', (name, message)) and finally ('done', exported_count).
+    """
+
+    def __init__(self, files, results):
+        super().__init__(daemon=True)
+        self.files = files
+        self.results = results
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        exported = 0
+        for index, (file_id, source, destination) in enumerate(self.files):
+            if self.cancel_event.is_set():
+                break
+            name = os.path.basename(source)
+            try:
+                if self.export_file(index, file_id, source, destination, name):
+                    exported += 1
+                    self.results.put(('file', (name, destination)))
+            except Exception as e:
+                self.results.put(('error', (name, str(e))))
+        self.results.put(('done', exported))
+
+    def export_file(self, index, file_id, source, destination, name):
+        pages = DatabaseManager.get_marked_pages(file_id)
+        total = len(self.files)
+        self.results.put(('progress', (index, total, 0, len(pages), name)))
+
+        temp_path = destination + ".tmp"
+        with MUPDF_LOCK:
+            doc = fitz.open(source)
+        try:
+            for done, page_number in enumerate(pages, 1):
+                if self.cancel_event.is_set():
+                    return False
+                if 0 <= page_number < len(doc):
+                    annotations = DatabaseManager.get_annotations(file_id, page_number)
+                    highlights = DatabaseManager.get_highlights(file_id, page_number)
+                    with MUPDF_LOCK:
+                        page = doc.load_page(page_number)
+                        burn_page_marks(page, annotations, highlights)
+                        page = None
+                self.results.put(('progress', (index, total, done, len(pages), name)))
+
+            with MUPDF_LOCK:
+                doc.save(temp_path, deflate=True)
+        except Exception:
+            remove_file(temp_path)
+            raise
+        finally:
+            with MUPDF_LOCK:
+                doc.close()
+        if self.cancel_event.is_set():
+            remove_file(temp_path)
+            return False
+        try:
+            os.replace(temp_path, destination)
+        except OSError:
+            remove_file(temp_path)
+            raise
+        return True
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+import fitz  # PyMuPDF
+from pdf_render import MUPDF_LOCK
+
+
+class LinkMap:
+    """Internal links of each page as (rect, target page), kept in a small LRU.
+
+    Rects are in PDF coordinates. Pages are filled when they are rendered
+    (the page object is already loaded then) or on the first hit test.
+    """
+
+    MAX_PAGES = 64
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.pages = OrderedDict()
+
+    def store(self, page_number, page):
+        """Record the links of a loaded page"""
+        links = []
+        with MUPDF_LOCK:
+            page_links = page.get_links()
+        for link in page_links:
+            if link.get('kind') in (fitz.LINK_GOTO, fitz.LINK_NAMED) and link.get('page', -1) >= 0:
+                links.append((tuple(link['from']), link['page']))
+        self.pages[page_number] = links
+        self.pages.move_to_end(page_number)
+        while len(self.pages) > self.MAX_PAGES:
+            self.pages.popitem(last=False)
+        return links
+
+    def links(self, page_number):
+        links = self.pages.get(page_number)
+        if links is None:
+            with MUPDF_LOCK:
+                page = self.doc.load_page(page_number)
+            return self.store(page_number, page)
+        self.pages.move_to_end(page_number)
+        return links
+
+    def hit(self, page_number, x, y):
+        """Target page of the link at (x, y), or None"""
+        for (x0, y0, x1, y1), target in self.links(page_number):
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return target
+        return None
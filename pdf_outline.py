@@ -0,0 +1,176 @@
+import json
+import os
+from tkinter import ttk
+from cache_utils import cache_dir
+from pdf_render import MUPDF_LOCK
+
+ROMAN_NUMERALS = [
+    (1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+    (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i"),
+]
+
+
+def roman(number):
+    result = ""
+    for value, numeral in ROMAN_NUMERALS:
+        while number >= value:
+            result += numeral
+            number -= value
+    return result
+
+
+def letters(number):
+    """a, b, ... z, aa, bb, ... as used by PDF page labels"""
+    return chr(ord("a") + (number - 1) % 26) * ((number - 1) // 26 + 1)
+
+
+def format_label(rule, number):
+    style = rule.get('style', '')
+    if style == 'D':
+        text = str(number)
+    elif style in ('r', 'R'):
+        text = roman(number)
+    elif style in ('a', 'A'):
+        text = letters(number)
+    else:
+        text = ""
+    if style in ('R', 'A'):
+        text = text.upper()
+    return rule.get('prefix', '') + text
+
+
+def labels_from_rules(rules, page_count):
+    """Label of every page from the document's page-label rules"""
+    if not rules:
+        return []
+    rules = sorted(rules, key=lambda r: r['startpage'])
+    labels = []
+    current = None
+    for page_number in range(page_count):
+        while rules and rules[0]['startpage'] <= page_number:
+            current = rules.pop(0)
+        if current is None:
+            labels.append(str(page_number + 1))
+        else:
+            labels.append(format_label(current, current.get('firstpagenum', 1) + page_number - current['startpage']))
+    return labels
+
+
+class NavigationIndex:
+    """Outline and page labels of one document, computed once per content hash.
+
+    ``toc`` holds ``[level, title, page]`` rows (pages 0-based, -1 for
+    entries without a target); ``labels`` is empty when the document
+    defines no page labels.
+    """
+
+    def __init__(self, toc, labels):
+        self.toc = toc
+        self.labels = labels
+        self.label_pages = {}
+        for page_number, label in enumerate(labels):
+            self.label_pages.setdefault(label.lower(), page_number)
+
+    @classmethod
+    def load(cls, doc, doc_hash):
+        path = os.path.join(cache_dir('outline'), f"{doc_hash}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data['toc'], data['labels'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        with MUPDF_LOCK:
+            raw_toc = doc.get_toc(simple=True)
+            rules = doc.get_page_labels() if hasattr(doc, "get_page_labels") else []
+        # get_toc reports entries without a target as page -1
+        toc = [[level, title, page - 1 if page > 0 else -1] for level, title, page in raw_toc]
+        labels = labels_from_rules(rules, len(doc))
+        try:
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump({'toc': toc, 'labels': labels}, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Failed to save outline cache: {e}")
+        return cls(toc, labels)
+
+    def label(self, page_number):
+        if 0 <= page_number < len(self.labels):
+            return self.labels[page_number]
+        return None
+
+    def resolve(self, text, page_count):
+        """Page for a "go to" entry: a page label first, then a page number"""
+        text = text.strip()
+        if not text:
+            return None
+        page_number = self.label_pages.get(text.lower())
+        if page_number is not None:
+            return page_number
+        if text.isdigit() and 1 <= int(text) <= page_count:
+            return int(text) - 1
+        return None
+
+
+class OutlinePanel:
+    """Collapsible outline (bookmarks) tree for PDFViewer.
+
+    Children are inserted when their parent is first opened, so outlines
+    with thousands of entries show up at once.
+    """
+
+    def __init__(self, parent, on_select):
+        self.on_select = on_select
+        self.children = {}
+        self.pages = {}
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, show='tree', selectmode='browse')
+        self.tree.column('#0', width=220)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scroll = ttk.Scrollbar(self.frame, orient='vertical', command=self.tree.yview)
+        scroll.pack(side='right', fill='y')
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        self.tree.bind('<<TreeviewOpen>>', self.on_open)
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+
+    def set_outline(self, toc):
+        """Show the outline of a newly opened document"""
+        self.tree.delete(*self.tree.get_children())
+        self.children = {"": []}
+        self.pages = {}
+
+        # Flat [level, title, page] rows into a parent -> children map
+        stack = [(0, "")]
+        for position, (level, title, page_number) in enumerate(toc):
+            while stack[-1][0] >= level:
+                stack.pop()
+            node = f"n{position}"
+            self.children.setdefault(stack[-1][1], []).append((node, title, page_number))
+            stack.append((level, node))
+
+        if not toc:
+            self.tree.insert("", 'end', text="(no outline)")
+        self.insert_children("")
+
+    def insert_children(self, parent):
+        for node, title, page_number in self.children.pop(parent, []):
+            self.tree.insert(parent, 'end', iid=node, text=title)
+            self.pages[node] = page_number
+            if node in self.children:
+                self.tree.insert(node, 'end', iid=f"{node}_stub")
+
+    def on_open(self, event=None):
+        node = self.tree.focus()
+        if node in self.children:
+            self.tree.delete(f"{node}_stub")
+            self.insert_children(node)
+
+    def on_tree_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            page_number = self.pages.get(selection[0], -1)
+            if page_number >= 0:
+                self.on_select(page_number)
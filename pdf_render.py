@@ -0,0 +1,127 @@
+import threading
+import tkinter as tk
+import fitz  # PyMuPDF
+from PIL import Image, ImageTk
+
+# NumPy is optional - without it highlights are drawn as canvas items
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# MuPDF keeps global state shared by every Document, so PyMuPDF must not
+# be called from two threads at once. Every fitz call made off the Tk
+# thread, and the Tk thread's own, run while holding this lock. PyMuPDF
+# keeps the GIL during its calls anyway, so no parallelism is lost; work
+# that should run in parallel goes to the render pool's processes.
+MUPDF_LOCK = threading.RLock()
+
+# Same colours/alpha the old RGBA overlay used
+HIGHLIGHT_ALPHA = 80
+HIGHLIGHT_RGB = {
+    "yellow": (255, 255, 0),
+    "red": (255, 0, 0),
+}
+
+
+class PixelBuffer:
+    """RGB pixels rendered elsewhere (e.g. by the render pool).
+
+    Quacks like a fitz.Pixmap for blend_highlights, pixmap_to_photo and
+    the render cache. Rows are stored without padding.
+    """
+
+    n = 3
+
+    def __init__(self, width, height, samples):
+        self.width = width
+        self.height = height
+        self.stride = width * 3
+        self.samples_mv = memoryview(bytearray(samples))
+
+    @property
+    def samples(self):
+        return self.samples_mv.tobytes()
+
+    def tobytes(self, output="ppm"):
+        if output == "ppm":
+            return b"P6\n%d %d\n255\n" % (self.width, self.height) + self.samples_mv.tobytes()
+        with MUPDF_LOCK:
+            pix = fitz.Pixmap(fitz.csRGB, self.width, self.height, self.samples, 0)
+            return pix.tobytes(output)
+
+
+def highlight_rgb(color):
+    """Return the RGB triple used to blend a highlight colour"""
+    return HIGHLIGHT_RGB.get(color, HIGHLIGHT_RGB["red"])
+
+
+def render_pixmap(page, zoom):
+    """Render a page to an RGB pixmap (no alpha channel)"""
+    with MUPDF_LOCK:
+        return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+
+def blend_highlights(pix, rects):
+    """Blend highlight rectangles into the pixmap buffer in place.
+
+    ``rects`` is a list of ``(x1, y1, x2, y2, color)`` in pixel coordinates.
+    Only the pixels under each rectangle are touched. Returns False when
+    NumPy is not available so the caller can fall back to canvas items.
+    """
+    if not rects:
+        return True
+    if not NUMPY_AVAILABLE:
+        return False
+
+    pixels = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+    alpha = HIGHLIGHT_ALPHA
+    for x1, y1, x2, y2, color in rects:
+        x1, x2 = max(int(x1), 0), min(int(round(x2)), pix.width)
+        y1, y2 = max(int(y1), 0), min(int(round(y2)), pix.height)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        region = pixels[y1:y2, x1 * pix.n:x2 * pix.n].reshape(y2 - y1, x2 - x1, pix.n)
+        rgb = np.array(highlight_rgb(color), dtype=np.uint16)
+        blended = (region[..., :3].astype(np.uint16) * (255 - alpha) + rgb * alpha + 127) // 255
+        region[..., :3] = blended.astype(np.uint8)
+    return True
+
+
+def crop_pixels(pix, x1, y1, x2, y2):
+    """Copy a rectangle of an RGB pixmap into a new PixelBuffer"""
+    x1, x2 = max(int(x1), 0), min(int(round(x2)), pix.width)
+    y1, y2 = max(int(y1), 0), min(int(round(y2)), pix.height)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    rows = bytearray()
+    row_bytes = (x2 - x1) * pix.n
+    for row in range(y1, y2):
+        start = row * pix.stride + x1 * pix.n
+        rows += pix.samples_mv[start:start + row_bytes]
+    return PixelBuffer(x2 - x1, y2 - y1, rows)
+
+
+def compose_pixels(parts, width, height):
+    """Paste pixmaps side by side into one white PixelBuffer; parts are (pix, x)"""
+    buffer = bytearray(b"\xff") * (width * height * 3)
+    for pix, x in parts:
+        row_bytes = min(pix.width, width - x) * 3
+        for row in range(min(pix.height, height)):
+            start = row * pix.stride
+            dest = (row * width + x) * 3
+            buffer[dest:dest + row_bytes] = pix.samples_mv[start:start + row_bytes]
+    return PixelBuffer(width, height, buffer)
+
+
+def pixmap_to_photo(pix, master=None):
+    """Hand the pixmap to Tk as PPM data, without going through PIL"""
+    with MUPDF_LOCK:
+        data = pix.tobytes("ppm")
+    try:
+        return tk.PhotoImage(master=master, data=data, format="PPM")
+    except tk.TclError:
+        # Tk builds without binary PPM support - use the PIL path
+        img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples, "raw", "RGB", pix.stride, 1)
+        return ImageTk.PhotoImage(image=img, master=master)
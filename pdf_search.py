@@ -0,0 +1,59 @@
+import re
+import threading
+
+
+def compile_query(query, case_sensitive=False, regex=False):
+    """Build the pattern used by the search (raises re.error for bad regex)"""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def search_layer(layer, pattern, page_number):
+    """All hits of a pattern in one page's text layer"""
+    hits = []
+    for match in pattern.finditer(layer.text):
+        if match.end() == match.start():
+            continue
+        hits.append({
+            'page': page_number,
+            'rects': layer.rects_for(match.start(), match.end()),
+            'snippet': layer.snippet(match.start(), match.end()),
+        })
+    return hits
+
+
+class SearchWorker(threading.Thread):
+    """Scans a whole document for a pattern and streams hits into a queue.
+
+    Pages are visited from ``start_page`` to the end, then from the start.
+    Text comes from the document's PageTextCache, so each page is only
+    extracted once per document version.
+    """
+
+    def __init__(self, text_cache, page_count, pattern, start_page, results):
+        super().__init__(daemon=True)
+        self.text_cache = text_cache
+        self.page_count = page_count
+        self.pattern = pattern
+        self.start_page = start_page
+        self.results = results
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            self.text_cache.preload()
+            page_count = self.page_count
+            order = list(range(self.start_page, page_count)) + list(range(0, self.start_page))
+            for scanned, page_number in enumerate(order, 1):
+                if self.cancel_event.is_set():
+                    return
+                layer = self.text_cache.layer(page_number)
+                for hit in search_layer(layer, self.pattern, page_number):
+                    self.results.put(('hit', hit))
+                self.results.put(('progress', (scanned, page_count)))
+            self.results.put(('done', None))
+        except Exception as e:
+            self.results.put(('error', str(e)))
@@ -1,13 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import fitz  # PyMuPDF
-from PIL import Image, ImageTk, ImageDraw
 import warnings
 from database import DatabaseManager
+from pdf_render import PixelBuffer, render_pixmap, blend_highlights, crop_pixels, compose_pixels, pixmap_to_photo, MUPDF_LOCK
+from render_scheduler import RenderScheduler
+from thumbnails import ThumbnailSidebar
+from pdf_outline import NavigationIndex, OutlinePanel
+from pdf_links import LinkMap
+from cache_utils import content_hash, known_hash
+from render_cache import RenderCache
+from pdf_search import SearchWorker, compile_query
+from page_text_cache import PageTextCache
+from render_pool import RenderPool, PRIORITY_VISIBLE, PRIORITY_PREFETCH
 import threading
+import bisect
 import re
 import os
 import tempfile
+import queue
 
 warnings.filterwarnings("ignore", category=UserWarning, module="fitz")
 
@@ -24,9 +35,15 @@ except ImportError as e:
     print("Instale com: pip install gTTS pygame")
 
 class PDFViewer:
+    VIEW_MODES = {"Single Page": "single", "Continuous": "continuous", "Two-Page": "spread"}
+    PAGE_GAP = 10
+    PREFETCH_PAGES = 1
+    MAX_HISTORY = 50
+
     def __init__(self, parent):
         self.parent = parent
         self.current_page = 0
+        self.target_page = None  # page navigation went to (continuous mode)
         self.pdf_doc = None
         self.zoom_level = 1.0
         self.image_cache = []
@@ -39,10 +56,15 @@ class PDFViewer:
         self.temp_highlight = None
         self.annotations_on_canvas = []
         self.pdf_path = None
+        self.doc_hash = None
         
         # Highlight (brush) mode
         self.highlight_brush_mode = False
         self.highlight_brush_color = "yellow"
+
+        # Text selection - word indices of one page
+        self.text_select_mode = False
+        self.selection = None
         
         # TTS attributes - gTTS
         self.is_reading = False
@@ -53,6 +75,7 @@ class PDFViewer:
         self.current_text = ""
         self.current_sentence_index = 0
         self.sentences = []
+        self.pending_texts = None
         self.temp_audio_files = []
         self.tts_language = 'pt'  # Idioma padrão: português
         self.tts_speed = 1.0  # Velocidade normal
@@ -62,6 +85,68 @@ class PDFViewer:
         self.search_results = []
         self.current_search_index = -1
         self.search_highlights = []
+        self.search_hits_by_page = {}
+        self.search_query = ""
+        self.search_worker = None
+        self.search_queue = None
+        self.search_poll_job = None
+        self.text_cache = None
+
+        # Render scheduling - what is on screen now
+        self.rendered_key = None
+        self.rendered_size = (0, 0)
+        self.page_slots = {}
+
+        # Reader mode - reflowed text instead of rendered pages
+        self.reader_mode = False
+        self.reader_frame = None
+        self.reader_font_size = 12
+
+        # Marks drawn as their own canvas layer, kept across zoom changes
+        self.marks_layer = None
+        self.page_pixels = {}
+        self.highlight_patches = {}
+
+        # Continuous scroll mode - only pages near the viewport are kept
+        self.view_mode = "single"
+        self.page_sizes = []
+        self.page_offsets = []
+        self.visible_pages = {}
+        self.layout_width = 0
+        self.layout_height = 0
+        self.layout_zoom = None
+        self.layout_base_x = 0
+
+        # Two-page spreads - rendered and prefetched as one unit
+        self.spread_tasks = []
+        self.spread_pending = None
+
+        # Thumbnails only render while the main render is idle
+        self.render_idle = threading.Event()
+        self.render_idle.set()
+        self.thumbnail_sidebar = None
+        self.thumbnails_visible = False
+
+        # Outline and page labels, cached per document
+        self.navigation = None
+        self.outline_panel = None
+        self.outline_visible = False
+
+        # Internal links and the pages they jumped from
+        self.link_map = None
+        self.page_history = []
+
+        # Compressed renders on disk - lets a reopened book paint at once
+        self.render_cache = RenderCache.from_config()
+        self.position_job = None
+        self.hash_queue = None
+        self.hash_poll_job = None
+
+        # Page renders run on a process pool; neighbours are prefetched
+        self.render_pool = None
+        self.prefetched = {}
+        self.prefetch_tasks = {}
+        self.page_tasks = {}
 
         self.setup_ui()
 
@@ -92,9 +177,27 @@ class PDFViewer:
         self.btn_next = ttk.Button(btn_frame, text="Next ►", command=self.next_page, state='disabled')
         self.btn_next.pack(side='left', padx=5)
 
+        self.btn_thumbnails = ttk.Button(btn_frame, text="📑 Pages", command=self.toggle_thumbnails)
+        self.btn_thumbnails.pack(side='left', padx=5)
+
+        self.btn_outline = ttk.Button(btn_frame, text="☰ Outline", command=self.toggle_outline)
+        self.btn_outline.pack(side='left', padx=5)
+
+        self.btn_back = ttk.Button(btn_frame, text="⟲ Back", command=self.go_back, state='disabled')
+        self.btn_back.pack(side='left', padx=5)
+
+        self.btn_reader = ttk.Button(btn_frame, text="📖 Reader", command=self.toggle_reader_mode)
+        self.btn_reader.pack(side='left', padx=5)
+
         self.lbl_page = ttk.Label(control_frame, text="Page: 0/0")
         self.lbl_page.pack(side='left', padx=20)
 
+        ttk.Label(control_frame, text="Go to:").pack(side='left')
+        self.goto_var = tk.StringVar()
+        goto_entry = ttk.Entry(control_frame, textvariable=self.goto_var, width=8)
+        goto_entry.pack(side='left', padx=5)
+        goto_entry.bind('<Return>', lambda e: self.go_to_label())
+
         # Zoom controls
         zoom_frame = ttk.Frame(control_frame)
         zoom_frame.pack(side='right')
@@ -111,6 +214,24 @@ class PDFViewer:
         )
         zoom_menu.pack(side='left')
 
+        ttk.Label(zoom_frame, text="View:").pack(side='left', padx=5)
+
+        self.view_mode_var = tk.StringVar(value="Single Page")
+        view_menu = ttk.OptionMenu(
+            zoom_frame,
+            self.view_mode_var,
+            "Single Page",
+            *self.VIEW_MODES.keys(),
+            command=self.change_view_mode
+        )
+        view_menu.pack(side='left')
+
+        self.spread_cover_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            zoom_frame, text="Cover alone", variable=self.spread_cover_var,
+            command=self.on_spread_cover_changed
+        ).pack(side='left', padx=5)
+
         # Annotation controls
         annot_frame = ttk.Frame(control_frame)
         annot_frame.pack(side='right', padx=20)
@@ -129,6 +250,13 @@ class PDFViewer:
         )
         self.btn_annotate.pack(side='left', padx=5)
 
+        self.btn_select_text = ttk.Button(
+            annot_frame,
+            text="Select Text",
+            command=self.toggle_text_select_mode
+        )
+        self.btn_select_text.pack(side='left', padx=5)
+
         color_frame = ttk.Frame(annot_frame)
         color_frame.pack(side='left', padx=5)
 
@@ -154,6 +282,13 @@ class PDFViewer:
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
         search_entry.pack(side='left', padx=5)
 
+        self.search_var.trace_add('write', self.on_search_query_changed)
+
+        self.search_case_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Aa", variable=self.search_case_var).pack(side='left')
+        self.search_regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Regex", variable=self.search_regex_var).pack(side='left')
+
         ttk.Button(search_frame, text="Find", command=self.search_text).pack(side='left', padx=5)
         ttk.Button(search_frame, text="Clear", command=self.clear_search).pack(side='left', padx=5)
 
@@ -170,6 +305,7 @@ class PDFViewer:
 
         # PDF Display
         self.setup_pdf_display()
+        self.setup_search_panel()
 
     def setup_tts_controls(self):
         """Setup TTS control panel with gTTS"""
@@ -268,17 +404,18 @@ class PDFViewer:
         """Setup PDF display area with canvas and scrollbars"""
         container = ttk.Frame(self.main_frame)
         container.pack(expand=True, fill='both')
+        self.display_container = container
 
         self.canvas = tk.Canvas(container, bg='white')
         self.canvas.pack(side='left', expand=True, fill='both')
 
-        v_scroll = ttk.Scrollbar(container, orient='vertical', command=self.canvas.yview)
-        v_scroll.pack(side='right', fill='y')
+        self.v_scroll = ttk.Scrollbar(container, orient='vertical', command=self.canvas.yview)
+        self.v_scroll.pack(side='right', fill='y')
 
         h_scroll = ttk.Scrollbar(container, orient='horizontal', command=self.canvas.xview)
         h_scroll.pack(side='bottom', fill='x')
 
-        self.canvas.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
+        self.canvas.configure(yscrollcommand=self.on_canvas_scrolled, xscrollcommand=h_scroll.set)
 
         self.pdf_frame = ttk.Frame(self.canvas)
         self.canvas_frame = self.canvas.create_window(
@@ -291,11 +428,20 @@ class PDFViewer:
         self.pdf_label = ttk.Label(self.pdf_frame)
         self.pdf_label.pack()
 
+        self.render_scheduler = RenderScheduler(self.canvas, self.on_scheduled_render)
+        self.render_pool = RenderPool(self.canvas)
+
         # Bind events
         self.canvas.bind("<Configure>", self.on_canvas_configure)
         self.canvas.bind("<Button-1>", self.start_annotation)
         self.canvas.bind("<B1-Motion>", self.draw_annotation)
         self.canvas.bind("<ButtonRelease-1>", self.end_annotation)
+        self.canvas.bind("<Control-c>", self.copy_selection)
+        self.canvas.bind("<Alt-Left>", lambda e: self.go_back())
+        self.canvas.bind("<Motion>", self.on_canvas_motion)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
 
     # ============= TTS METHODS - gTTS =============
     
@@ -324,15 +470,7 @@ class PDFViewer:
         if page_number is None:
             page_number = self.current_page
         
-        try:
-            page = self.pdf_doc[page_number]
-            text = page.get_text()
-            text = text.strip()
-            text = re.sub(r'\s+', ' ', text)
-            return text
-        except Exception as e:
-            print(f"Error extracting text: {e}")
-            return ""
+        return self.text_cache.text(page_number, doc=self.pdf_doc)
 
     def read_current_page(self):
         """Read the current page"""
@@ -365,21 +503,49 @@ class PDFViewer:
         if start_page is None:
             start_page = self.current_page
         
-        all_text = []
-        for page_num in range(start_page, len(self.pdf_doc)):
-            text = self.extract_page_text(page_num)
+        # Pages are pulled from the text cache while speaking
+        text_cache = self.text_cache
+        page_count = len(self.pdf_doc)
+
+        def page_texts():
+            for page_num in range(start_page, page_count):
+                text = text_cache.text(page_num)
+                if text:
+                    yield f"Página {page_num + 1}. {text}"
+
+        self.start_reading(page_texts())
+
+    def split_sentences(self, text):
+        """Split text into the sentences spoken one by one"""
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 2]
+
+    def next_sentences(self):
+        """Pull the next chunk of a lazy text source into self.sentences
+
+        current_text grows with each chunk, so it always holds the text
+        queued so far - the same joined text a string source would give.
+        """
+        while self.pending_texts is not None:
+            try:
+                text = next(self.pending_texts)
+            except StopIteration:
+                self.pending_texts = None
+                return False
+            except Exception as e:
+                print(f"Error extracting text: {e}")
+                self.pending_texts = None
+                return False
             if text:
-                all_text.append(f"Página {page_num + 1}. {text}")
-        
-        if not all_text:
-            messagebox.showwarning("Warning", "No text found!")
-            return
-        
-        combined_text = " ".join(all_text)
-        self.start_reading(combined_text)
+                self.current_text = f"{self.current_text} {text}" if self.current_text else text
+            sentences = self.split_sentences(text)
+            if sentences:
+                self.sentences.extend(sentences)
+                return True
+        return False
 
     def start_reading(self, text):
-        """Start reading text with gTTS"""
+        """Start reading text with gTTS (a string or an iterator of strings)"""
         print("\n" + "="*60)
         print("=== START READING (gTTS) ===")
         
@@ -393,11 +559,16 @@ class PDFViewer:
         # Clean up any remaining temp files
         self.cleanup_temp_files()
         
-        self.current_text = text
-        
         # Split into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        self.sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 2]
+        if isinstance(text, str):
+            self.current_text = text
+            self.sentences = self.split_sentences(text)
+            self.pending_texts = None
+        else:
+            self.current_text = ""
+            self.sentences = []
+            self.pending_texts = iter(text)
+            self.next_sentences()
         
         if not self.sentences:
             messagebox.showwarning("Warning", "No valid text to read!")
@@ -434,7 +605,12 @@ class PDFViewer:
             
             print(f"Thread settings - Language: {language}, Speed: {speed}, Slow: {use_slow}")
             
-            for idx in range(len(self.sentences)):
+            idx = -1
+            while True:
+                idx += 1
+                if idx >= len(self.sentences) and not self.next_sentences():
+                    break
+
                 # Check stop
                 if self.stop_event.is_set():
                     print(f"Stop detected at sentence {idx}")
@@ -615,126 +791,1087 @@ class PDFViewer:
         )
         if filepath:
             try:
-                if self.pdf_doc:
-                    self.pdf_doc.close()
-                    self.image_cache.clear()
-                self.pdf_doc = fitz.open(filepath)
-                self.pdf_path = filepath
-                self.current_page = 0
-                self.file_id = 1
-                self.render_page()
-                self.update_controls()
+                self.load_document(filepath, file_id=1)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open PDF:\n{str(e)}")
 
+    def load_document(self, filepath, file_id=None, page=None):
+        """Open a PDF and show it (used by the dialog and the library).
+
+        Without an explicit page the document resumes where it was left.
+        A file opened for the first time (or changed since) is hashed on a
+        background thread first, so reading a big file never blocks the
+        window; the document opens when the hash arrives.
+        """
+        self.save_position()
+        self.cancel_hashing()
+        doc_hash = known_hash(filepath)
+        if doc_hash is not None:
+            self.open_document(filepath, doc_hash, file_id, page)
+            return
+
+        results = queue.Queue()
+        self.hash_queue = results
+
+        def hash_file():
+            try:
+                results.put(('done', content_hash(filepath)))
+            except Exception as e:
+                results.put(('error', str(e)))
+
+        threading.Thread(target=hash_file, daemon=True).start()
+        self.canvas.config(cursor="watch")
+        self.hash_poll_job = self.canvas.after(
+            50, self.poll_document_hash, results, filepath, file_id, page)
+
+    def close(self):
+        """Release the open document and its text cache (the application is closing)"""
+        self.cancel_hashing()
+        if self.text_cache:
+            self.text_cache.close()
+            self.text_cache = None
+        with MUPDF_LOCK:
+            if self.pdf_doc:
+                self.pdf_doc.close()
+                self.pdf_doc = None
+
+    def cancel_hashing(self):
+        """Forget a document still being hashed (another one was opened)"""
+        if self.hash_poll_job:
+            self.canvas.after_cancel(self.hash_poll_job)
+            self.hash_poll_job = None
+            self.canvas.config(cursor="")
+        self.hash_queue = None
+
+    def poll_document_hash(self, results, filepath, file_id, page):
+        """Open the document once its background hash is ready"""
+        self.hash_poll_job = None
+        if results is not self.hash_queue:
+            return
+        try:
+            kind, value = results.get_nowait()
+        except queue.Empty:
+            self.hash_poll_job = self.canvas.after(
+                50, self.poll_document_hash, results, filepath, file_id, page)
+            return
+        self.hash_queue = None
+        self.canvas.config(cursor="")
+        try:
+            if kind == 'error':
+                raise OSError(value)
+            self.open_document(filepath, value, file_id, page)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open PDF:\n{str(e)}")
+
+    def open_document(self, filepath, doc_hash, file_id=None, page=None):
+        """Show a PDF whose content hash is known"""
+        if page is None:
+            resume = DatabaseManager.get_reading_position(doc_hash)
+            page = resume['chapter'] if resume else 0
+            if resume and resume['zoom']:
+                self.set_zoom(resume['zoom'])
+
+        # Paint the cached render before MuPDF parses the file
+        if self.view_mode == "single":
+            self.paint_cached_page(doc_hash, file_id, page)
+
+        with MUPDF_LOCK:
+            doc = fitz.open(filepath)
+            if self.pdf_doc:
+                self.pdf_doc.close()
+        self.clear_continuous_pages()
+        self.reset_prefetch()
+        self.marks_layer = None
+        self.pdf_doc = doc
+        self.pdf_path = filepath
+        self.doc_hash = doc_hash
+        self.file_id = file_id
+        if self.text_cache:
+            self.text_cache.close()
+        self.text_cache = PageTextCache(filepath, doc_hash)
+        self.navigation = NavigationIndex.load(doc, doc_hash)
+        self.link_map = LinkMap(doc)
+        self.page_history = []
+        self.reset_search()
+        self.selection = None
+        self.current_page = min(max(page, 0), len(doc) - 1)
+        self.target_page = self.current_page
+        self.page_sizes = []
+        self.page_offsets = []
+        self.rendered_key = None
+        if self.view_mode == "continuous":
+            self.layout_continuous()
+            self.scroll_to_page(self.current_page)
+        self.render_page()
+        self.update_controls()
+        if self.thumbnails_visible:
+            self.thumbnail_sidebar.set_document(filepath, self.doc_hash, len(doc))
+            self.thumbnail_sidebar.set_current_page(self.current_page)
+        if self.outline_visible:
+            self.outline_panel.set_outline(self.navigation.toc)
+
+    def paint_cached_page(self, doc_hash, file_id, page_number):
+        """Show a page straight from the render cache, if it is there"""
+        marks_version = DatabaseManager.get_marks_version(file_id, page_number) if file_id else "0"
+        data = self.render_cache.get(doc_hash, page_number, self.zoom_level, marks_version)
+        if data is None:
+            return False
+        try:
+            photo = tk.PhotoImage(master=self.canvas, data=data)
+        except tk.TclError as e:
+            print(f"Invalid render cache entry: {e}")
+            return False
+
+        self.canvas.delete("page_item")
+        self.marks_layer = None
+        x, y = self.page_origin(photo.width(), photo.height())
+        self.canvas.create_image(x, y, anchor='nw', image=photo, tags=("pdf_image", "page_item"))
+        self.canvas.config(scrollregion=(0, 0, photo.width(), photo.height()))
+        self.image_cache = [photo]
+        self.canvas.update_idletasks()
+        return True
+
+    def remember_position(self):
+        """Save the page/zoom for resuming once the user settles (1 s debounce)"""
+        if not self.doc_hash:
+            return
+        if self.position_job:
+            self.canvas.after_cancel(self.position_job)
+        self.position_job = self.canvas.after(1000, self.save_position)
+
+    def save_position(self):
+        """Write a pending reading position to the database now"""
+        if not self.position_job:
+            return
+        self.canvas.after_cancel(self.position_job)
+        self.position_job = None
+        DatabaseManager.save_reading_position(self.doc_hash, self.file_id, self.current_page, 0, self.zoom_level)
+
+    def render_key(self):
+        """Everything that changes the rasterised page"""
+        page = self.spread_pages(self.current_page) if self.view_mode == "spread" else self.current_page
+        return (id(self.pdf_doc), page, self.zoom_level, self.file_id)
+
+    def request_render(self):
+        """Schedule a render for the next idle cycle (coalesces bursts)"""
+        self.render_idle.clear()
+        self.render_scheduler.request()
+
+    def on_scheduled_render(self):
+        """Run the coalesced render, or only re-centre if the page is unchanged"""
+        try:
+            if self.reader_mode:
+                self.show_reader_page()
+            elif self.view_mode == "continuous":
+                self.update_continuous_view()
+            elif self.rendered_key is not None and self.rendered_key == self.render_key():
+                self.recenter_page()
+            else:
+                self.render_page()
+        finally:
+            self.update_render_idle()
+
+    def page_origin(self, width, height):
+        """Top-left corner that centres a page of the given size"""
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        return max((canvas_width - width) // 2, 0), max((canvas_height - height) // 2, 0)
+
+    def update_render_idle(self):
+        """Let thumbnails run once no page render is still in flight on the pool"""
+        if self.spread_pending is None and not self.page_tasks:
+            self.render_idle.set()
+        else:
+            self.render_idle.clear()
+
+    def recenter_page(self):
+        """Move the page and everything drawn on it to the new centre"""
+        if not hasattr(self, 'image_origin'):
+            return
+        old_x, old_y = self.image_origin
+        x, y = self.page_origin(*self.rendered_size)
+        if (x, y) != (old_x, old_y):
+            dx, dy = x - old_x, y - old_y
+            self.canvas.move("page_item", dx, dy)
+            self.image_origin = (x, y)
+            self.page_slots = {n: (sx + dx, sy + dy, w, h) for n, (sx, sy, w, h) in self.page_slots.items()}
+
+    def rasterize_page(self, page_number, store=False, pix=None):
+        """Render one page with its highlights.
+
+        Returns (photo, width, height, highlights that still need drawing).
+        ``pix`` is a render made by the pool; otherwise a prefetched one is
+        used or the page is rendered here. With ``store`` the render is also
+        written to the disk cache.
+        """
+        if pix is None:
+            pix = self.prefetched.pop((page_number, self.zoom_level), None)
+        if pix is None:
+            with MUPDF_LOCK:
+                page = self.pdf_doc.load_page(page_number)
+                pix = render_pixmap(page, self.zoom_level)
+                self.link_map.store(page_number, page)
+        self.page_pixels[page_number] = pix
+        self.highlight_patches.pop(page_number, None)
+
+        # Blend highlights straight into the pixmap buffer
+        highlight_rects = self.page_highlight_rects(page_number)
+        if blend_highlights(pix, highlight_rects):
+            highlight_rects = []
+            if store:
+                marks_version = DatabaseManager.get_marks_version(self.file_id, page_number) if self.file_id else "0"
+                self.render_cache.put(self.doc_hash, page_number, self.zoom_level, marks_version, pix)
+
+        photo = pixmap_to_photo(pix, master=self.canvas)
+        return photo, pix.width, pix.height, highlight_rects
+
+    def page_highlight_rects(self, page_number):
+        """Saved highlights of a page in pixels at the current zoom"""
+        highlight_rects = []
+        if self.file_id:
+            db_highlights = DatabaseManager.get_highlights(self.file_id, page_number)
+            for texto_destacado, cor, bbox, _ in db_highlights:
+                if bbox:
+                    x1, y1, x2, y2 = map(float, bbox.split(","))
+                    x1, y1 = x1 * self.zoom_level, y1 * self.zoom_level
+                    x2, y2 = x2 * self.zoom_level, y2 * self.zoom_level
+                    highlight_rects.append((x1, y1, x2, y2, cor))
+        return highlight_rects
+
+    def draw_page_marks(self, page_number, x, y, highlight_rects, tags=()):
+        """Draw search hits, the selection and the mark layer of a page at origin x, y"""
+        self.draw_search_hits(page_number, x, y, tags)
+        if self.selection and self.selection['page'] == page_number:
+            self.draw_selection_rects(x, y, tags)
+        self.draw_mark_layer(page_number, x, y, highlight_rects, tags)
+
+    def draw_mark_layer(self, page_number, x, y, highlight_rects, tags=()):
+        """Create the annotation layer of a page (canvas tag "marks").
+
+        The layer is built once per page; new marks are added to it and zoom
+        changes scale it instead of reading the database again.
+        """
+        # Without NumPy the highlights become stippled canvas items
+        for x1, y1, x2, y2, cor in highlight_rects:
+            self.draw_highlight_item(x, y, (x1, y1, x2, y2), cor, tags)
+
+        if not self.file_id:
+            return
+
+        db_annotations = DatabaseManager.get_annotations(self.file_id, page_number)
+        for annot in db_annotations:
+            x1, y1, x2, y2, text, color = annot
+            rect = tuple(v * self.zoom_level for v in (x1, y1, x2, y2))
+            self.draw_annotation_item(x, y, rect, text, color, tags)
+
+    def draw_highlight_item(self, x, y, rect, color, tags=()):
+        x1, y1, x2, y2 = rect
+        self.canvas.create_rectangle(
+            x + x1, y + y1,
+            x + x2, y + y2,
+            fill=color,
+            stipple="gray25",
+            width=0,
+            tags=("highlight", "marks", "page_item") + tags
+        )
+
+    def draw_annotation_item(self, x, y, rect, text, color, tags=()):
+        x1, y1, x2, y2 = rect
+        item = self.canvas.create_rectangle(
+            x + x1, y + y1,
+            x + x2, y + y2,
+            outline=color,
+            width=2,
+            tags=("annotation", "marks", "page_item") + tags
+        )
+        self.annotations_on_canvas.append(item)
+        if text:
+            # Anchored on the rectangle's corner so the layer scales cleanly
+            item = self.canvas.create_text(
+                x + x1, y + y1 - 2,
+                text=text,
+                fill=color,
+                anchor='sw',
+                tags=("annotation", "marks", "page_item") + tags
+            )
+            self.annotations_on_canvas.append(item)
+
+    def page_tags(self, page_number):
+        """Extra canvas tags for items drawn on a page"""
+        return (f"page_{page_number}",) if self.view_mode == "continuous" else ()
+
+    def add_highlight_marks(self, page_number, rects, color):
+        """Show new highlights without re-rasterising the page.
+
+        The highlight is blended into the kept page pixels and only the
+        touched rectangles are put on the canvas as small image patches.
+        """
+        slot = self.page_slots.get(page_number)
+        if slot is None:
+            return
+        x, y = slot[:2]
+        zoom = self.zoom_level
+        zoomed = [(x1 * zoom, y1 * zoom, x2 * zoom, y2 * zoom, color) for x1, y1, x2, y2 in rects]
+        tags = self.page_tags(page_number)
+
+        pix = self.page_pixels.get(page_number)
+        if pix is not None and not isinstance(pix, PixelBuffer):
+            # Private copy - the original may still be queued for the render cache
+            pix = self.page_pixels[page_number] = PixelBuffer(pix.width, pix.height, pix.samples_mv)
+        if pix is None or not blend_highlights(pix, zoomed):
+            for x1, y1, x2, y2, cor in zoomed:
+                self.draw_highlight_item(x, y, (x1, y1, x2, y2), cor, tags)
+            return
+
+        patches = self.highlight_patches.setdefault(page_number, [])
+        for x1, y1, x2, y2, _ in zoomed:
+            patch = crop_pixels(pix, x1, y1, x2, y2)
+            if patch is None:
+                continue
+            photo = pixmap_to_photo(patch, master=self.canvas)
+            self.canvas.create_image(
+                x + max(int(x1), 0), y + max(int(y1), 0), anchor='nw', image=photo,
+                tags=("highlight_patch", "page_item") + tags
+            )
+            patches.append(photo)
+        self.canvas.tag_raise("marks")
+        self.canvas.tag_raise("search_highlight")
+        self.canvas.tag_raise("text_selection")
+
+    def add_annotation_mark(self, page_number, rect, text, color):
+        """Add one new annotation to the page's mark layer"""
+        slot = self.page_slots.get(page_number)
+        if slot is None:
+            return
+        zoomed = tuple(v * self.zoom_level for v in rect)
+        self.draw_annotation_item(slot[0], slot[1], zoomed, text, color, self.page_tags(page_number))
+
     def render_page(self):
         """Render the current PDF page"""
-        self.canvas.delete("annotation")
+        self.render_scheduler.cancel()
+        self.render_idle.clear()
+        try:
+            self._render_page()
+        finally:
+            self.update_render_idle()
+
+    def _render_page(self):
+        if self.reader_mode:
+            self.show_reader_page()
+            return
+
+        if self.view_mode == "continuous":
+            # Marks or zoom changed - redraw the pages around the viewport
+            self.clear_continuous_pages()
+            self.update_continuous_view()
+            return
+
+        if self.view_mode == "spread":
+            self.render_spread()
+            return
+
+        # Same page of the same document - keep its mark layer and scale it
+        layer_key = (id(self.pdf_doc), self.file_id, self.current_page)
+        keep_marks = self.marks_layer is not None and self.marks_layer[0] == layer_key
+
         self.canvas.delete("search_highlight")
-        self.annotations_on_canvas = []
+        self.canvas.delete("text_selection")
+        self.canvas.delete("highlight_patch")
+        if not keep_marks:
+            self.canvas.delete("marks")
+            self.annotations_on_canvas = []
 
         if not self.pdf_doc or not 0 <= self.current_page < len(self.pdf_doc):
+            self.marks_layer = None
             return
 
         try:
-            page = self.pdf_doc.load_page(self.current_page)
-            zoom_matrix = fitz.Matrix(self.zoom_level, self.zoom_level)
-            pix = page.get_pixmap(matrix=zoom_matrix)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-            # Add highlights overlay
-            overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-
-            if self.file_id:
-                db_highlights = DatabaseManager.get_highlights(self.file_id, self.current_page)
-                for texto_destacado, cor, bbox, _ in db_highlights:
-                    if bbox:
-                        x1, y1, x2, y2 = map(float, bbox.split(","))
-                        x1, y1 = x1 * self.zoom_level, y1 * self.zoom_level
-                        x2, y2 = x2 * self.zoom_level, y2 * self.zoom_level
-                        color_rgba = (255, 255, 0, 80) if cor == "yellow" else (255, 0, 0, 80)
-                        overlay_draw.rectangle([x1, y1, x2, y2], fill=color_rgba)
-
-            img = img.convert("RGBA")
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert("RGB")
-
-            photo = ImageTk.PhotoImage(image=img)
+            old_origin = getattr(self, 'image_origin', (0, 0))
+            self.page_pixels = {}
+            photo, width, height, highlight_rects = self.rasterize_page(self.current_page, store=True)
             self.image_cache = [photo]
 
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            x = max((canvas_width - pix.width) // 2, 0)
-            y = max((canvas_height - pix.height) // 2, 0)
+            x, y = self.page_origin(width, height)
 
             self.canvas.delete("pdf_image")
-            self.canvas_image = self.canvas.create_image(x, y, anchor='nw', image=photo, tags="pdf_image")
+            self.canvas_image = self.canvas.create_image(
+                x, y, anchor='nw', image=photo, tags=("pdf_image", "page_item")
+            )
             self.image_origin = (x, y)
-            self.canvas.config(scrollregion=(0, 0, pix.width, pix.height))
+            self.rendered_size = (width, height)
+            self.rendered_key = self.render_key()
+            self.page_slots = {self.current_page: (x, y, width, height)}
+            self.canvas.config(scrollregion=(0, 0, width, height))
+
+            if keep_marks:
+                old_x, old_y = old_origin
+                factor = self.zoom_level / self.marks_layer[1]
+                if factor != 1:
+                    self.canvas.scale("marks", old_x, old_y, factor, factor)
+                self.canvas.move("marks", x - old_x, y - old_y)
+                self.canvas.tag_raise("marks")
+                self.draw_search_hits(self.current_page, x, y)
+                if self.selection and self.selection['page'] == self.current_page:
+                    self.draw_selection_rects(x, y)
+            else:
+                self.draw_page_marks(self.current_page, x, y, highlight_rects)
+            self.marks_layer = (layer_key, self.zoom_level)
+            self.prefetch_neighbours()
 
-            # Render annotations
-            if self.file_id:
-                db_annotations = DatabaseManager.get_annotations(self.file_id, self.current_page)
-                for annot in db_annotations:
-                    x1, y1, x2, y2, text, color = annot
-                    x1, y1 = x1 * self.zoom_level, y1 * self.zoom_level
-                    x2, y2 = x2 * self.zoom_level, y2 * self.zoom_level
-                    rect = self.canvas.create_rectangle(
-                        x + x1, y + y1,
-                        x + x2, y + y2,
-                        outline=color,
-                        width=2,
-                        tags="annotation"
-                    )
-                    self.annotations_on_canvas.append(rect)
-                    if text:
-                        text_item = self.canvas.create_text(
-                            x + x1, y + y1 - 15,
-                            text=text,
-                            fill=color,
-                            anchor='nw',
-                            tags="annotation"
-                        )
-                        self.annotations_on_canvas.append(text_item)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to render page:\n{str(e)}")
+
+    # ============= RENDER POOL =============
+
+    def prefetch_neighbours(self):
+        """Render the pages (or spreads) around the current one on the pool"""
+        if not self.pdf_doc:
+            return
+        if self.view_mode == "spread":
+            spread = self.spread_pages(self.current_page)
+            units = []
+            if spread[0] > 0:
+                units.append(self.spread_pages(spread[0] - 1))
+            if spread[-1] < len(self.pdf_doc) - 1:
+                units.append(self.spread_pages(spread[-1] + 1))
+        else:
+            units = [
+                number
+                for number in range(self.current_page - self.PREFETCH_PAGES, self.current_page + self.PREFETCH_PAGES + 1)
+                if number != self.current_page and 0 <= number < len(self.pdf_doc)
+            ]
+        wanted = {(unit, self.zoom_level) for unit in units}
+        for key in list(self.prefetched):
+            if key not in wanted:
+                del self.prefetched[key]
+        for key in list(self.prefetch_tasks):
+            if key not in wanted:
+                for task_id in self.prefetch_tasks.pop(key):
+                    self.render_pool.cancel(task_id)
+
+        doc = self.pdf_doc
+        for unit in units:
+            key = (unit, self.zoom_level)
+            if key in self.prefetched or key in self.prefetch_tasks:
+                continue
+            pages = unit if isinstance(unit, tuple) else (unit,)
+            task_ids = self.render_pages_async(
+                pages, key[1], PRIORITY_PREFETCH,
+                lambda parts, key=key: self.on_unit_prefetched(doc, key, parts)
+            )
+            if task_ids is None:
+                return
+            self.prefetch_tasks[key] = task_ids
+
+    def on_unit_prefetched(self, doc, key, parts):
+        self.prefetch_tasks.pop(key, None)
+        if doc is self.pdf_doc:
+            # A spread is kept as its pair of pages, a single page as its pixmap
+            self.prefetched[key] = parts if isinstance(key[0], tuple) else parts[0]
 
+    def render_pages_async(self, pages, zoom, priority, on_done):
+        """Render pages concurrently on the pool; ``on_done(pixmaps)`` once all arrived.
+
+        Returns the task ids, or None when the pool is not available.
+        """
+        doc = self.pdf_doc
+        parts = {}
+
+        def arrived(page_number, result):
+            if doc is not self.pdf_doc:
+                return
+            if result is None:
+                # Failed in the worker - render it here
+                with MUPDF_LOCK:
+                    result = render_pixmap(doc.load_page(page_number), zoom)
+            parts[page_number] = result
+            if len(parts) == len(pages):
+                on_done([parts[n] for n in pages])
+
+        task_ids = []
+        for page_number in pages:
+            task_id = self.render_pool.submit(
+                self.pdf_path, page_number, zoom,
+                lambda result, n=page_number: arrived(n, result),
+                priority=priority
+            )
+            if task_id is None:
+                for earlier in task_ids:
+                    self.render_pool.cancel(earlier)
+                return None
+            task_ids.append(task_id)
+        return task_ids
+
+    def reset_prefetch(self):
+        """Forget pool renders made for the previous document"""
+        task_ids = list(self.page_tasks.values()) + self.spread_tasks
+        for ids in self.prefetch_tasks.values():
+            task_ids.extend(ids)
+        for task_id in task_ids:
+            self.render_pool.cancel(task_id)
+        self.prefetch_tasks = {}
+        self.page_tasks = {}
+        self.spread_tasks = []
+        self.spread_pending = None
+        self.prefetched = {}
+        self.update_render_idle()
+
+    # ============= TWO-PAGE SPREADS =============
+
+    def spread_pages(self, page_number):
+        """Pages shown together with a page, e.g. (3, 4) - or (0,) for a lone cover"""
+        if not self.pdf_doc:
+            return (page_number,)
+        if self.spread_cover_var.get():
+            if page_number == 0:
+                return (0,)
+            first = page_number if page_number % 2 == 1 else page_number - 1
+        else:
+            first = page_number - page_number % 2
+        return tuple(n for n in (first, first + 1) if n < len(self.pdf_doc))
+
+    def spread_layout(self, spread):
+        """[(page, x, width, height)] of a spread at the current zoom, plus its size"""
+        matrix = fitz.Matrix(self.zoom_level, self.zoom_level)
+        layout = []
+        x = 0
+        height = 0
+        for page_number in spread:
+            with MUPDF_LOCK:
+                rect = (self.pdf_doc.load_page(page_number).rect * matrix).irect
+            layout.append((page_number, x, rect.width, rect.height))
+            x += rect.width
+            height = max(height, rect.height)
+        return layout, x, height
+
+    def spread_id(self, spread):
+        return "-".join(str(n) for n in spread)
+
+    def spread_marks_version(self, spread):
+        if not self.file_id:
+            return "0"
+        return "_".join(DatabaseManager.get_marks_version(self.file_id, n) for n in spread)
+
+    def render_spread(self):
+        """Show the current spread: prefetched, from the disk cache, or rendered on the pool"""
+        if not self.pdf_doc:
+            return
+        spread = self.spread_pages(self.current_page)
+        zoom = self.zoom_level
+        key = (spread, zoom)
+        if self.spread_pending == (id(self.pdf_doc), key):
+            return
+        for task_id in self.spread_tasks:
+            self.render_pool.cancel(task_id)
+        self.spread_tasks = []
+        self.spread_pending = None
+
+        parts = self.prefetched.pop(key, None)
+        if parts is None:
+            # One lookup for the whole spread
+            data = self.render_cache.get(self.doc_hash, self.spread_id(spread), zoom, self.spread_marks_version(spread))
+            if data is not None:
+                self.show_spread(spread, png=data)
+                return
+
+            doc = self.pdf_doc
+            task_ids = self.render_pages_async(
+                spread, zoom, PRIORITY_VISIBLE,
+                lambda result: self.on_spread_rendered(doc, key, result)
+            )
+            if task_ids is not None:
+                self.spread_tasks = task_ids
+                self.spread_pending = (id(doc), key)
+                return
+            with MUPDF_LOCK:
+                parts = [render_pixmap(self.pdf_doc.load_page(n), zoom) for n in spread]
+
+        self.show_spread(spread, parts=parts)
+
+    def on_spread_rendered(self, doc, key, parts):
+        """Pool callback - show the spread if it is still the one wanted"""
+        self.spread_tasks = []
+        self.spread_pending = None
+        self.update_render_idle()
+        if doc is not self.pdf_doc or self.view_mode != "spread" or self.reader_mode:
+            return
+        if key != (self.spread_pages(self.current_page), self.zoom_level):
+            return
+        self.show_spread(key[0], parts=parts)
+
+    def show_spread(self, spread, parts=None, png=None):
+        """Composite the pages of a spread into one image and draw their marks"""
+        layout, width, height = self.spread_layout(spread)
+        unblended = {n: [] for n in spread}
+        self.page_pixels = {}
+        self.highlight_patches = {}
+
+        try:
+            if parts is not None:
+                all_blended = True
+                for (page_number, _, _, _), pix in zip(layout, parts):
+                    rects = self.page_highlight_rects(page_number)
+                    if not blend_highlights(pix, rects):
+                        unblended[page_number] = rects
+                        all_blended = False
+                    self.page_pixels[page_number] = pix
+                composed = compose_pixels([(pix, x) for (_, x, _, _), pix in zip(layout, parts)], width, height)
+                if all_blended:
+                    self.render_cache.put(
+                        self.doc_hash, self.spread_id(spread), self.zoom_level,
+                        self.spread_marks_version(spread), composed
+                    )
+                photo = pixmap_to_photo(composed, master=self.canvas)
+            else:
+                photo = tk.PhotoImage(master=self.canvas, data=png)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to render page:\n{str(e)}")
+            return
+
+        self.canvas.delete("page_item")
+        self.marks_layer = None
+        self.annotations_on_canvas = []
+        self.image_cache = [photo]
+
+        x, y = self.page_origin(width, height)
+        self.canvas_image = self.canvas.create_image(x, y, anchor='nw', image=photo, tags=("pdf_image", "page_item"))
+        self.page_slots = {n: (x + px, y, w, h) for n, px, w, h in layout}
+        self.image_origin = self.page_slots.get(self.current_page, (x, y))[:2]
+        self.rendered_size = (width, height)
+        self.rendered_key = self.render_key()
+        self.canvas.config(scrollregion=(0, 0, width, height))
+
+        for page_number, (sx, sy, _, _) in self.page_slots.items():
+            self.draw_page_marks(page_number, sx, sy, unblended[page_number])
+        self.prefetch_neighbours()
+
+    def on_spread_cover_changed(self):
+        if self.view_mode == "spread" and self.pdf_doc:
+            self.rendered_key = None
+            self.render_page()
+            self.update_controls()
+
+    # ============= THUMBNAILS =============
+
+    def toggle_thumbnails(self):
+        """Show or hide the page-thumbnail strip"""
+        if self.thumbnail_sidebar is None:
+            self.thumbnail_sidebar = ThumbnailSidebar(
+                self.display_container, self.go_to_page, self.render_idle, pool=self.render_pool
+            )
+
+        self.thumbnails_visible = not self.thumbnails_visible
+        if self.thumbnails_visible:
+            self.thumbnail_sidebar.frame.pack(side='left', fill='y', before=self.canvas)
+            if self.pdf_doc:
+                self.thumbnail_sidebar.set_document(self.pdf_path, self.doc_hash, len(self.pdf_doc))
+                self.thumbnail_sidebar.set_current_page(self.current_page)
+        else:
+            self.thumbnail_sidebar.cancel()
+            self.thumbnail_sidebar.frame.pack_forget()
+
+    # ============= OUTLINE / GO TO =============
+
+    def toggle_outline(self):
+        """Show or hide the document outline"""
+        if self.outline_panel is None:
+            self.outline_panel = OutlinePanel(self.display_container, self.jump_to_page)
+
+        self.outline_visible = not self.outline_visible
+        if self.outline_visible:
+            self.outline_panel.frame.pack(side='left', fill='y', before=self.canvas)
+            if self.navigation:
+                self.outline_panel.set_outline(self.navigation.toc)
+        else:
+            self.outline_panel.frame.pack_forget()
+
+    def go_to_label(self):
+        """Jump to the page label or page number typed in the Go to box"""
+        if not self.pdf_doc:
+            return
+        page_number = self.navigation.resolve(self.goto_var.get(), len(self.pdf_doc))
+        if page_number is None:
+            messagebox.showinfo("Go to", f"No page '{self.goto_var.get()}' in this document.")
+            return
+        self.jump_to_page(page_number)
+
+    # ============= LINKS / HISTORY =============
+
+    def link_at(self, event):
+        """Target page of the internal link under the mouse, or None"""
+        if not self.link_map:
+            return None
+        point = self.page_point(event)
+        if point is None:
+            return None
+        page_number, x, y = point
+        if page_number not in self.page_slots:
+            return None
+        try:
+            return self.link_map.hit(page_number, x, y)
+        except Exception as e:
+            print(f"Error reading links: {e}")
+            return None
+
+    def on_canvas_motion(self, event):
+        """Hand cursor over links (only when no editing mode is active)"""
+        if self.annotation_mode or self.highlight_brush_mode or self.text_select_mode:
+            return
+        cursor = "hand2" if self.link_at(event) is not None else ""
+        if self.canvas.cget("cursor") != cursor:
+            self.canvas.config(cursor=cursor)
+
+    def follow_link(self, event):
+        target = self.link_at(event)
+        if target is not None:
+            self.jump_to_page(target)
+
+    def jump_to_page(self, page_number):
+        """Go to a page and remember where we came from for Back"""
+        if not self.pdf_doc or page_number == self.current_page:
+            self.go_to_page(page_number)
+            return
+        self.page_history.append(self.current_page)
+        del self.page_history[:-self.MAX_HISTORY]
+        self.go_to_page(page_number)
+
+    def go_back(self):
+        """Return to the page before the last link or outline jump"""
+        if self.page_history:
+            self.go_to_page(self.page_history.pop())
+
+    # ============= READER MODE =============
+
+    def setup_reader_view(self):
+        """Text view laid over the canvas, with font controls like EPUBViewer"""
+        self.reader_frame = ttk.Frame(self.display_container)
+
+        font_bar = ttk.Frame(self.reader_frame)
+        font_bar.pack(side='top', fill='x')
+        ttk.Button(font_bar, text="A-", command=self.decrease_reader_font).pack(side='right', padx=2)
+        ttk.Button(font_bar, text="A+", command=self.increase_reader_font).pack(side='right', padx=2)
+
+        self.reader_text = tk.Text(
+            self.reader_frame,
+            wrap='word',
+            font=("Arial", self.reader_font_size),
+            padx=20,
+            pady=20,
+            spacing2=3
+        )
+        scroll = ttk.Scrollbar(self.reader_frame, orient='vertical', command=self.reader_text.yview)
+        scroll.pack(side='right', fill='y')
+        self.reader_text.pack(side='left', expand=True, fill='both')
+        self.reader_text.configure(yscrollcommand=scroll.set)
+        self.update_reader_font()
+
+    def toggle_reader_mode(self):
+        """Switch between reflowed text and the rendered page, keeping the page"""
+        if self.reader_frame is None:
+            self.setup_reader_view()
+
+        self.reader_mode = not self.reader_mode
+        if self.reader_mode:
+            self.btn_reader.config(text="🖼 Page View")
+            self.reader_frame.place(in_=self.canvas, x=0, y=0, relwidth=1, relheight=1)
+            self.render_page()
+        else:
+            self.btn_reader.config(text="📖 Reader")
+            self.reader_frame.place_forget()
+            self.rendered_key = None
+            if self.pdf_doc and self.view_mode == "continuous":
+                self.scroll_to_page(self.current_page)
+            self.render_page()
+
+    def show_reader_page(self):
+        """Show the text blocks of the current page - no rasterisation"""
+        self.reader_text.config(state='normal')
+        self.reader_text.delete('1.0', 'end')
+        if self.pdf_doc and self.text_cache:
+            try:
+                blocks = self.text_cache.blocks(self.current_page, doc=self.pdf_doc)
+            except Exception as e:
+                print(f"Error reading text blocks: {e}")
+                blocks = []
+            self.reader_text.insert('end', f"Page {self.current_page + 1}\n\n", "heading")
+            if blocks:
+                self.reader_text.insert('end', "\n\n".join(blocks))
+            else:
+                self.reader_text.insert('end', "(no text on this page)", "empty")
+        self.reader_text.config(state='disabled')
+        self.reader_text.yview_moveto(0)
+
+    def increase_reader_font(self):
+        self.reader_font_size = min(self.reader_font_size + 2, 32)
+        self.update_reader_font()
+
+    def decrease_reader_font(self):
+        self.reader_font_size = max(self.reader_font_size - 2, 8)
+        self.update_reader_font()
+
+    def update_reader_font(self):
+        self.reader_text.config(font=("Arial", self.reader_font_size))
+        self.reader_text.tag_configure("heading", font=("Arial", self.reader_font_size + 4, "bold"))
+        self.reader_text.tag_configure("empty", foreground="gray")
+
+    # ============= CONTINUOUS SCROLL MODE =============
+
+    def change_view_mode(self, value):
+        """Switch between single page, continuous scroll and two-page spreads"""
+        mode = self.VIEW_MODES.get(value, "single")
+        if mode == self.view_mode:
+            return
+        self.view_mode = mode
+        self.canvas.delete("page_item")
+        self.marks_layer = None
+        self.page_pixels = {}
+        self.clear_continuous_pages()
+        self.image_cache = []
+        self.rendered_key = None
+        self.page_slots = {}
+        if self.pdf_doc and mode == "continuous":
+            self.layout_continuous()
+            self.scroll_to_page(self.current_page)
+        elif self.pdf_doc:
+            self.canvas.yview_moveto(0)
+        self.render_page()
+        self.update_controls()
+
+    def load_page_sizes(self):
+        """Precompute page sizes in points without rendering anything"""
+        sizes = []
+        with MUPDF_LOCK:
+            for number in range(len(self.pdf_doc)):
+                if hasattr(self.pdf_doc, "page_cropbox"):
+                    rect = self.pdf_doc.page_cropbox(number)
+                else:
+                    rect = self.pdf_doc.load_page(number).rect
+                sizes.append((rect.width, rect.height))
+        self.page_sizes = sizes
+
+    def layout_continuous(self):
+        """Compute the vertical position of every page at the current zoom"""
+        if not self.page_sizes:
+            self.load_page_sizes()
+
+        zoom = self.zoom_level
+        offsets = []
+        y = self.PAGE_GAP
+        for width, height in self.page_sizes:
+            offsets.append(y)
+            y += int(height * zoom) + self.PAGE_GAP
+        self.page_offsets = offsets
+        self.layout_width = max((int(w * zoom) for w, _ in self.page_sizes), default=0)
+        self.layout_height = y
+        self.layout_zoom = zoom
+        self.layout_base_x = max((self.canvas.winfo_width() - self.layout_width) // 2, 0)
+        self.canvas.config(scrollregion=(0, 0, self.layout_width + 2 * self.layout_base_x, self.layout_height))
+
+    def page_slot(self, page_number):
+        """Canvas rectangle (x, y, w, h) of a page in continuous layout"""
+        width, height = self.page_sizes[page_number]
+        width, height = int(width * self.zoom_level), int(height * self.zoom_level)
+        x = self.layout_base_x + (self.layout_width - width) // 2
+        return x, self.page_offsets[page_number], width, height
+
+    def page_at_y(self, canvas_y):
+        """Index of the page at a canvas y coordinate"""
+        return max(bisect.bisect_right(self.page_offsets, canvas_y) - 1, 0)
+
+    def scroll_to_page(self, page_number):
+        """Scroll the continuous layout so the page starts at the top"""
+        if not self.page_offsets or self.layout_height <= 0:
+            return
+        top = self.page_offsets[page_number] - self.PAGE_GAP
+        self.canvas.yview_moveto(max(top, 0) / self.layout_height)
+
+    def update_continuous_view(self):
+        """Render pages in or near the viewport and release the others"""
+        if not self.pdf_doc:
+            return
+        if not self.page_offsets or self.layout_zoom != self.zoom_level:
+            top_page = self.current_page
+            self.clear_continuous_pages()
+            self.layout_continuous()
+            self.scroll_to_page(top_page)
+
+        # Follow window resizes by shifting what is already drawn
+        base_x = max((self.canvas.winfo_width() - self.layout_width) // 2, 0)
+        if base_x != self.layout_base_x:
+            self.canvas.move("page_item", base_x - self.layout_base_x, 0)
+            self.layout_base_x = base_x
+            self.canvas.config(scrollregion=(0, 0, self.layout_width + 2 * base_x, self.layout_height))
+
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = self.page_at_y(top + self.PAGE_GAP)
+        last = self.page_at_y(bottom)
+        wanted = set(range(max(first - self.PREFETCH_PAGES, 0),
+                           min(last + self.PREFETCH_PAGES, len(self.pdf_doc) - 1) + 1))
+
+        for number in list(self.visible_pages):
+            if number not in wanted:
+                self.release_continuous_page(number)
+
+        for number in sorted(wanted, key=lambda n: abs(n - first)):
+            if number not in self.visible_pages:
+                self.show_continuous_page(number, visible=first <= number <= last)
+
+        self.page_slots = {n: self.page_slot(n) for n in self.visible_pages}
+
+        # The page navigation went to stays current while it is on screen
+        # (the last pages may never reach the top); otherwise the topmost
+        if self.target_page is not None and first <= self.target_page <= last:
+            current = self.target_page
+        else:
+            self.target_page = None
+            current = first
+        if current != self.current_page:
+            self.current_page = current
+            x, y, _, _ = self.page_slot(current)
+            self.image_origin = (x, y)
+            self.update_controls()
+
+    def show_continuous_page(self, number, visible=True):
+        """Queue one page on the render pool, with a placeholder until it arrives"""
+        x, y, width, height = self.page_slot(number)
+        tag = f"page_{number}"
+        doc, zoom = self.pdf_doc, self.zoom_level
+        task_id = self.render_pool.submit(
+            self.pdf_path, number, zoom,
+            lambda result: self.on_continuous_page_rendered(doc, number, zoom, result),
+            priority=PRIORITY_VISIBLE if visible else PRIORITY_PREFETCH
+        )
+        if task_id is None:
+            # No pool - render here
+            self.place_continuous_page(number)
+            return
+
+        self.canvas.create_rectangle(
+            x, y, x + width, y + height,
+            outline="#cccccc", fill="#f5f5f5", tags=("page_item", "placeholder", tag)
+        )
+        self.page_tasks[number] = task_id
+        self.visible_pages[number] = None
+
+    def on_continuous_page_rendered(self, doc, number, zoom, result):
+        """Pool callback - swap the placeholder for the rendered page"""
+        self.page_tasks.pop(number, None)
+        self.update_render_idle()
+        if doc is not self.pdf_doc or zoom != self.zoom_level or self.visible_pages.get(number, 0) is not None:
+            return
+        self.canvas.delete(f"page_{number}")
+        del self.visible_pages[number]
+        self.place_continuous_page(number, pix=result)
+
+    def place_continuous_page(self, number, pix=None):
+        """Rasterise one page into its slot"""
+        try:
+            photo, width, height, highlight_rects = self.rasterize_page(number, pix=pix)
+        except Exception as e:
+            print(f"Failed to render page {number + 1}: {e}")
+            return
+        x, y, _, _ = self.page_slot(number)
+        tag = f"page_{number}"
+        self.canvas.create_image(x, y, anchor='nw', image=photo, tags=("pdf_image", "page_item", tag))
+        self.draw_page_marks(number, x, y, highlight_rects, tags=(tag,))
+        self.visible_pages[number] = photo
+
+    def release_continuous_page(self, number):
+        """Drop the canvas items and image of an off-screen page"""
+        self.canvas.delete(f"page_{number}")
+        self.visible_pages.pop(number, None)
+        self.page_pixels.pop(number, None)
+        self.highlight_patches.pop(number, None)
+        task_id = self.page_tasks.pop(number, None)
+        if task_id is not None:
+            self.render_pool.cancel(task_id)
+            self.update_render_idle()
+
+    def clear_continuous_pages(self):
+        """Release every page kept by the continuous view"""
+        for number in list(self.visible_pages):
+            self.release_continuous_page(number)
+
+    def on_canvas_scrolled(self, first, last):
+        """Canvas moved - update the scrollbar and the virtualized pages"""
+        self.v_scroll.set(first, last)
+        if self.view_mode == "continuous":
+            self.request_render()
+
+    def on_mouse_wheel(self, event):
+        """Scroll the canvas with the mouse wheel"""
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-3, "units")
+        else:
+            self.canvas.yview_scroll(3, "units")
 
     def on_canvas_configure(self, event=None):
         """Handle canvas resize"""
-        self.render_page()
+        self.request_render()
+
+    def go_to_page(self, page_number):
+        """Show a page in the current view mode"""
+        if not self.pdf_doc or not 0 <= page_number < len(self.pdf_doc):
+            return
+        self.current_page = page_number
+        self.target_page = page_number
+        if self.view_mode == "continuous":
+            self.scroll_to_page(page_number)
+        self.request_render()
+        self.update_controls()
 
     def prev_page(self):
         """Go to previous page"""
-        if self.pdf_doc and self.current_page > 0:
-            self.current_page -= 1
-            self.render_page()
-            self.update_controls()
+        if self.pdf_doc and self.view_mode == "spread":
+            first = self.spread_pages(self.current_page)[0]
+            if first > 0:
+                self.go_to_page(self.spread_pages(first - 1)[0])
+        elif self.pdf_doc and self.current_page > 0:
+            self.go_to_page(self.current_page - 1)
 
     def next_page(self):
         """Go to next page"""
-        if self.pdf_doc and self.current_page < len(self.pdf_doc) - 1:
-            self.current_page += 1
-            self.render_page()
-            self.update_controls()
+        if self.pdf_doc and self.view_mode == "spread":
+            last = self.spread_pages(self.current_page)[-1]
+            if last < len(self.pdf_doc) - 1:
+                self.go_to_page(last + 1)
+        elif self.pdf_doc and self.current_page < len(self.pdf_doc) - 1:
+            self.go_to_page(self.current_page + 1)
 
     def change_zoom(self, value):
         """Change zoom level"""
         self.zoom_level = float(value.replace("%", "")) / 100
         if self.pdf_doc:
-            self.render_page()
+            self.request_render()
+            self.remember_position()
+
+    def set_zoom(self, zoom):
+        """Set the zoom level and reflect it in the zoom menu"""
+        self.zoom_level = zoom
+        self.zoom_var.set(f"{int(round(zoom * 100))}%")
 
     def update_controls(self):
         """Update navigation controls"""
         if self.pdf_doc:
             total_pages = len(self.pdf_doc)
-            self.btn_prev.config(state='normal' if self.current_page > 0 else 'disabled')
-            self.btn_next.config(state='normal' if self.current_page < total_pages - 1 else 'disabled')
-            self.lbl_page.config(text=f"Page: {self.current_page + 1}/{total_pages}")
+            shown = self.spread_pages(self.current_page) if self.view_mode == "spread" else (self.current_page,)
+            self.btn_prev.config(state='normal' if shown[0] > 0 else 'disabled')
+            self.btn_next.config(state='normal' if shown[-1] < total_pages - 1 else 'disabled')
+            self.btn_back.config(state='normal' if self.page_history else 'disabled')
+            label = self.navigation.label(self.current_page) if self.navigation else None
+            pages = "-".join(str(n + 1) for n in shown)
+            if label and label != str(self.current_page + 1):
+                self.lbl_page.config(text=f"Page: {pages}/{total_pages} ({label})")
+            else:
+                self.lbl_page.config(text=f"Page: {pages}/{total_pages}")
+            if self.thumbnails_visible:
+                self.thumbnail_sidebar.set_current_page(self.current_page)
+            self.remember_position()
         else:
             self.btn_prev.config(state='disabled')
             self.btn_next.config(state='disabled')
+            self.btn_back.config(state='disabled')
             self.lbl_page.config(text="Page: 0/0")
 
     # ============= ANNOTATION METHODS =============
@@ -747,6 +1884,8 @@ class PDFViewer:
             self.canvas.config(cursor="cross")
             self.highlight_brush_mode = False
             self.btn_highlight_brush.config(text="Highlight (Brush)")
+            self.text_select_mode = False
+            self.btn_select_text.config(text="Select Text")
         else:
             self.btn_annotate.config(text="Add Annotation")
             self.canvas.config(cursor="")
@@ -760,17 +1899,45 @@ class PDFViewer:
             self.canvas.config(cursor="spraycan")
             self.annotation_mode = False
             self.btn_annotate.config(text="Add Annotation")
+            self.text_select_mode = False
+            self.btn_select_text.config(text="Select Text")
         else:
             self.btn_highlight_brush.config(text="Highlight (Brush)")
             self.canvas.config(cursor="")
             self.reset_annotation_state()
 
+    def toggle_text_select_mode(self):
+        """Toggle click-drag text selection"""
+        self.text_select_mode = not self.text_select_mode
+        if self.text_select_mode:
+            self.btn_select_text.config(text="Cancel Selection")
+            self.canvas.config(cursor="xterm")
+            self.annotation_mode = False
+            self.btn_annotate.config(text="Add Annotation")
+            self.highlight_brush_mode = False
+            self.btn_highlight_brush.config(text="Highlight (Brush)")
+            self.reset_annotation_state()
+        else:
+            self.btn_select_text.config(text="Select Text")
+            self.canvas.config(cursor="")
+            self.clear_selection()
+
     def change_annotation_color(self, color):
         """Change annotation color"""
         self.annotation_color = color
 
     def start_annotation(self, event):
         """Start creating an annotation or highlight"""
+        # Clicking the page gives it the keyboard (Alt-Left, Ctrl+C)
+        self.canvas.focus_set()
+        if self.text_select_mode:
+            self.start_selection(event)
+            return
+
+        if not self.annotation_mode and not self.highlight_brush_mode:
+            self.follow_link(event)
+            return
+
         if not self.pdf_doc or not self.file_id:
             return
             
@@ -779,6 +1946,18 @@ class PDFViewer:
 
         x = self.canvas.canvasx(event.x)
         y = self.canvas.canvasy(event.y)
+
+        # With several pages on screen the mark goes on the page under the cursor
+        if self.view_mode == "continuous" and self.page_offsets:
+            self.current_page = self.page_at_y(y)
+            self.target_page = self.current_page
+            page_x, page_y, _, _ = self.page_slot(self.current_page)
+            self.image_origin = (page_x, page_y)
+            self.update_controls()
+        elif self.view_mode == "spread" and self.page_slots:
+            self.current_page = self.page_at(x, y)
+            self.image_origin = self.page_slots[self.current_page][:2]
+            self.update_controls()
         
         if hasattr(self, 'image_origin'):
             frame_x, frame_y = self.image_origin
@@ -804,11 +1983,15 @@ class PDFViewer:
                     frame_x + x, frame_y + y,
                     outline=color,
                     width=2,
-                    tags="temp_annotation"
+                    tags=("temp_annotation", "page_item")
                 )
 
     def draw_annotation(self, event):
         """Update annotation while dragging"""
+        if self.text_select_mode:
+            self.extend_selection(event)
+            return
+
         if not self.annotation_start or not self.current_annotation:
             return
         
@@ -881,15 +2064,8 @@ class PDFViewer:
                     original_y2 = y2 / self.zoom_level
                     
                     if self.highlight_brush_mode:
-                        # Save highlight
-                        bbox = f"{original_x1},{original_y1},{original_x2},{original_y2}"
-                        DatabaseManager.save_highlight(
-                            self.file_id,
-                            self.current_page,
-                            texto_destacado="",
-                            cor=self.highlight_brush_color,
-                            bbox=bbox
-                        )
+                        rects = self.save_snapped_highlight(original_x1, original_y1, original_x2, original_y2)
+                        self.add_highlight_marks(self.current_page, rects, self.highlight_brush_color)
                     else:
                         # Save annotation with optional text
                         text = simpledialog.askstring(
@@ -907,10 +2083,15 @@ class PDFViewer:
                             self.annotation_color
                         )
                         
-                        if not success:
+                        if success:
+                            self.add_annotation_mark(
+                                self.current_page,
+                                (original_x1, original_y1, original_x2, original_y2),
+                                text,
+                                self.annotation_color
+                            )
+                        else:
                             messagebox.showerror("Error", "Failed to save annotation!")
-                    
-                    self.render_page()
                 
                 self.reset_annotation_state()
                 
@@ -918,6 +2099,32 @@ class PDFViewer:
             messagebox.showerror("Error", f"Failed to save annotation: {str(e)}")
             self.reset_annotation_state()
 
+    def save_snapped_highlight(self, x1, y1, x2, y2):
+        """Save a brush highlight snapped to the words it covers, one row per line.
+
+        Returns the saved rectangles in PDF coordinates.
+        """
+        lines = []
+        try:
+            index = self.text_cache.layer(self.current_page, doc=self.pdf_doc).index
+            lines = index.lines(index.words_in_rect(x1, y1, x2, y2))
+        except Exception as e:
+            print(f"Error reading words for highlight: {e}")
+
+        if not lines:
+            # Nothing textual under the brush (e.g. a figure) - keep the rectangle
+            lines = [((x1, y1, x2, y2), "")]
+
+        for (lx1, ly1, lx2, ly2), text in lines:
+            DatabaseManager.save_highlight(
+                self.file_id,
+                self.current_page,
+                texto_destacado=text,
+                cor=self.highlight_brush_color,
+                bbox=f"{lx1},{ly1},{lx2},{ly2}"
+            )
+        return [rect for rect, _ in lines]
+
     def reset_annotation_state(self):
         """Reset annotation state"""
         if self.temp_annotation:
@@ -926,62 +2133,260 @@ class PDFViewer:
         self.annotation_start = None
         self.current_annotation = None
 
-    # ============= SEARCH METHODS =============
-    
-    def search_text(self):
-        """Search for text in the current page"""
-        search_term = self.search_var.get().strip()
-        if not search_term or not self.pdf_doc:
-            return
+    # ============= TEXT SELECTION =============
 
+    def page_point(self, event, page_number=None):
+        """(page, x, y) in PDF coordinates for a canvas event, or None"""
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        if page_number is None:
+            page_number = self.page_at(x, y)
+        slot = self.page_slots.get(page_number)
+        if slot is None and self.view_mode == "continuous" and self.page_offsets:
+            slot = self.page_slot(page_number)
+        if slot is None:
+            return None
+        return page_number, (x - slot[0]) / self.zoom_level, (y - slot[1]) / self.zoom_level
+
+    def page_at(self, x, y):
+        """Page under a canvas point in the current view mode"""
+        if self.view_mode == "continuous" and self.page_offsets:
+            return self.page_at_y(y)
+        if self.view_mode == "spread":
+            for page_number, (sx, sy, w, h) in self.page_slots.items():
+                if sx <= x < sx + w:
+                    return page_number
+        return self.current_page
+
+    def start_selection(self, event):
+        """Anchor a selection at the word under the cursor"""
+        self.canvas.focus_set()
+        self.clear_selection()
+        if not self.pdf_doc or not self.text_cache:
+            return
+        point = self.page_point(event)
+        if point is None:
+            return
+        page_number, x, y = point
         try:
-            page = self.pdf_doc.load_page(self.current_page)
-            text_instances = page.search_for(search_term)
+            index = self.text_cache.layer(page_number, doc=self.pdf_doc).index
+        except Exception as e:
+            print(f"Error reading words for selection: {e}")
+            return
+        word = index.word_at(x, y)
+        if word is not None:
+            self.selection = {'page': page_number, 'anchor': word, 'start': word, 'end': word}
+            self.draw_selection()
+
+    def extend_selection(self, event):
+        """Move the free end of the selection to the word under the cursor"""
+        if not self.selection:
+            return
+        point = self.page_point(event, self.selection['page'])
+        if point is None:
+            return
+        page_number, x, y = point
+        index = self.text_cache.layer(page_number, doc=self.pdf_doc).index
+        word = index.word_at(x, y)
+        if word is None:
+            return
+        anchor = self.selection['anchor']
+        start, end = min(anchor, word), max(anchor, word)
+        if (start, end) != (self.selection['start'], self.selection['end']):
+            self.selection['start'], self.selection['end'] = start, end
+            self.draw_selection()
+
+    def selection_index(self):
+        return self.text_cache.layer(self.selection['page'], doc=self.pdf_doc).index
+
+    def draw_selection(self):
+        """Redraw the selection on its page, if that page is on screen"""
+        self.canvas.delete("text_selection")
+        slot = self.page_slots.get(self.selection['page']) if self.selection else None
+        if slot is None:
+            return
+        tags = (f"page_{self.selection['page']}",) if self.view_mode == "continuous" else ()
+        self.draw_selection_rects(slot[0], slot[1], tags)
 
-            if not text_instances:
-                messagebox.showinfo("Search", f"Text '{search_term}' not found on this page")
-                return
+    def draw_selection_rects(self, x, y, tags=()):
+        index = self.selection_index()
+        words = range(self.selection['start'], self.selection['end'] + 1)
+        zoom = self.zoom_level
+        for (x1, y1, x2, y2), _ in index.lines(words):
+            self.canvas.create_rectangle(
+                x + x1 * zoom, y + y1 * zoom,
+                x + x2 * zoom, y + y2 * zoom,
+                fill="#3399ff",
+                stipple="gray50",
+                width=0,
+                tags=("text_selection", "page_item") + tags
+            )
+
+    def selected_text(self):
+        if not self.selection:
+            return ""
+        words = range(self.selection['start'], self.selection['end'] + 1)
+        return self.selection_index().text_of(words)
 
-            # Clear previous highlights
-            self.clear_search_highlights()
+    def copy_selection(self, event=None):
+        """Copy the selected text to the clipboard"""
+        text = self.selected_text()
+        if text:
+            self.parent.clipboard_clear()
+            self.parent.clipboard_append(text)
 
-            # Store results for navigation
-            self.search_results = text_instances
-            self.current_search_index = 0
+    def clear_selection(self):
+        self.selection = None
+        self.canvas.delete("text_selection")
 
-            # Highlight all occurrences
-            for rect in text_instances:
-                self.highlight_text(rect, search_term)
+    # ============= SEARCH METHODS =============
+    
+    def setup_search_panel(self):
+        """Results list shown under the page while searching"""
+        self.search_panel = ttk.Frame(self.main_frame)
 
-        except Exception as e:
-            messagebox.showerror("Search Error", f"Failed to search text: {str(e)}")
+        self.search_status_label = ttk.Label(self.search_panel, text="", font=('Arial', 9, 'italic'))
+        self.search_status_label.pack(side='top', anchor='w')
 
-    def highlight_text(self, rect, search_term):
-        """Highlight found text on canvas"""
-        if not hasattr(self, 'image_origin'):
+        list_frame = ttk.Frame(self.search_panel)
+        list_frame.pack(fill='x')
+
+        self.search_listbox = tk.Listbox(list_frame, height=6, activestyle='none')
+        self.search_listbox.pack(side='left', fill='x', expand=True)
+        list_scroll = ttk.Scrollbar(list_frame, orient='vertical', command=self.search_listbox.yview)
+        list_scroll.pack(side='right', fill='y')
+        self.search_listbox.configure(yscrollcommand=list_scroll.set)
+        self.search_listbox.bind('<<ListboxSelect>>', self.on_search_result_select)
+
+    def search_text(self):
+        """Search the whole document on a background worker"""
+        search_term = self.search_var.get().strip()
+        if not search_term or not self.pdf_doc:
             return
-            
-        frame_x, frame_y = self.image_origin
+
+        try:
+            pattern = compile_query(
+                search_term,
+                case_sensitive=self.search_case_var.get(),
+                regex=self.search_regex_var.get()
+            )
+        except re.error as e:
+            messagebox.showerror("Search Error", f"Invalid regular expression:\n{str(e)}")
+            return
+
+        self.cancel_search()
+        self.clear_search_highlights()
+        self.search_results = []
+        self.search_hits_by_page = {}
+        self.current_search_index = -1
+        self.search_query = search_term
+        self.search_listbox.delete(0, 'end')
+        self.search_panel.pack(side='bottom', fill='x', pady=(5, 0), before=self.display_container)
+        self.search_status_label.config(text=f"Searching '{search_term}'...")
+
+        self.search_queue = queue.Queue()
+        self.search_worker = SearchWorker(
+            self.text_cache, len(self.pdf_doc), pattern, self.current_page, self.search_queue
+        )
+        self.search_worker.start()
+        self.poll_search_results()
+
+    def cancel_search(self):
+        """Stop a running search worker"""
+        if self.search_worker:
+            self.search_worker.cancel()
+            self.search_worker = None
+        if self.search_poll_job:
+            self.canvas.after_cancel(self.search_poll_job)
+            self.search_poll_job = None
+
+    def on_search_query_changed(self, *args):
+        """A new query supersedes the running search"""
+        if self.search_worker and self.search_var.get().strip() != self.search_query:
+            self.cancel_search()
+            self.search_status_label.config(text="Search cancelled")
+
+    def poll_search_results(self):
+        """Move streamed hits from the worker queue into the results panel"""
+        self.search_poll_job = None
+        finished = False
+        try:
+            while True:
+                kind, value = self.search_queue.get_nowait()
+                if kind == 'hit':
+                    self.add_search_result(value)
+                elif kind == 'progress':
+                    scanned, total = value
+                    self.search_status_label.config(
+                        text=f"Searching... page {scanned}/{total} - {len(self.search_results)} match(es)"
+                    )
+                elif kind == 'done':
+                    finished = True
+                    self.search_status_label.config(
+                        text=f"{len(self.search_results)} match(es) for '{self.search_query}'"
+                    )
+                elif kind == 'error':
+                    finished = True
+                    self.search_status_label.config(text=f"Search failed: {value}")
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.search_worker = None
+            if not self.search_results:
+                messagebox.showinfo("Search", f"Text '{self.search_query}' not found in the document")
+        else:
+            self.search_poll_job = self.canvas.after(50, self.poll_search_results)
+
+    def add_search_result(self, hit):
+        index = len(self.search_results)
+        self.search_results.append(hit)
+        self.search_hits_by_page.setdefault(hit['page'], []).append(index)
+        self.search_listbox.insert('end', f"p. {hit['page'] + 1}: {hit['snippet']}")
+
+        if index == 0:
+            self.show_search_result(0)
+        elif hit['page'] in self.page_slots:
+            # New hit on a page already on screen
+            x, y, _, _ = self.page_slots[hit['page']]
+            for rect in hit['rects']:
+                self.highlight_text(rect, x, y, tags=(f"page_{hit['page']}",))
+
+    def highlight_text(self, rect, x, y, tags=(), active=False):
+        """Highlight found text on canvas at page origin x, y"""
         zoom = self.zoom_level
 
         # Convert PDF coordinates to canvas coordinates
-        x0 = frame_x + rect.x0 * zoom
-        y0 = frame_y + rect.y0 * zoom
-        x1 = frame_x + rect.x1 * zoom
-        y1 = frame_y + rect.y1 * zoom
+        x0 = x + rect.x0 * zoom
+        y0 = y + rect.y0 * zoom
+        x1 = x + rect.x1 * zoom
+        y1 = y + rect.y1 * zoom
 
         # Create highlight rectangle
         highlight = self.canvas.create_rectangle(
             x0, y0, x1, y1,
-            outline="red",
+            outline="red" if active else "orange",
             fill="yellow",
             stipple="gray50",
-            width=2,
-            tags="search_highlight"
+            width=3 if active else 1,
+            tags=("search_highlight", "page_item") + tags
         )
 
         self.search_highlights.append(highlight)
 
+    def draw_search_hits(self, page_number, x, y, tags=()):
+        """Draw every hit of the page; the selected one stands out"""
+        for index in self.search_hits_by_page.get(page_number, []):
+            active = index == self.current_search_index
+            for rect in self.search_results[index]['rects']:
+                self.highlight_text(rect, x, y, tags=tags, active=active)
+
+    def redraw_search_hits(self):
+        """Refresh hit highlights on the pages currently shown"""
+        self.clear_search_highlights()
+        for page_number, (x, y, _, _) in self.page_slots.items():
+            self.draw_search_hits(page_number, x, y, tags=(f"page_{page_number}",))
+
     def clear_search_highlights(self):
         """Clear all search highlights"""
         for highlight in self.search_highlights:
@@ -992,41 +2397,65 @@ class PDFViewer:
     def clear_search(self):
         """Clear search"""
         self.search_var.set("")
+        self.reset_search()
+
+    def reset_search(self):
+        """Drop results and hide the results panel"""
+        self.cancel_search()
+        self.search_query = ""
         self.clear_search_highlights()
         self.search_results = []
+        self.search_hits_by_page = {}
         self.current_search_index = -1
+        self.search_listbox.delete(0, 'end')
+        self.search_panel.pack_forget()
 
     def prev_search_result(self):
         """Navigate to previous search result"""
         if self.search_results:
-            self.current_search_index = (self.current_search_index - 1) % len(self.search_results)
-            self.show_search_result(self.current_search_index)
+            self.show_search_result((self.current_search_index - 1) % len(self.search_results))
 
     def next_search_result(self):
         """Navigate to next search result"""
         if self.search_results:
-            self.current_search_index = (self.current_search_index + 1) % len(self.search_results)
-            self.show_search_result(self.current_search_index)
+            self.show_search_result((self.current_search_index + 1) % len(self.search_results))
+
+    def on_search_result_select(self, event=None):
+        selection = self.search_listbox.curselection()
+        if selection and selection[0] != self.current_search_index:
+            self.show_search_result(selection[0])
 
     def show_search_result(self, index):
-        """Show specific search result"""
-        self.clear_search_highlights()
+        """Show specific search result, turning the page if needed"""
+        if not 0 <= index < len(self.search_results):
+            return
 
-        if 0 <= index < len(self.search_results):
-            rect = self.search_results[index]
-            self.highlight_text(rect, self.search_var.get())
-            self.scroll_to_highlight(rect)
+        self.current_search_index = index
+        hit = self.search_results[index]
+        self.search_listbox.selection_clear(0, 'end')
+        self.search_listbox.selection_set(index)
+        self.search_listbox.see(index)
 
-    def scroll_to_highlight(self, rect):
+        if hit['page'] != self.current_page or hit['page'] not in self.page_slots:
+            self.go_to_page(hit['page'])
+            # Hits are drawn by the render; scroll once it is on screen
+            self.canvas.after_idle(lambda: self.scroll_to_highlight(hit))
+        else:
+            self.redraw_search_hits()
+            self.scroll_to_highlight(hit)
+
+    def scroll_to_highlight(self, hit):
         """Scroll canvas to show highlight"""
-        if not hasattr(self, 'image_origin'):
+        slot = self.page_slots.get(hit['page'])
+        if not slot or not hit['rects']:
             return
-        
-        frame_x, frame_y = self.image_origin
-        zoom = self.zoom_level
 
-        y_pos = frame_y + rect.y0 * zoom
-        canvas_height = self.canvas.winfo_height()
-        
-        if canvas_height > 0:
-            self.canvas.yview_moveto(y_pos / canvas_height)
\ No newline at end of file
+        _, page_y, _, _ = slot
+        region = self.canvas.cget('scrollregion').split()
+        total_height = float(region[3]) if len(region) == 4 else 0
+        if total_height <= 0:
+            return
+
+        y_pos = page_y + hit['rects'][0].y0 * self.zoom_level
+        top = max(y_pos - self.canvas.winfo_height() / 3, 0)
+        self.canvas.yview_moveto(top / total_height)
@@ -0,0 +1,124 @@
+import json
+import os
+import queue
+import threading
+from cache_utils import cache_dir
+from pdf_render import MUPDF_LOCK
+
+DEFAULT_MAX_MB = 256
+
+
+def load_render_cache_settings():
+    """Read the optional "render_cache" section of config.json"""
+    settings = {'enabled': True, 'max_mb': DEFAULT_MAX_MB}
+    try:
+        if os.path.exists('config.json'):
+            with open('config.json', 'r') as f:
+                settings.update(json.load(f).get('render_cache', {}))
+    except Exception as e:
+        print(f"Failed to load render cache settings: {e}")
+    return settings
+
+
+class RenderCache:
+    """Compressed page renders on disk for instant document reopen.
+
+    Entries are PNG files keyed by document content hash, page, zoom and
+    mark version. The cache is capped in size and evicts the least recently
+    used entries (file mtime is bumped on every hit).
+    """
+
+    def __init__(self, enabled=True, max_mb=DEFAULT_MAX_MB):
+        self.enabled = enabled
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.directory = cache_dir('renders')
+        self.total_bytes = None
+        self.writes = queue.Queue()
+        self.writer = None
+
+    @classmethod
+    def from_config(cls):
+        settings = load_render_cache_settings()
+        return cls(enabled=bool(settings.get('enabled')), max_mb=float(settings.get('max_mb', DEFAULT_MAX_MB)))
+
+    # ============= ENTRIES =============
+
+    def entry_path(self, doc_hash, page_number, zoom, marks_version):
+        name = f"{doc_hash}_{page_number}_{int(round(zoom * 100))}_{marks_version}.png"
+        return os.path.join(self.directory, name)
+
+    def get(self, doc_hash, page_number, zoom, marks_version):
+        """Return the PNG bytes of a cached render, or None"""
+        if not self.enabled or not doc_hash:
+            return None
+        path = self.entry_path(doc_hash, page_number, zoom, marks_version)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, doc_hash, page_number, zoom, marks_version, pix):
+        """Compress and store a rendered pixmap on the writer thread"""
+        if not self.enabled or not doc_hash:
+            return
+        path = self.entry_path(doc_hash, page_number, zoom, marks_version)
+        if os.path.exists(path):
+            return
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer.start()
+        self.writes.put((path, pix))
+
+    def _write_loop(self):
+        while True:
+            path, pix = self.writes.get()
+            try:
+                with MUPDF_LOCK:
+                    data = pix.tobytes("png")
+                    pix = None
+                temp_path = path + ".tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                if self.total_bytes is None:
+                    self.total_bytes = self.scan_size()
+                else:
+                    self.total_bytes += len(data)
+                if self.total_bytes > self.max_bytes:
+                    self.evict()
+            except Exception as e:
+                print(f"Failed to write render cache entry: {e}")
+
+    def entries(self):
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((stat.st_mtime, stat.st_size, path))
+        return result
+
+    def scan_size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until under 90% of the cap"""
+        target = self.max_bytes * 0.9
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
@@ -0,0 +1,296 @@
+import atexit
+import heapq
+import itertools
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+import fitz  # PyMuPDF
+from pdf_render import PixelBuffer
+
+# Lower value = served first
+PRIORITY_VISIBLE = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_THUMBNAIL = 2
+
+# Per-worker shared buffers are created on demand, sized to the renders the
+# worker actually returns; bigger renders travel through the result queue
+MAX_SHARED_BUFFER_SIZE = 48 * 1024 * 1024
+SHARED_BUFFER_STEP = 1024 * 1024
+# More workers than this barely speed up what is on screen
+MAX_PROCESSES = 6
+POLL_INTERVAL_MS = 15
+
+
+def attach_shared_memory(name):
+    """Open the parent's buffer without letting this process own it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the parent's resource tracker,
+        # so registering the same name again is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(worker_index, tasks, results):
+    """Render loop of one pool process; keeps its own fitz.Document per path"""
+    shm = None
+    doc = None
+    doc_path = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            task_id, pdf_path, page_number, zoom, fit_width, output, buffer_name = task
+            try:
+                if buffer_name != (shm.name if shm else None):
+                    if shm is not None:
+                        shm.close()
+                    shm = attach_shared_memory(buffer_name) if buffer_name else None
+                if pdf_path != doc_path:
+                    if doc is not None:
+                        doc.close()
+                    doc = fitz.open(pdf_path)
+                    doc_path = pdf_path
+                page = doc.load_page(page_number)
+                if fit_width:
+                    zoom = fit_width / max(page.rect.width, 1)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                if output == "png":
+                    results.put((worker_index, task_id, "png", pix.tobytes("png")))
+                    continue
+
+                size = pix.width * pix.height * 3
+                samples = pix.samples_mv
+                if pix.stride != pix.width * 3:
+                    samples = pix.samples  # never for RGB without alpha
+                if shm is not None and size <= shm.size:
+                    shm.buf[:size] = samples
+                    results.put((worker_index, task_id, "shared", (pix.width, pix.height, size)))
+                else:
+                    results.put((worker_index, task_id, "raw", (pix.width, pix.height, pix.samples)))
+            except Exception as e:
+                results.put((worker_index, task_id, "error", str(e)))
+    finally:
+        if doc is not None:
+            doc.close()
+        if shm is not None:
+            shm.close()
+
+
+class RenderPool:
+    """Process pool that renders PDF pages on every core.
+
+    Each worker opens its own fitz.Document by path and returns raw pixels
+    through a shared-memory buffer owned by this process, created once the
+    worker returns its first render and grown to fit later ones. Pending
+    work is a priority queue: visible pages first, then prefetch, then
+    thumbnails; thumbnails never take the last free worker. A worker that
+    dies fails its task (the callback gets None) and is replaced. The pool
+    has no thread of its own: ``poll`` runs from the Tk loop of the attached
+    widget, so callbacks run on the Tk thread.
+    """
+
+    def __init__(self, widget=None, processes=None):
+        self.widget = widget
+        self.poll_job = None
+        self.processes = processes or min(max((os.cpu_count() or 2) - 1, 1), MAX_PROCESSES)
+        self.context = None
+        self.workers = []
+        self.results = None
+        self.pending = []
+        self.tasks = {}
+        self.counter = itertools.count()
+        self.started = False
+        self.available = True
+
+    def start(self):
+        """Spawn the worker processes (done lazily on first submit)"""
+        if self.started:
+            return self.available
+        self.started = True
+        atexit.register(self.shutdown)
+        try:
+            self.context = mp.get_context("spawn")
+            self.results = self.context.Queue()
+            for index in range(self.processes):
+                self.workers.append(self.spawn_worker(index))
+        except Exception as e:
+            print(f"Render pool unavailable, rendering in-process: {e}")
+            self.available = False
+            self.shutdown()
+        return self.available
+
+    def spawn_worker(self, index, shm=None):
+        tasks = self.context.Queue()
+        process = self.context.Process(
+            target=_worker_main,
+            args=(index, tasks, self.results),
+            daemon=True
+        )
+        process.start()
+        return {'process': process, 'tasks': tasks, 'shm': shm, 'busy': None}
+
+    def can_take_thumbnails(self):
+        """Thumbnails never take the last free worker, so they need two"""
+        return self.start() and len(self.workers) > 1
+
+    def shutdown(self):
+        """Stop the workers and release their shared buffers"""
+        if self.poll_job and self.widget is not None:
+            try:
+                self.widget.after_cancel(self.poll_job)
+            except Exception:
+                pass
+        self.poll_job = None
+        for worker in self.workers:
+            try:
+                worker['tasks'].put(None)
+                worker['process'].join(timeout=1.0)
+            except Exception:
+                pass
+            self.release_buffer(worker)
+        self.workers = []
+        self.pending = []
+        self.tasks = {}
+
+    # ============= TASKS =============
+
+    def submit(self, pdf_path, page_number, zoom, callback, priority=PRIORITY_PREFETCH,
+               output="raw", fit_width=None):
+        """Queue a page render; ``callback(result)`` runs in ``poll``.
+
+        ``result`` is a PixelBuffer (output "raw"), PNG bytes (output "png")
+        or None when the render failed. With ``fit_width`` the zoom is chosen
+        so the page is that many pixels wide. Returns a task id, or None if
+        the pool is not available.
+        """
+        if not self.start():
+            return None
+        task_id = next(self.counter)
+        self.tasks[task_id] = {
+            'args': (task_id, pdf_path, page_number, zoom, fit_width, output),
+            'callback': callback,
+            'priority': priority,
+        }
+        heapq.heappush(self.pending, (priority, task_id))
+        self.dispatch()
+        self.schedule_poll()
+        return task_id
+
+    def cancel(self, task_id):
+        """Forget a task; a render already running is discarded on arrival"""
+        self.tasks.pop(task_id, None)
+
+    def idle_workers(self):
+        return [w for w in self.workers if w['busy'] is None and w['process'].is_alive()]
+
+    def dispatch(self):
+        """Hand the most urgent pending tasks to idle workers"""
+        idle = self.idle_workers()
+        while idle and self.pending:
+            priority, task_id = self.pending[0]
+            task = self.tasks.get(task_id)
+            if task is None:
+                heapq.heappop(self.pending)
+                continue
+            # Keep one worker free for visible pages
+            if priority >= PRIORITY_THUMBNAIL and len(idle) <= 1:
+                break
+            heapq.heappop(self.pending)
+            worker = idle.pop(0)
+            worker['busy'] = task_id
+            buffer_name = worker['shm'].name if worker['shm'] else None
+            worker['tasks'].put(task['args'] + (buffer_name,))
+
+    def schedule_poll(self):
+        if self.widget is not None and self.poll_job is None:
+            self.poll_job = self.widget.after(POLL_INTERVAL_MS, self._poll_loop)
+
+    def _poll_loop(self):
+        self.poll_job = None
+        self.poll()
+        if self.has_work():
+            self.schedule_poll()
+
+    def poll(self):
+        """Deliver finished renders to their callbacks and dispatch more work"""
+        if not self.started or not self.available:
+            return
+        while True:
+            try:
+                worker_index, task_id, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            worker = self.workers[worker_index]
+            result = None
+            if kind == "shared":
+                width, height, size = payload
+                result = PixelBuffer(width, height, worker['shm'].buf[:size])
+            elif kind == "raw":
+                width, height, samples = payload
+                result = PixelBuffer(width, height, samples)
+                self.grow_buffer(worker, len(samples))
+            elif kind == "png":
+                result = payload
+            else:
+                print(f"Render pool error: {payload}")
+            # A late result of a worker that was replaced belongs to no one
+            if worker['busy'] == task_id:
+                worker['busy'] = None
+
+            task = self.tasks.pop(task_id, None)
+            if task is not None:
+                try:
+                    task['callback'](result)
+                except Exception as e:
+                    print(f"Render callback failed: {e}")
+        self.replace_dead_workers()
+        self.dispatch()
+
+    def replace_dead_workers(self):
+        """Fail the task of a worker that died (e.g. MuPDF crashed) and start a new one"""
+        for index, worker in enumerate(self.workers):
+            if worker['process'].is_alive():
+                continue
+            print(f"Render worker {index} died (exit code {worker['process'].exitcode}), restarting it")
+            task = self.tasks.pop(worker['busy'], None) if worker['busy'] is not None else None
+            try:
+                self.workers[index] = self.spawn_worker(index, worker['shm'])
+            except Exception as e:
+                print(f"Failed to restart render worker: {e}")
+                worker['busy'] = None
+            if task is not None:
+                try:
+                    task['callback'](None)
+                except Exception as e:
+                    print(f"Render callback failed: {e}")
+
+    def grow_buffer(self, worker, size):
+        """Give a worker a shared buffer big enough for renders of ``size`` bytes"""
+        current = worker['shm'].size if worker['shm'] else 0
+        if size <= current or size > MAX_SHARED_BUFFER_SIZE:
+            return
+        size = min(-(-size * 5 // 4 // SHARED_BUFFER_STEP) * SHARED_BUFFER_STEP, MAX_SHARED_BUFFER_SIZE)
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+        except Exception as e:
+            print(f"Failed to create render buffer: {e}")
+            return
+        # The worker is idle now; it switches buffers with its next task
+        self.release_buffer(worker)
+        worker['shm'] = shm
+
+    def release_buffer(self, worker):
+        if worker['shm'] is None:
+            return
+        try:
+            worker['shm'].close()
+            worker['shm'].unlink()
+        except Exception:
+            pass
+        worker['shm'] = None
+
+    def has_work(self):
+        return bool(self.pending) or any(w['busy'] is not None for w in self.workers)
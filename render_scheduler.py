@@ -0,0 +1,33 @@
+class RenderScheduler:
+    """Coalesces bursts of render requests into one render per idle cycle.
+
+    Results that arrive later from the render pool are not tracked here:
+    their callbacks compare the document, page and zoom they were started
+    for with the current ones and drop stale results themselves.
+    """
+
+    def __init__(self, widget, render_callback):
+        self.widget = widget
+        self.render_callback = render_callback
+        self.pending_job = None
+
+    def request(self):
+        """Ask for a render on the next idle cycle"""
+        if self.pending_job is None:
+            self.pending_job = self.widget.after_idle(self._run)
+
+    def cancel(self):
+        """Cancel the pending render (a render is about to happen directly)"""
+        if self.pending_job is not None:
+            try:
+                self.widget.after_cancel(self.pending_job)
+            except Exception:
+                pass
+            self.pending_job = None
+
+    def _run(self):
+        self.pending_job = None
+        try:
+            self.render_callback()
+        except Exception as e:
+            print(f"Scheduled render failed: {e}")
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+# The application modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache_utils
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    """Point the persistent caches at an empty temporary folder"""
+    monkeypatch.setattr(cache_utils, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache_utils, "_hash_memo", None)
+    return tmp_path / "cache"
+
+
+CONTAINER = """<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>"""
+
+NAV = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<body>
+  <nav epub:type="landmarks"><ol><li><a href="text/ch1.xhtml">Start here</a></li></ol></nav>
+  <nav epub:type="toc"><ol>
+    <li><a href="text/ch1.xhtml">Part One</a>
+      <ol><li><a href="text/ch%202.xhtml#s1">The Second Chapter</a></li></ol>
+    </li>
+    <li><span>Appendix</span></li>
+  </ol></nav>
+</body>
+</html>"""
+
+NCX = """<?xml version="1.0" encoding="utf-8"?>
+<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
+  <navMap>
+    <navPoint id="p1"><navLabel><text>NCX Part</text></navLabel><content src="text/ch1.xhtml"/>
+      <navPoint id="p2"><navLabel><text>NCX Chapter</text></navLabel><content src="text/ch%202.xhtml"/></navPoint>
+    </navPoint>
+  </navMap>
+</ncx>"""
+
+CHAPTER = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"><head><title>t</title></head>
+<body><h1>{title}</h1><p>{text}</p></body></html>"""
+
+
+@pytest.fixture
+def make_epub(tmp_path):
+    """Build a small EPUB: three spine documents, an image, a nav and/or an NCX"""
+    import zipfile
+
+    def build(nav=True, ncx=True, name="book.epub"):
+        path = tmp_path / name
+        items = [
+            '<item id="c1" href="text/ch1.xhtml" media-type="application/xhtml+xml"/>',
+            '<item id="c2" href="text/ch%202.xhtml" media-type="application/xhtml+xml"/>',
+            '<item id="c3" href="text/ch3.xhtml" media-type="application/xhtml+xml"/>',
+            '<item id="img" href="images/a.png" media-type="image/png"/>',
+        ]
+        if nav:
+            items.append('<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>')
+        if ncx:
+            items.append('<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>')
+        spine_toc = ' toc="ncx"' if ncx else ''
+        opf = f"""<?xml version="1.0"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0">
+  <manifest>{''.join(items)}</manifest>
+  <spine{spine_toc}>
+    <itemref idref="c1"/><itemref idref="c2"/><itemref idref="img"/><itemref idref="c3"/>
+  </spine>
+</package>"""
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("mimetype", "application/epub+zip")
+            z.writestr("META-INF/container.xml", CONTAINER)
+            z.writestr("OEBPS/content.opf", opf)
+            z.writestr("OEBPS/text/ch1.xhtml", CHAPTER.format(title="One", text="First words."))
+            z.writestr("OEBPS/text/ch 2.xhtml", CHAPTER.format(title="Two", text="Second words."))
+            z.writestr("OEBPS/text/ch3.xhtml", CHAPTER.format(title="Three", text="Third words."))
+            z.writestr("OEBPS/images/a.png", b"\x89PNG")
+            if nav:
+                z.writestr("OEBPS/nav.xhtml", NAV)
+            if ncx:
+                z.writestr("OEBPS/toc.ncx", NCX)
+        return str(path)
+
+    return build
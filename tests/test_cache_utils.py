@@ -0,0 +1,65 @@
+import os
+
+import cache_utils
+from cache_utils import content_hash, known_hash
+
+
+def test_hash_changes_when_content_changes(cache_root, tmp_path):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"a" * (3 * 1024 * 1024))
+    first = content_hash(str(path))
+
+    # Same size, one byte changed in the middle, where sampling would miss it
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] = ord("b")
+    path.write_bytes(bytes(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert content_hash(str(path)) != first
+
+
+def test_same_content_same_hash(cache_root, tmp_path):
+    a = tmp_path / "a.pdf"
+    b = tmp_path / "b.pdf"
+    a.write_bytes(b"%PDF-1.4 same bytes")
+    b.write_bytes(b"%PDF-1.4 same bytes")
+    assert content_hash(str(a)) == content_hash(str(b))
+
+
+def test_hash_is_remembered_on_disk(cache_root, tmp_path, monkeypatch):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"contents")
+    digest = content_hash(str(path))
+    assert (cache_root / cache_utils.HASH_INDEX_FILE).exists()
+
+    # A fresh process reads the index instead of the file
+    monkeypatch.setattr(cache_utils, "_hash_memo", None)
+    real_open = open
+
+    def no_reading(file, mode="r", *args, **kwargs):
+        assert not (str(file) == str(path) and "b" in mode), "file was hashed again"
+        return real_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", no_reading)
+    assert content_hash(str(path)) == digest
+
+
+def test_index_is_capped(cache_root, tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, "MAX_HASH_ENTRIES", 3)
+    for i in range(5):
+        path = tmp_path / f"{i}.pdf"
+        path.write_bytes(str(i).encode())
+        content_hash(str(path))
+    assert len(cache_utils.load_hash_index()) == 3
+
+
+def test_known_hash_never_reads_the_file(cache_root, tmp_path):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"contents")
+    assert known_hash(str(path)) is None
+    digest = content_hash(str(path))
+    assert known_hash(str(path)) == digest
+
+    path.write_bytes(b"new contents")
+    assert known_hash(str(path)) is None
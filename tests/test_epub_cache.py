@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from epub_cache import STYLES, EpubCache, cache_path, pack_runs, unpack_runs, write_cache
+from epub_text import IMAGE_STYLE
+
+CHAPTERS = [
+    [("Título\n", "heading"), ("Olá ", ""), ("mundo", "strong_emphasis"), (".\n", "")],
+    [("images/a.png", IMAGE_STYLE), ("\nEnd 😀\n", "")],
+    [],
+]
+
+
+def test_pack_round_trip_every_style():
+    runs = [(f"{style or 'plain'} é\n", style) for style in STYLES]
+    assert unpack_runs(pack_runs(runs)) == runs
+
+
+def test_write_and_read_book(cache_root):
+    path = cache_path("book")
+    write_cache(path, ["a.xhtml", "b.xhtml", "c.xhtml"], ["A", "B", "C"], [1, 2, 1], iter(CHAPTERS))
+    assert not os.path.exists(path + ".tmp")
+
+    cache = EpubCache.open("book")
+    try:
+        assert len(cache) == 3
+        assert cache.names == ["a.xhtml", "b.xhtml", "c.xhtml"]
+        assert cache.titles == ["A", "B", "C"]
+        assert cache.levels == [1, 2, 1]
+        # Chapters can be read in any order
+        assert cache.runs(1) == CHAPTERS[1]
+        assert cache.runs(0) == CHAPTERS[0]
+        assert cache.runs(2) == []
+    finally:
+        cache.close()
+
+
+def test_failed_write_leaves_no_files(cache_root):
+    path = cache_path("book")
+
+    def chapters():
+        yield CHAPTERS[0]
+        raise RuntimeError("chapter failed to parse")
+
+    with pytest.raises(RuntimeError):
+        write_cache(path, ["a", "b"], ["A", "B"], [1, 1], chapters())
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_chapter_count_must_match(cache_root):
+    path = cache_path("book")
+    with pytest.raises(ValueError):
+        write_cache(path, ["a", "b"], ["A", "B"], [1, 1], iter(CHAPTERS[:1]))
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_missing_or_corrupt_cache_is_ignored(cache_root):
+    assert EpubCache.open("missing") is None
+    with open(cache_path("corrupt"), "wb") as f:
+        f.write(b"not a cache at all")
+    assert EpubCache.open("corrupt") is None
+
+
+def test_save_cache_outlives_the_store(cache_root, make_epub):
+    from epub_chapters import ChapterStore
+    from epub_reader import EpubReader
+
+    path = make_epub()
+    store = ChapterStore.from_reader(EpubReader(path))
+    first = store.runs(0)
+    # Another book was opened: the store's own reader is closed
+    store.close()
+    store.save_cache("book", path)
+
+    cache = EpubCache.open("book")
+    try:
+        assert cache.titles == store.titles
+        assert cache.runs(0) == first
+        assert cache.runs(2) == [("Three\n", "heading"), ("Third words.\n", "")]
+    finally:
+        cache.close()
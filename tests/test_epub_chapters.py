@@ -0,0 +1,116 @@
+import time
+
+from epub_chapters import ChapterStore
+
+
+class FakeReader:
+    def __init__(self, spine, toc):
+        self.spine = spine
+        self.toc = toc
+        self.closed = False
+
+    def read(self, name):
+        return f"<html><body><p>{name}</p></body></html>".encode("utf-8")
+
+    def close(self):
+        self.closed = True
+
+
+def counting_store(count):
+    loads = []
+
+    def load(index):
+        loads.append(index)
+        return [(f"chapter {index}\n", "")]
+
+    return ChapterStore([f"c{n}" for n in range(count)], [], [1] * count, load), loads
+
+
+def test_titles_come_from_the_first_toc_entry_of_each_document():
+    reader = FakeReader(["a", "b", "c", "d"], [
+        (1, "Part", "a"),
+        (2, "Section", "a"),  # a later entry into the same document
+        (1, "", "b"),  # untitled entries are skipped
+        (2, "Bee", "b"),
+        (1, "Heading only", None),
+        (3, "Dee", "d"),
+    ])
+    store = ChapterStore.from_reader(reader)
+    assert store.titles == ["Part", "Bee", "Chapter 3", "Dee"]
+    assert store.levels == [1, 2, 2, 3]
+    assert [store.label(n) for n in range(4)] == ["Part", "    Bee", "    Chapter 3", "        Dee"]
+    assert store.text(2) == "c"
+
+    store.close()
+    assert reader.closed and store.source is None
+
+
+def test_untitled_first_document_is_top_level():
+    store = ChapterStore.from_reader(FakeReader(["a", "b"], [(2, "Late", "b")]))
+    assert store.titles == ["Chapter 1", "Late"]
+    assert store.levels == [1, 2]
+
+
+def test_from_cache_reads_runs_from_the_cache():
+    class FakeCache:
+        names = ["a", "b"]
+        titles = ["A", "B"]
+        levels = [1, 2]
+        closed = False
+
+        def runs(self, index):
+            return [(self.titles[index] + "\n", "heading")]
+
+        def close(self):
+            self.closed = True
+
+    cache = FakeCache()
+    store = ChapterStore.from_cache(cache)
+    assert len(store) == 2
+    assert store.label(1) == "    B"
+    assert store[1] == "B"
+    store.close()
+    assert cache.closed
+
+
+def test_parsed_chapters_are_kept_in_an_lru():
+    store, loads = counting_store(12)
+    for index in range(ChapterStore.MAX_CHAPTERS):
+        store.runs(index)
+    store.runs(0)  # chapter 0 is now the most recently used
+    store.runs(8)
+    assert list(store.parsed) == [2, 3, 4, 5, 6, 7, 0, 8]
+
+    store.runs(0)
+    store.runs(1)
+    assert loads == list(range(9)) + [1]
+
+
+def test_load_runs_leaves_the_lru_alone():
+    store, loads = counting_store(3)
+    store.runs(1)
+    assert store.load_runs(1) == [("chapter 1\n", "")]
+    assert store.load_runs(2) == [("chapter 2\n", "")]
+    assert list(store.parsed) == [1]
+    assert loads == [1, 2]
+
+
+def wait_for_prefetch(store):
+    for _ in range(500):
+        with store.lock:
+            if not store.prefetching:
+                return
+        time.sleep(0.01)
+    raise AssertionError("prefetch did not finish")
+
+
+def test_prefetch_parses_the_neighbours():
+    store, loads = counting_store(5)
+    store.prefetch(2)
+    wait_for_prefetch(store)
+    assert sorted(store.parsed) == [1, 3]
+
+    # Chapter 1 is already parsed and there is nothing before chapter 0
+    store.prefetch(0)
+    wait_for_prefetch(store)
+    assert sorted(loads) == [1, 3]
@@ -0,0 +1,80 @@
+import io
+
+import pytest
+from PIL import Image
+
+import epub_images
+from epub_images import ImageCache, decode_image
+
+
+class FakePhoto:
+    """PhotoImage needs a Tk display; the cache only keeps a reference"""
+
+    def __init__(self, img, master=None):
+        self.size = img.size
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(epub_images.ImageTk, "PhotoImage", FakePhoto)
+    # Room for three 256x256 images (256 KB each as Tk stores them)
+    return ImageCache(budget_mb=0.75)
+
+
+def image(size=256):
+    return Image.new("RGB", (size, size))
+
+
+def test_least_recently_used_goes_first(cache):
+    for key in "abc":
+        cache.put(key, image())
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.put("d", image())
+    assert list(cache.images) == ["c", "a", "d"]
+    assert cache.get("b") is None
+    assert cache.total_bytes == 3 * 256 * 256 * 4
+
+
+def test_pinned_images_are_not_evicted(cache):
+    for key in "abc":
+        cache.put(key, image())
+        cache.pin(key)
+    cache.put("d", image())
+    # Over budget, but everything on screen stays alive
+    assert set(cache.images) == set("abcd")
+
+    cache.unpin_all()
+    assert list(cache.images) == ["b", "c", "d"]
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_new_image_survives_even_if_too_big(cache):
+    photo = cache.put("huge", image(1024))
+    assert cache.get("huge") is photo
+
+
+def test_clear(cache):
+    cache.put("a", image())
+    cache.pin("a")
+    cache.clear()
+    assert cache.images == {} and cache.pinned == set() and cache.total_bytes == 0
+
+
+def encode(img, fmt):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_decode_scales_into_the_box():
+    img = decode_image(encode(Image.new("RGB", (2000, 1000)), "JPEG"), 400, 400)
+    assert img.size == (400, 200)
+    assert img.mode == "RGB"
+
+
+def test_decode_converts_palette_images():
+    palette = Image.new("P", (10, 10))
+    palette.info["transparency"] = 0
+    img = decode_image(encode(palette, "PNG"), 100, 100)
+    assert img.size == (10, 10)
+    assert img.mode == "RGBA"
@@ -0,0 +1,62 @@
+from epub_chapters import ChapterStore
+from epub_reader import EpubReader, resolve_href
+
+
+def test_resolve_href():
+    assert resolve_href("OEBPS/text/ch1.xhtml", "../images/a%20b.png#x") == "OEBPS/images/a b.png"
+    assert resolve_href("OEBPS/content.opf", "text/ch1.xhtml") == "OEBPS/text/ch1.xhtml"
+
+
+def test_spine_keeps_documents_only(make_epub):
+    reader = EpubReader(make_epub())
+    try:
+        assert reader.spine == ["OEBPS/text/ch1.xhtml", "OEBPS/text/ch 2.xhtml", "OEBPS/text/ch3.xhtml"]
+        assert b"Second words." in reader.read(reader.spine[1])
+    finally:
+        reader.close()
+
+
+def test_nav_toc_levels(make_epub):
+    reader = EpubReader(make_epub())
+    try:
+        # The toc nav is used, not the landmarks; fragments are dropped
+        assert reader.toc == [
+            (1, "Part One", "OEBPS/text/ch1.xhtml"),
+            (2, "The Second Chapter", "OEBPS/text/ch 2.xhtml"),
+            (1, "Appendix", None),
+        ]
+    finally:
+        reader.close()
+
+
+def test_ncx_toc_levels(make_epub):
+    reader = EpubReader(make_epub(nav=False))
+    try:
+        assert reader.toc == [
+            (1, "NCX Part", "OEBPS/text/ch1.xhtml"),
+            (2, "NCX Chapter", "OEBPS/text/ch 2.xhtml"),
+        ]
+    finally:
+        reader.close()
+
+
+def test_book_without_toc(make_epub):
+    reader = EpubReader(make_epub(nav=False, ncx=False))
+    try:
+        assert reader.toc == []
+        store = ChapterStore.from_reader(reader)
+        assert store.titles == ["Chapter 1", "Chapter 2", "Chapter 3"]
+    finally:
+        reader.close()
+
+
+def test_chapter_titles_and_nesting(make_epub):
+    store = ChapterStore.from_reader(EpubReader(make_epub()))
+    try:
+        # ch3 has no entry: numbered, nested like the chapter before it
+        assert store.titles == ["Part One", "The Second Chapter", "Chapter 3"]
+        assert store.levels == [1, 2, 2]
+        assert store.label(1) == "    The Second Chapter"
+        assert store.text(2) == "Three\nThird words."
+    finally:
+        store.close()
@@ -0,0 +1,80 @@
+import queue
+
+from epub_search import BookIndex, IndexWorker
+from epub_text import IMAGE_CHARACTER, IMAGE_STYLE, runs_to_text
+
+CHAPTERS = [
+    "The quick brown fox.\nQuick thinking wins.",
+    "A fox-trot, then the quick-brown FOX again.",
+]
+
+
+def make_index():
+    index = BookIndex()
+    for text in CHAPTERS:
+        index.add_chapter(text)
+    return index
+
+
+def found(hits):
+    return [(hit['chapter'], CHAPTERS[hit['chapter']][hit['offset']:hit['offset'] + hit['length']]) for hit in hits]
+
+
+def test_phrase_across_punctuation():
+    hits = make_index().search("quick brown")
+    assert found(hits) == [(0, "quick brown"), (1, "quick-brown")]
+
+
+def test_one_word_matches_prefixes_in_book_order():
+    hits = make_index().search("qui")
+    assert [(hit['chapter'], hit['offset']) for hit in hits] == [(0, 4), (0, 21), (1, 21)]
+
+
+def test_last_word_may_be_partial():
+    assert found(make_index().search("brown fo")) == [(0, "brown fo"), (1, "brown FO")]
+
+
+def test_case_insensitive_and_limit():
+    index = make_index()
+    assert len(index.search("FOX")) == 3
+    assert len(index.search("fox", limit=2)) == 2
+    assert index.search("...") == []
+    assert index.search("wolf") == []
+
+
+def test_snippet_marks_the_hit():
+    hit = make_index().search("thinking")[0]
+    assert "[thinking]" in hit['snippet']
+
+
+def test_offsets_count_images_as_one_character():
+    runs = [("Before ", ""), ("a.png", IMAGE_STYLE), (" after words\n", "")]
+    text = runs_to_text(runs)
+    index = BookIndex()
+    index.add_chapter(text)
+    hit = index.search("after")[0]
+    # The offset is the Text widget index: one position for the image
+    assert hit['offset'] == len("Before ") + 1 + 1
+    assert text[hit['offset'] - 2] == IMAGE_CHARACTER
+
+
+class FakeStore:
+    def __init__(self, chapters):
+        self.chapters = chapters
+
+    def __len__(self):
+        return len(self.chapters)
+
+    def load_runs(self, index):
+        return [(self.chapters[index], "")]
+
+
+def test_index_worker_reports_progress():
+    results = queue.Queue()
+    worker = IndexWorker(FakeStore(CHAPTERS), results)
+    worker.run()
+    messages = [results.get_nowait() for _ in range(results.qsize())]
+    assert messages[:2] == [('progress', (1, 2)), ('progress', (2, 2))]
+    kind, index = messages[2]
+    assert kind == 'done'
+    assert len(index.search("fox")) == 3
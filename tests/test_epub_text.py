@@ -0,0 +1,155 @@
+import codecs
+
+import pytest
+
+from epub_text import (
+    EXTRACTORS, IMAGE_CHARACTER, IMAGE_STYLE, RUN_STYLES, RunCollector, chunk_runs, extract_chapter,
+    runs_to_text, style_font,
+)
+
+CHAPTER = b"""<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head><title>Not shown</title><style>p { margin: 0 }</style></head>
+<body>
+  <h1>Chapter  One</h1>
+  <p>Hello <em>big</em>
+     <b>world</b>.</p>
+  <p><img src="../images/a.png" alt="A"/></p>
+  <p>Last <strong><i>line</i></strong></p>
+  <script>var hidden = 1;</script>
+</body>
+</html>"""
+
+EXPECTED = [
+    ("Chapter One\n", "heading"),
+    ("Hello ", ""),
+    ("big", "emphasis"),
+    (" ", ""),
+    ("world", "strong"),
+    (".\n", ""),
+    ("../images/a.png", IMAGE_STYLE),
+    ("\nLast ", ""),
+    ("line\n", "strong_emphasis"),
+]
+
+
+@pytest.mark.parametrize("backend", sorted(EXTRACTORS))
+def test_extract_runs(backend):
+    assert extract_chapter(CHAPTER, backend=backend) == EXPECTED
+
+
+def test_backends_agree_on_str_input():
+    text = CHAPTER.decode("utf-8")
+    results = [extract_chapter(text, backend=backend) for backend in sorted(EXTRACTORS)]
+    assert all(result == EXPECTED for result in results)
+
+
+def test_failing_backend_falls_back_to_soup(monkeypatch):
+    def broken(content):
+        raise ValueError("parser failure")
+
+    monkeypatch.setitem(EXTRACTORS, "broken", broken)
+    assert extract_chapter(CHAPTER, backend="broken") == EXPECTED
+
+
+def test_svg_image_href():
+    runs = extract_chapter(
+        b'<html><body><svg xmlns:xlink="http://www.w3.org/1999/xlink">'
+        b'<image xlink:href="cover.jpg"/></svg></body></html>'
+    )
+    assert ("cover.jpg", IMAGE_STYLE) in runs
+
+
+def test_runs_to_text_counts_images_as_one_character():
+    text = runs_to_text(EXPECTED)
+    assert text == f"Chapter One\nHello big world.\n{IMAGE_CHARACTER}\nLast line"
+    assert "Not shown" not in text and "hidden" not in text
+
+
+def test_chunks_cut_at_newlines():
+    runs = [("aaaa\nbbbb\ncccc\n", ""), ("dd", "strong")]
+    chunks = list(chunk_runs(runs, 6))
+    assert chunks == [["aaaa\n", ""], ["bbbb\n", ""], ["cccc\n", "", "d", "strong"], ["d", "strong"]]
+
+
+def test_chunks_without_newline_cut_at_size():
+    assert list(chunk_runs([("abcdefghij", "")], 4, first=2)) == [
+        ["ab", ""], ["cdef", ""], ["ghij", ""]]
+
+
+def test_chunks_never_cut_images():
+    runs = [("abc", ""), ("images/long-file-name.png", IMAGE_STYLE), ("defgh", "")]
+    chunks = list(chunk_runs(runs, 4))
+    flat = [item for chunk in chunks for item in chunk]
+    assert "images/long-file-name.png" in flat
+    # Rejoining the chunks gives the runs back
+    rebuilt = list(zip(flat[::2], flat[1::2]))
+    assert runs_to_text(rebuilt) == runs_to_text(runs)
+
+
+def test_run_styles_cover_every_flag_combination():
+    assert sorted(RUN_STYLES) == sorted([
+        "heading", "strong", "emphasis", "heading_strong", "heading_emphasis", "strong_emphasis",
+        "heading_strong_emphasis",
+    ])
+
+
+def collect(events):
+    collector = RunCollector()
+    for event, *args in events:
+        getattr(collector, event)(*args)
+    return collector.close()
+
+
+def test_nested_flags_end_in_order():
+    runs = collect([
+        ("start", "p"), ("start", "em"), ("data", "a "), ("start", "i"), ("data", "b "),
+        ("end", "i"), ("data", "c "), ("end", "em"), ("data", "d"), ("end", "p"),
+    ])
+    # The inner <i> ends without dropping the outer <em>
+    assert runs == [("a b c ", "emphasis"), ("d\n", "")]
+
+
+def test_blocks_of_one_style_merge_into_one_run():
+    runs = collect([
+        ("start", "p"), ("data", "  one \n two "), ("end", "p"),
+        ("start", "div"), ("start", "p"), ("data", "three"), ("end", "p"), ("end", "div"),
+        ("start", "h2"), ("data", "Head"), ("end", "h2"),
+        ("start", "p"), ("end", "p"),
+    ])
+    assert runs == [("one two\nthree\n", ""), ("Head\n", "heading")]
+
+
+def test_unbalanced_end_tags_are_ignored():
+    runs = collect([
+        ("end", "b"), ("end", "style"), ("start", "p"), ("data", "plain"), ("end", "p"),
+    ])
+    assert runs == [("plain\n", "")]
+
+
+def test_style_font():
+    assert style_font("", "Georgia", 12) == ("Georgia", 12, "normal", "roman")
+    assert style_font("heading_emphasis", "Georgia", 12) == ("Georgia", 16, "bold", "italic")
+    assert style_font("strong", "Georgia", 12) == ("Georgia", 12, "bold", "roman")
+
+
+ACCENTED = "Olá, ação"
+ENCODED = {
+    "utf-8 by default": f"<html><body><p>{ACCENTED}</p></body></html>".encode("utf-8"),
+    "xml declaration": (
+        f'<?xml version="1.0" encoding="ISO-8859-1"?>'
+        f'<html xmlns="http://www.w3.org/1999/xhtml"><body><p>{ACCENTED}</p></body></html>'
+    ).encode("latin-1"),
+    "meta charset": (
+        f'<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1252"/>'
+        f'</head><body><p>{ACCENTED}</p></body></html>'
+    ).encode("cp1252"),
+    "utf-16 little endian": codecs.BOM_UTF16_LE + f'<?xml version="1.0" encoding="UTF-16"?><html><body><p>{ACCENTED}</p></body></html>'.encode("utf-16-le"),
+    "utf-16 big endian": codecs.BOM_UTF16_BE + f"<html><body><p>{ACCENTED}</p></body></html>".encode("utf-16-be"),
+}
+
+
+@pytest.mark.parametrize("backend", sorted(EXTRACTORS))
+@pytest.mark.parametrize("name", sorted(ENCODED))
+def test_declared_encodings(backend, name):
+    assert extract_chapter(ENCODED[name], backend=backend) == [(ACCENTED + "\n", "")]
@@ -0,0 +1,194 @@
+import epub_viewer
+from epub_text import IMAGE_CHARACTER, IMAGE_STYLE, RUN_STYLES, runs_to_text
+from epub_viewer import EPUBViewer
+
+RUNS = [("Intro ", ""), ("a.png", IMAGE_STYLE), (" then the text\n", ""), ("More text\n", "")]
+
+
+class FakeText:
+    """Chapter text after the "content" mark, scrolled so ``top`` is at @0,0.
+
+    Like Tk, 'chars' skips embedded images while 'indices' counts each
+    image as one position.
+    """
+
+    def __init__(self, runs, top):
+        self.runs = runs
+        self.top = top
+        self.calls = []
+
+    def count(self, start, end, *options):
+        self.calls.append((start, end) + options)
+        assert (start, end) == ('content', '@0,0')
+        seen = 0
+        chars = 0
+        for text, style in self.runs:
+            length = 1 if style == IMAGE_STYLE else len(text)
+            taken = min(length, self.top - seen)
+            if taken <= 0:
+                break
+            seen += taken
+            if style != IMAGE_STYLE:
+                chars += taken
+        return (seen if 'indices' in options else chars,)
+
+    def after_cancel(self, job):
+        pass
+
+
+def viewer_at(top):
+    viewer = EPUBViewer.__new__(EPUBViewer)
+    viewer.text_widget = FakeText(RUNS, top)
+    return viewer
+
+
+def test_top_offset_counts_images():
+    text = runs_to_text(RUNS)
+    top = text.index("then")
+    assert viewer_at(top).top_offset() == top
+
+
+def test_top_offset_at_chapter_start():
+    assert viewer_at(0).top_offset() == 0
+
+
+def test_save_position_writes_top_offset(monkeypatch):
+    saved = []
+    monkeypatch.setattr(epub_viewer.DatabaseManager, "save_reading_position",
+                        lambda *args: saved.append(args))
+    viewer = viewer_at(runs_to_text(RUNS).index("More"))
+    viewer.doc_hash = "book"
+    viewer.file_id = 7
+    viewer.current_chapter = 2
+    viewer.font_size = 14
+    viewer.pending_position = None
+    viewer.position_job = None
+
+    # Nothing scheduled, nothing to save
+    viewer.save_position()
+    assert saved == []
+
+    viewer.position_job = "after#1"
+    viewer.save_position()
+    assert saved == [("book", 7, 2, len("Intro ") + 1 + len(" then the text\n"), 14)]
+    assert viewer.position_job is None
+
+
+class LazyStore:
+    """ChapterStore stand-in that records which chapters were parsed"""
+
+    def __init__(self, chapters):
+        self.chapters = chapters
+        self.titles = [f"Chapter {n + 1}" for n in range(len(chapters))]
+        self.loaded = []
+
+    def __len__(self):
+        return len(self.chapters)
+
+    def load_runs(self, index):
+        self.loaded.append(index)
+        return self.chapters[index]
+
+
+def test_reading_parses_chapters_as_speech_reaches_them():
+    store = LazyStore([RUNS, [], [("Last words here.\n", "")]])
+    viewer = EPUBViewer.__new__(EPUBViewer)
+    viewer.current_text = ""
+    viewer.sentences = []
+    viewer.pending_texts = epub_viewer.chapter_texts(store, 0)
+    assert store.loaded == []
+
+    assert viewer.next_sentences()
+    assert store.loaded == [0]
+    assert viewer.sentences == ["Chapter 1.", "Intro  then the text\nMore text"]
+    assert IMAGE_CHARACTER not in viewer.current_text
+
+    # The empty chapter is skipped on the way to the last one
+    assert viewer.next_sentences()
+    assert store.loaded == [0, 1, 2]
+    assert viewer.sentences[-1] == "Last words here."
+    assert not viewer.next_sentences()
+    assert viewer.pending_texts is None
+
+
+class TagText:
+    def __init__(self):
+        self.fonts = {}
+
+    def tag_configure(self, tag, font):
+        self.fonts[tag] = font
+
+
+def test_every_run_style_has_a_tag_font():
+    viewer = EPUBViewer.__new__(EPUBViewer)
+    viewer.text_widget = TagText()
+    viewer.font_family = "Georgia"
+    viewer.font_size = 14
+    viewer.configure_style_tags()
+    assert set(viewer.text_widget.fonts) == set(RUN_STYLES) | {"title"}
+    assert viewer.text_widget.fonts["title"] == ("Georgia", 22, "bold")
+    assert viewer.text_widget.fonts["heading_emphasis"] == ("Georgia", 18, "bold", "italic")
+    assert viewer.text_widget.fonts["emphasis"] == ("Georgia", 14, "normal", "italic")
+
+
+class ChunkText:
+    """Text widget stand-in that records inserts and idle callbacks"""
+
+    def __init__(self):
+        self.inserted = []
+        self.idle = []
+
+    def config(self, **options):
+        pass
+
+    def insert(self, index, *args):
+        self.inserted.append(args)
+
+    def after_idle(self, callback, *args):
+        self.idle.append((callback, args))
+        return f"after#{len(self.idle)}"
+
+
+def chunk_viewer():
+    viewer = EPUBViewer.__new__(EPUBViewer)
+    viewer.text_widget = ChunkText()
+    viewer.render_generation = 3
+    viewer.render_job = None
+    viewer.pending_position = "5.0"
+    viewer.pending_highlight = None
+    viewer.insert_image = lambda src: viewer.text_widget.inserted.append(("image", src))
+    viewer.reveal_pending_position = lambda: None
+    return viewer
+
+
+def test_insert_chunk_splits_around_images():
+    viewer = chunk_viewer()
+    viewer.insert_chunk(["a", "", "b.png", IMAGE_STYLE, "c", "strong", "d", ""])
+    assert viewer.text_widget.inserted == [("a", ""), ("image", "b.png"), ("c", "strong", "d", "")]
+
+
+def test_insert_next_chunks_yields_after_its_time_slice(monkeypatch):
+    clock = iter([0.0, 0.001, 0.1, 0.2, 0.201])
+    monkeypatch.setattr(epub_viewer.time, "perf_counter", lambda: next(clock))
+    viewer = chunk_viewer()
+    chunks = iter([["one", ""], ["two", ""], ["three", ""]])
+
+    viewer.insert_next_chunks(3, chunks)
+    # Two chunks went in before the slice ran out; the rest waits for idle
+    assert viewer.text_widget.inserted == [("one", ""), ("two", "")]
+    assert viewer.render_job == "after#1"
+    callback, args = viewer.text_widget.idle[0]
+    assert args == (3, chunks)
+
+    callback(*args)
+    assert viewer.text_widget.inserted[-1] == ("three", "")
+    assert viewer.render_job is None
+    # The chapter ended before the saved position was reached
+    assert viewer.pending_position is None
+
+
+def test_stale_insertion_is_dropped():
+    viewer = chunk_viewer()
+    viewer.insert_next_chunks(2, iter([["old chapter", ""]]))
+    assert viewer.text_widget.inserted == []
+    assert viewer.pending_position == "5.0"
@@ -0,0 +1,78 @@
+import threading
+
+import fitz
+import pytest
+
+import page_text_cache
+from page_text_cache import PageTextCache, TextLayer
+
+
+@pytest.fixture
+def no_database(monkeypatch):
+    """Persisted page text lives in the database; start with none"""
+    db = page_text_cache.DatabaseManager
+    saved = []
+    monkeypatch.setattr(db, "get_page_texts", lambda doc_hash, page_number=None: [])
+    monkeypatch.setattr(db, "save_page_texts", lambda doc_hash, rows: saved.extend(rows))
+    return saved
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    doc = fitz.open()
+    for n in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {n} has some words")
+    path = str(tmp_path / "book.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_text_layer_maps_text_to_word_boxes():
+    layer = TextLayer([[0, 0, 10, 10, "Hello"], [12, 0, 30, 10, "world"], [0, 20, 10, 30, "again"]])
+    assert layer.text == "Hello world again"
+    start = layer.text.index("world")
+    assert [tuple(r) for r in layer.rects_for(0, start + 5)] == [(0, 0, 30, 10)]
+    assert len(layer.rects_for(0, len(layer.text))) == 2
+    assert layer.snippet(start, start + 5) == "Hello [world] again"
+
+
+def test_threads_share_one_document(pdf, no_database, monkeypatch):
+    opened = []
+    real_open = fitz.open
+    monkeypatch.setattr(page_text_cache.fitz, "open", lambda *a: opened.append(a) or real_open(*a))
+    cache = PageTextCache(pdf, "hash")
+
+    threads = [threading.Thread(target=cache.text, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(opened) == 1
+    assert cache.text(1) == "Page 1 has some words"
+    assert sorted(page for page, _ in no_database) == [0, 1, 2]
+    cache.close()
+
+
+def test_close_releases_the_document(pdf, no_database):
+    cache = PageTextCache(pdf, "hash")
+    assert cache.text(0) == "Page 0 has some words"
+    document = cache.doc
+    cache.close()
+    assert cache.doc is None and document.is_closed
+
+    # Late readers (e.g. a reading thread) get nothing, and nothing is reopened
+    assert cache.text(2) == ""
+    assert cache.doc is None
+    # Pages already extracted are still served from memory
+    assert cache.text(0) == "Page 0 has some words"
+
+
+def test_viewer_document_is_used_when_given(pdf, no_database):
+    cache = PageTextCache(pdf, "hash")
+    doc = fitz.open(pdf)
+    assert cache.text(2, doc=doc) == "Page 2 has some words"
+    assert cache.doc is None
+    doc.close()
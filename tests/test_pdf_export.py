@@ -0,0 +1,130 @@
+import os
+import queue
+
+import fitz
+import pytest
+
+import pdf_export
+from pdf_export import ExportJob, annotated_name, burn_page_marks, export_color
+
+
+def make_pdf(path, pages=3, rotation=0):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=200, height=300)
+        page.set_rotation(rotation)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def shown_rect(page, annot):
+    """An annotation's rectangle in displayed (rotated) page coordinates"""
+    return annot.rect * page.rotation_matrix
+
+
+def rounded(rect):
+    return tuple(round(v, 1) for v in rect)
+
+
+def test_names_and_colors():
+    assert annotated_name("/books/My Book.pdf") == "My Book_annotated.pdf"
+    assert export_color("blue") == (0, 0, 1)
+    assert export_color("unknown") == export_color("red")
+
+
+@pytest.mark.parametrize("rotation", [0, 90])
+def test_burn_marks_where_they_were_shown(tmp_path, rotation):
+    doc = fitz.open(make_pdf(tmp_path / "book.pdf", pages=1, rotation=rotation))
+    page = doc[0]
+    burn_page_marks(
+        page,
+        [(10, 20, 60, 50, "note", "blue"), (5, 5, 15, 15, "", "green")],
+        [("marked", "yellow", "30,100,90,112", None), ("no box", "red", "", None)],
+    )
+
+    annots = list(page.annots())
+    assert [a.type[1] for a in annots] == ["Square", "Square", "Highlight"]
+    # The annotation rectangle grows by half the 2pt border on each side
+    assert rounded(shown_rect(page, annots[0])) == (9, 19, 61, 51)
+    assert annots[0].info["content"] == "note"
+    assert annots[0].colors["stroke"] == pytest.approx([0, 0, 1])
+    assert annots[2].info["content"] == "marked"
+    # Highlight boxes are taken from the quads, so only check it covers the mark
+    shown = shown_rect(page, annots[2])
+    assert shown.contains(fitz.Rect(31, 101, 89, 111))
+    doc.close()
+
+
+@pytest.fixture
+def marks(monkeypatch):
+    """Marks on pages 0 and 2 of file 1, served instead of the database"""
+    calls = {"annotations": []}
+    db = pdf_export.DatabaseManager
+    monkeypatch.setattr(db, "get_marked_pages", lambda file_id: [0, 2])
+
+    def annotations(file_id, page_number):
+        calls["annotations"].append(page_number)
+        return [(10, 10, 50, 50, f"page {page_number}", "red")]
+
+    monkeypatch.setattr(db, "get_annotations", annotations)
+    monkeypatch.setattr(db, "get_highlights", lambda file_id, page_number: [])
+    return calls
+
+
+def messages(results):
+    return [results.get_nowait() for _ in range(results.qsize())]
+
+
+def test_export_reports_progress(tmp_path, marks):
+    source = make_pdf(tmp_path / "book.pdf")
+    destination = str(tmp_path / "out.pdf")
+    results = queue.Queue()
+    ExportJob([(1, source, destination)], results).run()
+
+    assert messages(results) == [
+        ('progress', (0, 1, 0, 2, "book.pdf")),
+        ('progress', (0, 1, 1, 2, "book.pdf")),
+        ('progress', (0, 1, 2, 2, "book.pdf")),
+        ('file', ("book.pdf", destination)),
+        ('done', 1),
+    ]
+    doc = fitz.open(destination)
+    assert [len(list(doc[n].annots())) for n in range(3)] == [1, 0, 1]
+    doc.close()
+    assert not os.path.exists(destination + ".tmp")
+
+
+def test_cancel_stops_between_pages(tmp_path, marks, monkeypatch):
+    source = make_pdf(tmp_path / "book.pdf")
+    destination = str(tmp_path / "out.pdf")
+    results = queue.Queue()
+    job = ExportJob([(1, source, destination), (1, source, str(tmp_path / "second.pdf"))], results)
+
+    def cancel_after_first_page(file_id, page_number):
+        job.cancel()
+        return []
+
+    monkeypatch.setattr(pdf_export.DatabaseManager, "get_highlights", cancel_after_first_page)
+    job.run()
+
+    assert marks["annotations"] == [0]
+    assert messages(results)[-1] == ('done', 0)
+    assert os.listdir(tmp_path) == ["book.pdf"]
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path, marks, monkeypatch):
+    source = make_pdf(tmp_path / "book.pdf")
+    destination = str(tmp_path / "out.pdf")
+
+    def broken_save(self, path, **options):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(fitz.Document, "save", broken_save)
+    results = queue.Queue()
+    ExportJob([(1, source, destination)], results).run()
+
+    assert messages(results)[-2:] == [('error', ("book.pdf", "disk full")), ('done', 0)]
+    assert os.listdir(tmp_path) == ["book.pdf"]
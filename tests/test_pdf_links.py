@@ -0,0 +1,42 @@
+import fitz
+import pytest
+
+from pdf_links import LinkMap
+
+
+@pytest.fixture
+def doc():
+    doc = fitz.open()
+    for _ in range(4):
+        doc.new_page(width=100, height=100)
+    doc[0].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(10, 10, 30, 20), "page": 2})
+    doc[0].insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(40, 40, 60, 50), "uri": "https://example.com"})
+    yield doc
+    doc.close()
+
+
+def test_hit_finds_internal_links_only(doc):
+    links = LinkMap(doc)
+    assert links.hit(0, 20, 15) == 2
+    # External links and empty space are not followed
+    assert links.hit(0, 50, 45) is None
+    assert links.hit(0, 90, 90) is None
+    assert links.hit(1, 20, 15) is None
+
+
+def test_pages_are_kept_in_an_lru(doc, monkeypatch):
+    monkeypatch.setattr(LinkMap, "MAX_PAGES", 2)
+    links = LinkMap(doc)
+    links.links(0)
+    links.store(1, doc[1])
+    links.links(0)  # page 0 is now the most recently used
+    links.links(2)
+    assert list(links.pages) == [0, 2]
+
+    loaded = []
+    load_page = doc.load_page
+    monkeypatch.setattr(doc, "load_page", lambda number: loaded.append(number) or load_page(number), raising=False)
+    links.hit(0, 20, 15)
+    links.hit(1, 20, 15)
+    assert loaded == [1]
+    assert list(links.pages) == [0, 1]
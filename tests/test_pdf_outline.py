@@ -0,0 +1,87 @@
+from pdf_outline import NavigationIndex, format_label, labels_from_rules, letters, roman
+
+
+def test_roman():
+    assert [roman(n) for n in (1, 4, 9, 14, 40, 90, 400, 1994)] == [
+        "i", "iv", "ix", "xiv", "xl", "xc", "cd", "mcmxciv"]
+
+
+def test_letters():
+    assert [letters(n) for n in (1, 2, 26, 27, 28, 53)] == ["a", "b", "z", "aa", "bb", "aaa"]
+
+
+def test_format_label_styles_and_prefix():
+    assert format_label({'style': 'D'}, 7) == "7"
+    assert format_label({'style': 'r'}, 3) == "iii"
+    assert format_label({'style': 'R'}, 3) == "III"
+    assert format_label({'style': 'a'}, 2) == "b"
+    assert format_label({'style': 'A'}, 28) == "BB"
+    assert format_label({'style': 'D', 'prefix': 'A-'}, 2) == "A-2"
+    # No style: the prefix alone
+    assert format_label({'prefix': 'Cover'}, 1) == "Cover"
+
+
+def test_labels_from_rules():
+    rules = [
+        {'startpage': 3, 'style': 'D', 'firstpagenum': 1},
+        {'startpage': 0, 'style': 'r'},
+    ]
+    assert labels_from_rules(rules, 6) == ["i", "ii", "iii", "1", "2", "3"]
+
+
+def test_pages_before_the_first_rule_keep_their_number():
+    rules = [{'startpage': 2, 'style': 'D', 'prefix': 'A-', 'firstpagenum': 5}]
+    assert labels_from_rules(rules, 4) == ["1", "2", "A-5", "A-6"]
+    assert labels_from_rules([], 4) == []
+
+
+def test_resolve_prefers_labels():
+    index = NavigationIndex([], ["i", "ii", "1", "2", "3"])
+    assert index.resolve("ii", 5) == 1
+    assert index.resolve("II ", 5) == 1
+    # "2" is a label (page 4), not the second page
+    assert index.resolve("2", 5) == 3
+    assert index.resolve("5", 5) == 4
+    assert index.resolve("6", 5) is None
+    assert index.resolve("", 5) is None
+    assert index.label(0) == "i"
+    assert index.label(9) is None
+
+
+def test_resolve_without_labels_uses_page_numbers():
+    index = NavigationIndex([], [])
+    assert index.resolve("1", 3) == 0
+    assert index.resolve("0", 3) is None
+    assert index.label(0) is None
+
+
+class FakeDocument:
+    def __init__(self, toc, rules, pages):
+        self.toc = toc
+        self.rules = rules
+        self.pages = pages
+
+    def get_toc(self, simple=True):
+        return self.toc
+
+    def get_page_labels(self):
+        return self.rules
+
+    def __len__(self):
+        return self.pages
+
+
+def test_load_keeps_entries_without_target(cache_root):
+    doc = FakeDocument(
+        [[1, "Cover", 1], [1, "Part I", -1], [2, "Chapter 1", 3]],
+        [{'startpage': 0, 'style': 'r'}],
+        4,
+    )
+    index = NavigationIndex.load(doc, "hash")
+    assert index.toc == [[1, "Cover", 0], [1, "Part I", -1], [2, "Chapter 1", 2]]
+    assert index.labels == ["i", "ii", "iii", "iv"]
+
+    # The second load comes from the cache
+    cached = NavigationIndex.load(FakeDocument([], [], 0), "hash")
+    assert cached.toc == index.toc
+    assert cached.labels == index.labels
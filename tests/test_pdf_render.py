@@ -0,0 +1,97 @@
+import tkinter as tk
+
+import fitz
+import pytest
+
+import pdf_render
+from pdf_render import PixelBuffer, blend_highlights, compose_pixels, crop_pixels, highlight_rgb, pixmap_to_photo, render_pixmap
+
+
+@pytest.fixture
+def page():
+    doc = fitz.open()
+    page = doc.new_page(width=100, height=50)
+    page.draw_rect(fitz.Rect(0, 0, 50, 50), color=(0, 0, 0), fill=(0, 0, 0))
+    yield page
+    doc.close()
+
+
+def buffer_of(pix):
+    return PixelBuffer(pix.width, pix.height, pix.samples)
+
+
+def test_render_pixmap_is_rgb_at_zoom(page):
+    pix = render_pixmap(page, 2.0)
+    assert (pix.width, pix.height, pix.n, pix.alpha) == (200, 100, 3, 0)
+    # Left half black, right half white
+    assert pix.pixel(10, 10) == (0, 0, 0)
+    assert pix.pixel(190, 10) == (255, 255, 255)
+
+
+def test_pixel_buffer_ppm_matches_mupdf(page):
+    pix = render_pixmap(page, 1.0)
+    assert buffer_of(pix).tobytes("ppm") == pix.tobytes("ppm")
+
+
+def test_photo_gets_ppm_data(page, monkeypatch):
+    made = []
+    monkeypatch.setattr(pdf_render.tk, "PhotoImage", lambda **options: made.append(options) or "photo")
+    pix = render_pixmap(page, 1.0)
+    assert pixmap_to_photo(pix, master="canvas") == "photo"
+    assert made == [{'master': "canvas", 'data': pix.tobytes("ppm"), 'format': "PPM"}]
+
+
+def test_photo_falls_back_to_pil(page, monkeypatch):
+    def no_ppm(**options):
+        raise tk.TclError("couldn't recognize image data")
+
+    images = []
+    monkeypatch.setattr(pdf_render.tk, "PhotoImage", no_ppm)
+    monkeypatch.setattr(pdf_render.ImageTk, "PhotoImage", lambda image, master=None: images.append(image) or "pil")
+    assert pixmap_to_photo(buffer_of(render_pixmap(page, 1.0))) == "pil"
+    assert images[0].size == (100, 50)
+    assert images[0].getpixel((10, 10)) == (0, 0, 0)
+
+
+def gradient(width=4, height=3):
+    """Pixel (x, y) holds the RGB value (x, y, 100)"""
+    return PixelBuffer(width, height, bytes(v for y in range(height) for x in range(width) for v in (x, y, 100)))
+
+
+def test_crop_pixels():
+    crop = crop_pixels(gradient(), 1, 1, 3, 3)
+    assert (crop.width, crop.height) == (2, 2)
+    assert crop.samples == bytes([1, 1, 100, 2, 1, 100, 1, 2, 100, 2, 2, 100])
+    # Clipped to the pixmap; nothing left is None
+    assert crop_pixels(gradient(), 3, 2, 10, 10).samples == bytes([3, 2, 100])
+    assert crop_pixels(gradient(), 5, 0, 9, 2) is None
+
+
+def test_blend_highlights_touches_only_the_rectangle():
+    pix = PixelBuffer(4, 2, b"\xff" * 24)
+    assert blend_highlights(pix, [(1, 0, 3, 1, "yellow")])
+    r, g, b = highlight_rgb("yellow")
+    a = pdf_render.HIGHLIGHT_ALPHA
+    blended = tuple((255 * (255 - a) + c * a + 127) // 255 for c in (r, g, b))
+    pixels = [tuple(pix.samples[i:i + 3]) for i in range(0, 24, 3)]
+    assert pixels == [(255, 255, 255), blended, blended] + [(255, 255, 255)] * 5
+
+
+def test_blend_without_rects_or_numpy(monkeypatch):
+    pix = PixelBuffer(1, 1, b"\xff\xff\xff")
+    assert blend_highlights(pix, [])
+    monkeypatch.setattr(pdf_render, "NUMPY_AVAILABLE", False)
+    # The caller falls back to canvas rectangles
+    assert not blend_highlights(pix, [(0, 0, 1, 1, "red")])
+    assert pix.samples == b"\xff\xff\xff"
+    assert highlight_rgb("no such colour") == highlight_rgb("red")
+
+
+def test_compose_pixels_side_by_side_on_white():
+    left = PixelBuffer(2, 2, b"\x00" * 12)
+    right = PixelBuffer(1, 1, b"\x80" * 3)
+    spread = compose_pixels([(left, 0), (right, 2)], 3, 2)
+    rows = [spread.samples[i:i + 9] for i in (0, 9)]
+    assert rows[0] == b"\x00" * 6 + b"\x80" * 3
+    # The shorter page leaves white below it
+    assert rows[1] == b"\x00" * 6 + b"\xff" * 3
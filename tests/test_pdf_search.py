@@ -0,0 +1,87 @@
+import queue
+import re
+
+import pytest
+
+from page_text_cache import TextLayer
+from pdf_search import SearchWorker, compile_query, search_layer
+
+
+def layer_of(text):
+    """A text layer with one 10pt wide box per word, all on one line"""
+    words = [[i * 10, 0, i * 10 + 8, 10, word] for i, word in enumerate(text.split())]
+    return TextLayer(words)
+
+
+class FakeTextCache:
+    def __init__(self, pages):
+        self.pages = pages
+        self.preloaded = False
+        self.read = []
+
+    def preload(self):
+        self.preloaded = True
+
+    def layer(self, page_number):
+        self.read.append(page_number)
+        return layer_of(self.pages[page_number])
+
+
+def run_worker(cache, pattern, start_page, cancel_on=None):
+    results = queue.Queue()
+    worker = SearchWorker(cache, len(cache.pages), pattern, start_page, results)
+    if cancel_on is not None:
+        layer = cache.layer
+
+        def cancelling(page_number):
+            if page_number == cancel_on:
+                worker.cancel()
+            return layer(page_number)
+
+        cache.layer = cancelling
+    worker.run()
+    return [results.get_nowait() for _ in range(results.qsize())]
+
+
+def test_compile_query():
+    assert compile_query("a.b").search("A.B")
+    assert not compile_query("a.b").search("axb")
+    assert not compile_query("Word", case_sensitive=True).search("word")
+    assert compile_query(r"\d+", regex=True).search("page 12")
+    with pytest.raises(re.error):
+        compile_query("(", regex=True)
+
+
+def test_search_layer_hits_and_rects():
+    hits = search_layer(layer_of("the cat and the hat"), compile_query("the"), 4)
+    assert [hit['page'] for hit in hits] == [4, 4]
+    assert [tuple(hit['rects'][0]) for hit in hits] == [(0, 0, 8, 10), (30, 0, 38, 10)]
+    assert hits[1]['snippet'] == "the cat and [the] hat"
+    # Empty matches are skipped
+    assert search_layer(layer_of("abc"), compile_query("x*", regex=True), 0) == []
+
+
+def test_worker_wraps_around_from_the_start_page():
+    cache = FakeTextCache(["fox one", "nothing", "fox two"])
+    messages = run_worker(cache, compile_query("fox"), 1)
+    assert cache.preloaded
+    assert cache.read == [1, 2, 0]
+    assert [(kind, value if kind != 'hit' else value['page']) for kind, value in messages] == [
+        ('progress', (1, 3)), ('hit', 2), ('progress', (2, 3)), ('hit', 0), ('progress', (3, 3)),
+        ('done', None),
+    ]
+
+
+def test_worker_stops_when_cancelled():
+    cache = FakeTextCache(["fox"] * 5)
+    messages = run_worker(cache, compile_query("fox"), 0, cancel_on=1)
+    assert cache.read == [0, 1]
+    assert ('done', None) not in messages
+
+
+def test_worker_reports_errors():
+    class Broken(FakeTextCache):
+        def layer(self, page_number):
+            raise ValueError("document closed")
+
+    assert run_worker(Broken(["a"]), compile_query("a"), 0) == [('error', "document closed")]
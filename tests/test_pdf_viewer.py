@@ -0,0 +1,247 @@
+import threading
+
+import fitz
+import pytest
+
+import pdf_viewer
+from pdf_render import PixelBuffer, crop_pixels
+from pdf_viewer import PDFViewer
+
+PAGE_HEIGHT = 200
+
+
+class FakeCanvas:
+    """Just enough of a Tk canvas for layout and virtualization"""
+
+    def __init__(self, width=400, height=300):
+        self.width = width
+        self.height = height
+        self.top = 0
+        self.options = {}
+        self.items = []
+        self.drawn = []
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def yview_moveto(self, fraction):
+        # Tk never scrolls past the end of the scroll region
+        total = self.options['scrollregion'][3]
+        self.top = max(min(fraction * total, total - self.height), 0)
+
+    def config(self, **options):
+        self.options.update(options)
+
+    def create_rectangle(self, *coords, **options):
+        self.items.append(options['tags'][-1])
+        self.drawn.append(("rectangle", coords, options))
+        return len(self.drawn)
+
+    def create_text(self, *coords, **options):
+        self.drawn.append(("text", coords, options))
+        return len(self.drawn)
+
+    def create_image(self, *coords, **options):
+        self.drawn.append(("image", coords, options))
+        return len(self.drawn)
+
+    def tag_raise(self, tag):
+        pass
+
+    def delete(self, tag):
+        self.items = [item for item in self.items if item != tag]
+
+    def move(self, *args):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.submitted = {}
+        self.cancelled = []
+
+    def submit(self, pdf_path, page_number, zoom, callback, priority=None):
+        task_id = len(self.submitted)
+        self.submitted[task_id] = (page_number, callback)
+        return task_id
+
+    def cancel(self, task_id):
+        self.cancelled.append(task_id)
+
+
+@pytest.fixture
+def viewer(tmp_path):
+    """A viewer on a 20-page document, without any Tk widgets"""
+    doc = fitz.open()
+    for _ in range(20):
+        doc.new_page(width=100, height=PAGE_HEIGHT)
+    path = str(tmp_path / "book.pdf")
+    doc.save(path)
+    doc.close()
+
+    viewer = PDFViewer.__new__(PDFViewer)
+    viewer.__dict__.update(
+        pdf_doc=fitz.open(path), pdf_path=path, zoom_level=1.0, current_page=0, target_page=None,
+        canvas=FakeCanvas(), render_pool=FakePool(), render_idle=threading.Event(),
+        page_sizes=[], page_offsets=[], layout_zoom=None, layout_width=0, layout_height=0,
+        layout_base_x=0, visible_pages={}, page_tasks={}, page_slots={}, page_pixels={},
+        highlight_patches={}, annotations_on_canvas=[], spread_pending=None, view_mode="continuous",
+    )
+    viewer.update_controls = lambda: None
+    yield viewer
+    viewer.pdf_doc.close()
+
+
+def test_layout_stacks_pages_with_gaps(viewer):
+    viewer.layout_continuous()
+    gap = PDFViewer.PAGE_GAP
+    assert viewer.page_offsets[:3] == [gap, 2 * gap + PAGE_HEIGHT, 3 * gap + 2 * PAGE_HEIGHT]
+    assert viewer.layout_height == 20 * (PAGE_HEIGHT + gap) + gap
+    # Pages are centred in the 400 pixel wide canvas
+    assert viewer.page_slot(0) == (150, gap, 100, PAGE_HEIGHT)
+    assert viewer.page_at_y(0) == 0
+    assert viewer.page_at_y(2 * gap + PAGE_HEIGHT) == 1
+
+
+def test_only_pages_near_the_viewport_are_rendered(viewer):
+    viewer.update_continuous_view()
+    # Pages 0 and 1 are visible, page 2 is prefetched
+    assert sorted(viewer.visible_pages) == [0, 1, 2]
+    assert sorted(page for page, _ in viewer.render_pool.submitted.values()) == [0, 1, 2]
+
+    viewer.canvas.top = 10 * (PAGE_HEIGHT + PDFViewer.PAGE_GAP)
+    viewer.update_continuous_view()
+    assert sorted(viewer.visible_pages) == [9, 10, 11, 12]
+    # The renders of pages that left the window are cancelled
+    assert sorted(viewer.render_pool.cancelled) == [0, 1, 2]
+    assert viewer.current_page == 10
+
+
+def test_navigated_page_stays_current_at_the_end(viewer):
+    viewer.update_continuous_view()
+    viewer.target_page = 19
+    viewer.scroll_to_page(19)
+    viewer.update_continuous_view()
+    # The viewport cannot put page 19 at the top, yet it is the current page
+    assert viewer.page_at_y(viewer.canvas.top + PDFViewer.PAGE_GAP) == 18
+    assert viewer.current_page == 19
+
+    viewer.canvas.top = 0
+    viewer.update_continuous_view()
+    assert viewer.current_page == 0
+    assert viewer.target_page is None
+
+
+class CountingTextCache:
+    def __init__(self, pages):
+        self.pages = pages
+        self.read = []
+
+    def text(self, page_number, doc=None):
+        self.read.append(page_number)
+        return self.pages[page_number]
+
+
+def test_reading_pulls_pages_as_speech_needs_them(viewer, monkeypatch):
+    pages = ["First page. Still the first."] + [""] * 18 + ["Last page here."]
+    viewer.text_cache = CountingTextCache(pages)
+    sources = []
+    monkeypatch.setattr(pdf_viewer, "TTS_AVAILABLE", True)
+    viewer.start_reading = sources.append
+
+    viewer.read_from_page(0)
+    assert viewer.text_cache.read == []
+
+    viewer.current_text = ""
+    viewer.sentences = []
+    viewer.pending_texts = iter(sources[0])
+    assert viewer.next_sentences()
+    assert viewer.text_cache.read == [0]
+    assert viewer.sentences == ["Página 1.", "First page.", "Still the first."]
+
+    # Empty pages are skipped on the way to the next one with text
+    assert viewer.next_sentences()
+    assert viewer.text_cache.read == list(range(20))
+    assert viewer.sentences[-1] == "Last page here."
+    assert viewer.current_text == "Página 1. First page. Still the first. Página 20. Last page here."
+    assert not viewer.next_sentences()
+
+
+def test_new_annotation_joins_the_scaled_layer(viewer):
+    viewer.zoom_level = 2.0
+    viewer.page_slots = {3: (5, 7, 200, 400)}
+    viewer.add_annotation_mark(3, (10, 20, 30, 40), "note", "blue")
+    rectangle, label = viewer.canvas.drawn
+    assert rectangle[:2] == ("rectangle", (25, 47, 65, 87))
+    assert rectangle[2]['tags'] == ("annotation", "marks", "page_item", "page_3")
+    assert label[0] == "text" and label[2]['text'] == "note"
+    # Pages that are not on screen get nothing
+    viewer.add_annotation_mark(9, (10, 20, 30, 40), "", "blue")
+    assert len(viewer.canvas.drawn) == 2
+
+
+def test_new_highlight_is_blended_into_a_patch(viewer, monkeypatch):
+    monkeypatch.setattr(pdf_viewer, "pixmap_to_photo", lambda pix, master=None: pix)
+    viewer.zoom_level = 2.0
+    viewer.page_slots = {0: (5, 7, 20, 20)}
+    page = PixelBuffer(20, 20, b"\xff" * 20 * 20 * 3)
+    viewer.page_pixels = {0: page}
+
+    viewer.add_highlight_marks(0, [(1, 2, 4, 3)], "yellow")
+
+    (kind, coords, options), = viewer.canvas.drawn
+    assert (kind, coords) == ("image", (7, 11))
+    patch = options['image']
+    assert (patch.width, patch.height) == (6, 2)
+    assert patch.samples != b"\xff" * len(patch.samples)
+    # The kept page pixels carry the highlight for later patches
+    assert crop_pixels(page, 2, 4, 8, 6).samples == patch.samples
+    assert viewer.highlight_patches[0] == [patch]
+
+
+class Flag:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+@pytest.mark.parametrize("cover, expected", [
+    (False, [(0, 1), (0, 1), (2, 3), (18, 19)]),
+    (True, [(0,), (1, 2), (1, 2), (19,)]),
+])
+def test_spread_pages(viewer, cover, expected):
+    viewer.spread_cover_var = Flag(cover)
+    assert [viewer.spread_pages(n) for n in (0, 1, 2, 19)] == expected
+
+
+def test_spread_layout(viewer):
+    viewer.zoom_level = 1.5
+    layout, width, height = viewer.spread_layout((4, 5))
+    assert layout == [(4, 0, 150, 300), (5, 150, 150, 300)]
+    assert (width, height) == (300, 300)
+
+
+def test_render_idle_waits_for_pool_renders(viewer):
+    viewer.render_idle.set()
+    viewer.spread_pending = ("doc", ((0, 1), 1.0))
+    viewer.update_render_idle()
+    assert not viewer.render_idle.is_set()
+
+    # The spread arrives for a view that has moved on: nothing is shown
+    viewer.spread_tasks = [1, 2]
+    viewer.view_mode = "single"
+    viewer.on_spread_rendered(viewer.pdf_doc, ((0, 1), 1.0), [None, None])
+    assert viewer.render_idle.is_set()
+    assert viewer.spread_pending is None and viewer.spread_tasks == []
+
+    viewer.page_tasks = {3: 7}
+    viewer.update_render_idle()
+    assert not viewer.render_idle.is_set()
@@ -0,0 +1,72 @@
+import os
+import time
+
+import fitz
+
+from pdf_render import PixelBuffer
+from render_cache import RenderCache
+
+
+def make_buffer(width=4, height=3, value=200):
+    return PixelBuffer(width, height, bytes([value]) * (width * height * 3))
+
+
+def wait_for(path, timeout=5.0):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        assert time.time() < deadline, f"{path} was never written"
+        time.sleep(0.01)
+
+
+def test_put_then_get_returns_png(cache_root):
+    cache = RenderCache()
+    cache.put("doc", 0, 1.5, "v1", make_buffer())
+    wait_for(cache.entry_path("doc", 0, 1.5, "v1"))
+
+    data = cache.get("doc", 0, 1.5, "v1")
+    assert data.startswith(b"\x89PNG")
+    pix = fitz.Pixmap(data)
+    assert (pix.width, pix.height) == (4, 3)
+
+
+def test_key_includes_zoom_and_marks(cache_root):
+    cache = RenderCache()
+    cache.put("doc", 0, 1.0, "v1", make_buffer())
+    wait_for(cache.entry_path("doc", 0, 1.0, "v1"))
+
+    assert cache.get("doc", 0, 1.25, "v1") is None
+    assert cache.get("doc", 0, 1.0, "v2") is None
+    assert cache.get("doc", 1, 1.0, "v1") is None
+
+
+def test_disabled_cache_stores_nothing(cache_root):
+    cache = RenderCache(enabled=False)
+    cache.put("doc", 0, 1.0, "v1", make_buffer())
+    assert cache.writer is None
+    assert cache.get("doc", 0, 1.0, "v1") is None
+
+
+def test_evict_removes_least_recently_used(cache_root):
+    cache = RenderCache(max_mb=1)
+    paths = []
+    for page in range(4):
+        path = cache.entry_path("doc", page, 1.0, "v1")
+        with open(path, "wb") as f:
+            f.write(b"x" * 300 * 1024)
+        os.utime(path, (page, page))
+        paths.append(path)
+    # A hit makes page 0 the most recently used
+    assert cache.get("doc", 0, 1.0, "v1") is not None
+
+    cache.evict()
+
+    assert os.path.exists(paths[0])
+    assert not os.path.exists(paths[1])
+    assert os.path.exists(paths[3])
+    assert cache.total_bytes <= cache.max_bytes * 0.9
+
+
+def test_pixel_buffer_formats():
+    buffer = make_buffer(2, 2, value=10)
+    assert buffer.tobytes() == b"P6\n2 2\n255\n" + bytes([10]) * 12
+    assert fitz.Pixmap(buffer.tobytes("png")).samples == bytes([10]) * 12
@@ -0,0 +1,71 @@
+from render_pool import RenderPool, PRIORITY_THUMBNAIL, PRIORITY_VISIBLE
+
+
+class FakeProcess:
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+class FakeQueue(list):
+    def put(self, item):
+        self.append(item)
+
+
+def started_pool(workers):
+    """A pool whose workers are stand-ins, so dispatch runs without processes"""
+    pool = RenderPool(processes=workers)
+    pool.started = True
+    pool.workers = [
+        {'process': FakeProcess(), 'tasks': FakeQueue(), 'shm': None, 'busy': None}
+        for _ in range(workers)
+    ]
+    return pool
+
+
+def submit(pool, page, priority):
+    return pool.submit("book.pdf", page, 1.0, lambda result: None, priority=priority)
+
+
+def dispatched(pool):
+    return [task[2] for worker in pool.workers for task in worker['tasks']]
+
+
+def test_visible_pages_go_first():
+    pool = started_pool(2)
+    for worker in pool.workers:
+        worker['busy'] = -1
+    submit(pool, 0, PRIORITY_THUMBNAIL)
+    submit(pool, 1, PRIORITY_VISIBLE)
+    for worker in pool.workers:
+        worker['busy'] = None
+
+    pool.dispatch()
+    assert dispatched(pool) == [1]
+
+
+def test_thumbnails_keep_one_worker_free():
+    pool = started_pool(3)
+    for page in range(3):
+        submit(pool, page, PRIORITY_THUMBNAIL)
+    assert dispatched(pool) == [0, 1]
+
+    submit(pool, 9, PRIORITY_VISIBLE)
+    assert dispatched(pool) == [0, 1, 9]
+
+
+def test_single_worker_never_takes_thumbnails():
+    pool = started_pool(1)
+    assert not pool.can_take_thumbnails()
+    submit(pool, 0, PRIORITY_THUMBNAIL)
+    assert dispatched(pool) == []
+
+
+def test_dead_worker_is_not_idle():
+    pool = started_pool(2)
+    pool.workers[0]['process'].alive = False
+    submit(pool, 0, PRIORITY_VISIBLE)
+    assert pool.workers[0]['tasks'] == []
+    assert dispatched(pool) == [0]
@@ -0,0 +1,69 @@
+from render_scheduler import RenderScheduler
+
+
+class FakeWidget:
+    """Runs after_idle callbacks only when the test says the loop is idle"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.counter = 0
+
+    def after_idle(self, callback, *args):
+        self.counter += 1
+        job = f"after#{self.counter}"
+        self.jobs[job] = (callback, args)
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def idle(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback, args in jobs.values():
+            callback(*args)
+
+
+def test_burst_of_requests_renders_once():
+    widget = FakeWidget()
+    renders = []
+    scheduler = RenderScheduler(widget, lambda: renders.append(len(renders)))
+    for _ in range(10):
+        scheduler.request()
+    assert len(widget.jobs) == 1
+
+    widget.idle()
+    assert renders == [0]
+
+    # The next burst gets its own render
+    scheduler.request()
+    scheduler.request()
+    widget.idle()
+    assert renders == [0, 1]
+
+
+def test_cancel_drops_the_pending_render():
+    widget = FakeWidget()
+    renders = []
+    scheduler = RenderScheduler(widget, lambda: renders.append(True))
+    scheduler.request()
+    scheduler.cancel()
+    widget.idle()
+    assert renders == []
+    assert scheduler.pending_job is None
+
+    scheduler.request()
+    widget.idle()
+    assert renders == [True]
+
+
+def test_failing_render_does_not_stop_scheduling():
+    widget = FakeWidget()
+
+    def broken():
+        raise RuntimeError("render failed")
+
+    scheduler = RenderScheduler(widget, broken)
+    scheduler.request()
+    widget.idle()
+    scheduler.request()
+    assert scheduler.pending_job is not None
@@ -0,0 +1,34 @@
+import os
+
+from thumbnails import ThumbnailCache
+
+KB = 1024
+
+
+def test_round_trip(cache_root):
+    cache = ThumbnailCache("book")
+    assert cache.load(0) is None
+    cache.save(0, b"\x89PNG thumbnail")
+    assert cache.load(0) == b"\x89PNG thumbnail"
+    assert not os.path.exists(cache.path(0) + ".tmp")
+
+
+def test_cap_is_shared_and_least_recently_used_goes(cache_root):
+    # Room for four 100 KB thumbnails
+    first = ThumbnailCache("first", max_mb=400 / 1024)
+    second = ThumbnailCache("second", max_mb=400 / 1024)
+    for page in range(3):
+        first.save(page, b"x" * 100 * KB)
+        os.utime(first.path(page), (page, page))
+    # A hit makes page 0 the most recently used
+    assert first.load(0) is not None
+
+    second.save(0, b"y" * 100 * KB)
+    assert all(os.path.exists(first.path(page)) for page in range(3))
+
+    second.save(1, b"y" * 100 * KB)
+    remaining = [page for page in range(3) if os.path.exists(first.path(page))]
+    # Down to 90% of the cap: the two oldest go, the recently used page stays
+    assert remaining == [0]
+    assert os.path.exists(second.path(1))
+    assert sum(size for _, size, _ in second.entries()) <= second.max_bytes * 0.9
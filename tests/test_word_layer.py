@@ -0,0 +1,49 @@
+from word_layer import WordIndex
+
+# Two lines of words in reading order: (x0, y0, x1, y1, text)
+WORDS = [
+    (10, 10, 40, 20, "The"),
+    (45, 10, 80, 20, "quick"),
+    (85, 10, 120, 20, "fox"),
+    (10, 30, 50, 40, "jumps"),
+    (55, 30, 90, 40, "over"),
+]
+
+
+def test_word_at_hits_the_box_under_the_point():
+    index = WordIndex(WORDS)
+    assert index.word_at(50, 15) == 1
+    assert index.word_at(12, 35) == 3
+
+
+def test_word_at_snaps_to_the_nearest_word():
+    index = WordIndex(WORDS)
+    assert index.word_at(42, 15) == 0
+    assert index.word_at(125, 15) == 2
+    assert index.word_at(500, 500) is None
+
+
+def test_words_in_rect_needs_most_of_a_word():
+    index = WordIndex(WORDS)
+    assert index.words_in_rect(0, 0, 82, 22) == [0, 1]
+    # Only a sliver of "fox" is covered
+    assert index.words_in_rect(0, 0, 90, 22) == [0, 1]
+    assert index.words_in_rect(0, 0, 200, 50) == [0, 1, 2, 3, 4]
+
+
+def test_lines_merge_boxes_and_text():
+    index = WordIndex(WORDS)
+    lines = index.lines(range(len(WORDS)))
+    assert lines == [
+        ((10, 10, 120, 20), "The quick fox"),
+        ((10, 30, 90, 40), "jumps over"),
+    ]
+    assert index.text_of([1, 2, 3]) == "quick fox\njumps"
+
+
+def test_grid_cell_size_does_not_change_results():
+    small = WordIndex(WORDS, cell=5)
+    large = WordIndex(WORDS, cell=500)
+    for point in ((50, 15), (12, 35), (125, 15)):
+        assert small.word_at(*point) == large.word_at(*point)
+    assert small.words_in_rect(0, 0, 82, 22) == large.words_in_rect(0, 0, 82, 22)
@@ -0,0 +1,404 @@
+import tkinter as tk
+from tkinter import ttk
+import threading
+import queue
+import os
+import fitz  # PyMuPDF
+from cache_utils import cache_dir
+from pdf_render import MUPDF_LOCK
+from render_pool import PRIORITY_THUMBNAIL
+
+THUMB_WIDTH = 110
+SLOT_HEIGHT = 175
+SLOT_PADDING = 8
+DEFAULT_MAX_MB = 64
+
+# Bytes in each thumbnail cache folder, scanned on the first save
+_total_bytes = {}
+_size_lock = threading.Lock()
+
+
+class ThumbnailCache:
+    """PNG thumbnails on disk, keyed by document content hash and page.
+
+    Every document's thumbnails share one size cap. Like the render cache,
+    the least recently used files (mtime is bumped on every hit) are
+    evicted down to 90% of the cap when it is exceeded.
+    """
+
+    def __init__(self, doc_hash, max_mb=DEFAULT_MAX_MB):
+        self.root = cache_dir('thumbnails')
+        self.directory = cache_dir('thumbnails', doc_hash)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def path(self, page_number):
+        return os.path.join(self.directory, f"{page_number}.png")
+
+    def load(self, page_number):
+        """Return the PNG bytes of a cached thumbnail, or None"""
+        path = self.path(page_number)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def save(self, page_number, data):
+        """Store a thumbnail atomically, evicting old ones past the cap"""
+        temp_path = self.path(page_number) + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self.path(page_number))
+        except OSError as e:
+            print(f"Failed to save thumbnail: {e}")
+            return
+        # Saved from the worker thread and from pool callbacks
+        with _size_lock:
+            total = _total_bytes.get(self.root)
+            total = self.scan_size() if total is None else total + len(data)
+            if total > self.max_bytes:
+                total = self.evict()
+            _total_bytes[self.root] = total
+
+    def entries(self):
+        result = []
+        for folder in os.listdir(self.root):
+            directory = os.path.join(self.root, folder)
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith('.png'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                result.append((stat.st_mtime, stat.st_size, path))
+        return result
+
+    def scan_size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used thumbnails until under 90% of the cap"""
+        target = self.max_bytes * 0.9
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+
+class ThumbnailWorker(threading.Thread):
+    """Renders missing thumbnails in the background at the lowest priority.
+
+    The worker opens its own document, makes every MuPDF call under
+    MUPDF_LOCK and only works while ``render_idle`` is set, so it never
+    competes with the main page render.
+    """
+
+    def __init__(self, pdf_path, cache, results, render_idle):
+        super().__init__(daemon=True)
+        self.pdf_path = pdf_path
+        self.cache = cache
+        self.results = results
+        self.render_idle = render_idle
+        self.stop_event = threading.Event()
+        self.condition = threading.Condition()
+        self.wanted = []
+
+    def request(self, page_numbers):
+        """Replace the pending work with the pages now in view"""
+        with self.condition:
+            self.wanted = list(page_numbers)
+            self.condition.notify()
+
+    def cancel(self):
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify()
+
+    def next_page(self):
+        with self.condition:
+            while not self.wanted and not self.stop_event.is_set():
+                self.condition.wait()
+            if self.stop_event.is_set():
+                return None
+            return self.wanted.pop(0)
+
+    def run(self):
+        try:
+            with MUPDF_LOCK:
+                doc = fitz.open(self.pdf_path)
+        except Exception as e:
+            print(f"Thumbnail worker could not open document: {e}")
+            return
+
+        try:
+            while True:
+                page_number = self.next_page()
+                if page_number is None:
+                    break
+
+                # Wait for the main render to finish
+                while not self.render_idle.wait(0.1):
+                    if self.stop_event.is_set():
+                        return
+                if self.stop_event.is_set():
+                    break
+
+                data = self.cache.load(page_number)
+                if data is None:
+                    try:
+                        with MUPDF_LOCK:
+                            page = doc.load_page(page_number)
+                            zoom = THUMB_WIDTH / max(page.rect.width, 1)
+                            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                            data = pix.tobytes("png")
+                            page = pix = None  # freed under the lock too
+                        self.cache.save(page_number, data)
+                    except Exception as e:
+                        print(f"Failed to render thumbnail {page_number + 1}: {e}")
+                        continue
+
+                if not self.stop_event.is_set():
+                    self.results.put((page_number, data))
+        finally:
+            with MUPDF_LOCK:
+                doc.close()
+
+
+class ThumbnailSidebar:
+    """Scrollable page-thumbnail strip for PDFViewer.
+
+    Missing thumbnails are rendered on the shared render pool when it has
+    more than one worker (they scale with the number of cores), otherwise
+    on a ThumbnailWorker.
+    """
+
+    MAX_IMAGES = 200
+
+    def __init__(self, parent, on_select, render_idle, pool=None):
+        self.on_select = on_select
+        self.render_idle = render_idle
+        self.pool = pool
+        self.pool_tasks = {}
+        self.pdf_path = None
+        self.cache = None
+        self.worker = None
+        self.results = queue.Queue()
+        self.page_count = 0
+        self.current_page = 0
+        self.images = {}
+        self.shown = {}
+        self.poll_job = None
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, width=THUMB_WIDTH + 2 * SLOT_PADDING, highlightthickness=0)
+        self.canvas.pack(side='left', fill='y', expand=True)
+        scroll = ttk.Scrollbar(self.frame, orient='vertical', command=self.canvas.yview)
+        scroll.pack(side='right', fill='y')
+        self.scroll = scroll
+        self.canvas.configure(yscrollcommand=self.on_scrolled)
+
+        self.canvas.bind("<Configure>", lambda e: self.update_view())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+
+    # ============= DOCUMENT =============
+
+    def set_document(self, pdf_path, doc_hash, page_count):
+        """Show the thumbnails of a newly opened document"""
+        self.cancel()
+        self.canvas.delete("all")
+        self.images = {}
+        self.shown = {}
+        self.page_count = page_count
+        self.current_page = 0
+        self.pdf_path = pdf_path
+        self.cache = ThumbnailCache(doc_hash)
+        if self.pool is None or not self.pool.can_take_thumbnails():
+            self.worker = ThumbnailWorker(pdf_path, self.cache, self.results, self.render_idle)
+            self.worker.start()
+        self.canvas.config(scrollregion=(0, 0, THUMB_WIDTH, page_count * SLOT_HEIGHT))
+        self.canvas.yview_moveto(0)
+        self.poll_results()
+        self.update_view()
+
+    def cancel(self):
+        """Stop the background worker"""
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+        for task_id in self.pool_tasks.values():
+            self.pool.cancel(task_id)
+        self.pool_tasks = {}
+        if self.poll_job:
+            self.canvas.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.results = queue.Queue()
+
+    # ============= VIEW =============
+
+    def slot_origin(self, page_number):
+        return SLOT_PADDING, page_number * SLOT_HEIGHT + SLOT_PADDING
+
+    def update_view(self):
+        """Draw the thumbnails in view and queue the missing ones"""
+        if not self.cache or not self.page_count:
+            return
+
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = max(int(top // SLOT_HEIGHT) - 1, 0)
+        last = min(int(bottom // SLOT_HEIGHT) + 1, self.page_count - 1)
+        visible = range(first, last + 1)
+
+        for page_number in list(self.shown):
+            if page_number not in visible:
+                self.canvas.delete(f"thumb_{page_number}")
+                del self.shown[page_number]
+
+        for page_number in visible:
+            if self.shown.get(page_number):
+                continue
+            if page_number not in self.images:
+                data = self.cache.load(page_number)
+                if data is not None:
+                    self.store_image(page_number, data)
+            if page_number in self.images:
+                self.draw_thumbnail(page_number)
+            elif page_number not in self.shown:
+                self.draw_placeholder(page_number)
+
+        # Nearest pages first; anything scrolled away is dropped
+        missing = [p for p in visible if p not in self.images]
+        if self.worker:
+            self.worker.request(missing)
+        elif self.pool is not None:
+            self.request_from_pool(missing)
+        self.draw_current_marker()
+
+    def request_from_pool(self, missing):
+        """Queue the missing thumbnails on the render pool, dropping stale ones"""
+        for page_number in list(self.pool_tasks):
+            if page_number not in missing:
+                self.pool.cancel(self.pool_tasks.pop(page_number))
+        for page_number in missing:
+            if page_number not in self.pool_tasks:
+                self.pool_tasks[page_number] = self.pool.submit(
+                    self.pdf_path, page_number, None,
+                    lambda data, n=page_number, cache=self.cache: self.on_pool_thumbnail(cache, n, data),
+                    priority=PRIORITY_THUMBNAIL, output="png", fit_width=THUMB_WIDTH
+                )
+
+    def on_pool_thumbnail(self, cache, page_number, data):
+        self.pool_tasks.pop(page_number, None)
+        if data is None or cache is not self.cache:
+            return
+        cache.save(page_number, data)
+        self.store_image(page_number, data)
+        if page_number in self.shown:
+            self.draw_thumbnail(page_number)
+
+    def store_image(self, page_number, data):
+        try:
+            self.images[page_number] = tk.PhotoImage(master=self.canvas, data=data)
+        except tk.TclError as e:
+            print(f"Invalid thumbnail {page_number + 1}: {e}")
+            return
+        # Keep the number of decoded thumbnails bounded
+        if len(self.images) > self.MAX_IMAGES:
+            for old in list(self.images):
+                if old not in self.shown and old != page_number:
+                    del self.images[old]
+                if len(self.images) <= self.MAX_IMAGES:
+                    break
+
+    def draw_placeholder(self, page_number):
+        x, y = self.slot_origin(page_number)
+        tag = f"thumb_{page_number}"
+        self.canvas.create_rectangle(
+            x, y, x + THUMB_WIDTH, y + SLOT_HEIGHT - 30,
+            outline="#cccccc", fill="#f5f5f5", tags=(tag,)
+        )
+        self.draw_label(page_number)
+        self.shown[page_number] = False
+
+    def draw_thumbnail(self, page_number):
+        x, y = self.slot_origin(page_number)
+        tag = f"thumb_{page_number}"
+        self.canvas.delete(tag)
+        self.canvas.create_image(x, y, anchor='nw', image=self.images[page_number], tags=(tag,))
+        self.draw_label(page_number)
+        self.shown[page_number] = True
+
+    def draw_label(self, page_number):
+        x, y = self.slot_origin(page_number)
+        self.canvas.create_text(
+            x + THUMB_WIDTH // 2, y + SLOT_HEIGHT - 22,
+            text=str(page_number + 1), tags=(f"thumb_{page_number}",)
+        )
+
+    def draw_current_marker(self):
+        self.canvas.delete("current")
+        x, y = self.slot_origin(self.current_page)
+        self.canvas.create_rectangle(
+            x - 3, y - 3, x + THUMB_WIDTH + 3, y + SLOT_HEIGHT - 27,
+            outline="#0078d4", width=2, tags=("current",)
+        )
+
+    def set_current_page(self, page_number):
+        """Mark the page shown in the viewer and keep it in view"""
+        self.current_page = page_number
+        if not self.page_count:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        y = page_number * SLOT_HEIGHT
+        if y < top or y + SLOT_HEIGHT > bottom:
+            self.canvas.yview_moveto(y / (self.page_count * SLOT_HEIGHT))
+        self.draw_current_marker()
+
+    def poll_results(self):
+        """Pick up thumbnails finished by the worker (Tk is not thread-safe)"""
+        try:
+            while True:
+                page_number, data = self.results.get_nowait()
+                self.store_image(page_number, data)
+                if page_number in self.shown:
+                    self.draw_thumbnail(page_number)
+        except queue.Empty:
+            pass
+        self.poll_job = self.canvas.after(100, self.poll_results)
+
+    # ============= EVENTS =============
+
+    def on_scrolled(self, first, last):
+        self.scroll.set(first, last)
+        self.update_view()
+
+    def on_click(self, event):
+        page_number = int(self.canvas.canvasy(event.y) // SLOT_HEIGHT)
+        if 0 <= page_number < self.page_count:
+            self.on_select(page_number)
+
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-3, "units")
+        else:
+            self.canvas.yview_scroll(3, "units")
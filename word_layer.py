@@ -0,0 +1,87 @@
+import math
+from collections import defaultdict
+
+GRID_CELL = 24  # points
+
+
+def same_line(a, b):
+    """True when the vertical centre of box b lies within box a"""
+    centre = (b[1] + b[3]) / 2
+    return a[1] <= centre <= a[3]
+
+
+class WordIndex:
+    """Uniform grid over the word boxes of one page (PDF coordinates).
+
+    Every word is registered in the cells its box touches, so point and
+    rectangle hit tests only look at the few words nearby, however dense
+    the page is. Word indices follow reading order, so a selection between
+    two words is simply the index range between them.
+    """
+
+    def __init__(self, words, cell=GRID_CELL):
+        self.words = words
+        self.cell = cell
+        self.grid = defaultdict(list)
+        for i, word in enumerate(words):
+            x0, y0, x1, y1 = word[:4]
+            for cx in range(int(x0 // cell), int(x1 // cell) + 1):
+                for cy in range(int(y0 // cell), int(y1 // cell) + 1):
+                    self.grid[(cx, cy)].append(i)
+
+    def candidates(self, x0, y0, x1, y1):
+        found = set()
+        cell = self.cell
+        for cx in range(int(x0 // cell), int(x1 // cell) + 1):
+            for cy in range(int(y0 // cell), int(y1 // cell) + 1):
+                found.update(self.grid.get((cx, cy), ()))
+        return found
+
+    def words_in_rect(self, x0, y0, x1, y1):
+        """Words mostly covered by a rectangle, in reading order"""
+        hits = []
+        for i in self.candidates(x0, y0, x1, y1):
+            wx0, wy0, wx1, wy1 = self.words[i][:4]
+            width = min(x1, wx1) - max(x0, wx0)
+            height = min(y1, wy1) - max(y0, wy0)
+            if width <= 0 or height <= 0:
+                continue
+            area = max((wx1 - wx0) * (wy1 - wy0), 1e-6)
+            centre_inside = x0 <= (wx0 + wx1) / 2 <= x1 and y0 <= (wy0 + wy1) / 2 <= y1
+            if centre_inside or width * height >= area / 2:
+                hits.append(i)
+        return sorted(hits)
+
+    def word_at(self, x, y, reach=2):
+        """Index of the word under a point, else the nearest one within ``reach`` cells"""
+        cell = self.cell
+        best, best_distance = None, math.inf
+        for radius in range(reach + 1):
+            span = radius * cell
+            for i in self.candidates(x - span, y - span, x + span, y + span):
+                x0, y0, x1, y1 = self.words[i][:4]
+                dx = max(x0 - x, 0, x - x1)
+                dy = max(y0 - y, 0, y - y1)
+                distance = dx * dx + dy * dy
+                if distance < best_distance:
+                    best, best_distance = i, distance
+            if best is not None:
+                return best
+        return None
+
+    def lines(self, indices):
+        """Group words into lines: [(rect, text), ...] with the boxes merged"""
+        result = []
+        for i in indices:
+            x0, y0, x1, y1, token = self.words[i][:5]
+            if result and same_line(result[-1][0], (x0, y0, x1, y1)):
+                rx0, ry0, rx1, ry1 = result[-1][0]
+                result[-1] = ((min(rx0, x0), min(ry0, y0), max(rx1, x1), max(ry1, y1)),
+                              result[-1][1] + " " + token)
+            else:
+                result.append(((x0, y0, x1, y1), token))
+        return result
+
+    def text_of(self, indices):
+        """Text of the given words, one line per output line"""
+        return "\n".join(text for _, text in self.lines(indices))